@@ -8,9 +8,16 @@ from .user_profile import (
     load_profile,
     save_profile,
     update_profile,
+    update_profile_batch,
+    DrillResult,
+    next_due,
 )
+from .profile_cache import ProfileCache, get_profile_cache, shutdown_profile_cache
 from .engine import CoreEngine, Challenge, EvalResult
 from .dhatu_dash import DhatuDashEngine, DhatuSession, create_dhatu_dash
+from .sandhi_forge import SandhiForgeEngine, create_sandhi_forge
+from .karaka_web import KarakaWebEngine, create_karaka_web
+from .registry import EngineRegistry, get_registry, init_registry, register_engine
 from .rag_client import RAGClient, get_embed_fn_from_chutes
 
 __all__ = [
@@ -18,12 +25,26 @@ __all__ = [
     "load_profile",
     "save_profile",
     "update_profile",
+    "update_profile_batch",
+    "DrillResult",
+    "next_due",
+    "ProfileCache",
+    "get_profile_cache",
+    "shutdown_profile_cache",
     "CoreEngine",
     "Challenge",
     "EvalResult",
     "DhatuDashEngine",
     "DhatuSession",
     "create_dhatu_dash",
+    "SandhiForgeEngine",
+    "create_sandhi_forge",
+    "KarakaWebEngine",
+    "create_karaka_web",
+    "EngineRegistry",
+    "get_registry",
+    "init_registry",
+    "register_engine",
     "RAGClient",
     "get_embed_fn_from_chutes",
 ]
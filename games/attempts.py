@@ -0,0 +1,134 @@
+"""
+Append-only attempt log — one row per graded answer.
+
+attempts keeps full history (indexed on (user_id, created_at)); error_patterns
+is a per-(user, chunk) aggregate maintained in the same transaction as each
+insert. A periodic compaction rolls attempts older than a cutoff into
+attempt_daily summaries and deletes them, so the hot table stays small.
+
+Run compaction by hand: python -m games.attempts --older-than-days 30
+"""
+
+from __future__ import annotations
+
+import argparse
+import sqlite3
+from datetime import datetime, timedelta
+from typing import Any
+
+from sabdakrida.db.connection import get_connection, transaction
+
+# Attempts younger than this stay row-level; older ones are rolled into attempt_daily
+COMPACT_AFTER_DAYS = 30
+
+
+def append_attempts(conn: sqlite3.Connection, user_id: str, attempts: list[dict]) -> None:
+    """Insert attempt rows and fold them into error_patterns. Caller owns the transaction."""
+    conn.executemany(
+        """
+        INSERT INTO attempts (user_id, chunk_id, topic, learner_answer, correct, created_at)
+        VALUES (?, ?, ?, ?, ?, ?)
+        """,
+        [
+            (
+                user_id,
+                a.get("chunk_id", ""),
+                a.get("topic", ""),
+                a.get("learner_answer", ""),
+                1 if a.get("correct") else 0,
+                a.get("timestamp") or datetime.utcnow().isoformat(),
+            )
+            for a in attempts
+        ],
+    )
+    conn.executemany(
+        """
+        INSERT INTO error_patterns (user_id, chunk_id, attempts, errors, last_error_at, last_wrong_answer)
+        VALUES (?, ?, 1, ?, ?, ?)
+        ON CONFLICT(user_id, chunk_id) DO UPDATE SET
+            attempts = attempts + 1,
+            errors = errors + excluded.errors,
+            last_error_at = COALESCE(excluded.last_error_at, last_error_at),
+            last_wrong_answer = COALESCE(excluded.last_wrong_answer, last_wrong_answer)
+        """,
+        [
+            (
+                user_id,
+                a.get("chunk_id", ""),
+                0 if a.get("correct") else 1,
+                None if a.get("correct") else a.get("timestamp"),
+                None if a.get("correct") else a.get("learner_answer", ""),
+            )
+            for a in attempts
+        ],
+    )
+
+
+def recent_attempts(user_id: str, limit: int) -> list[dict[str, Any]]:
+    """Newest `limit` attempts, oldest first — an index range scan."""
+    rows = get_connection().execute(
+        """
+        SELECT chunk_id, topic, learner_answer, correct, created_at FROM attempts
+        WHERE user_id = ? ORDER BY created_at DESC, id DESC LIMIT ?
+        """,
+        (user_id, limit),
+    ).fetchall()
+    return [
+        {
+            "chunk_id": r["chunk_id"],
+            "topic": r["topic"],
+            "learner_answer": r["learner_answer"],
+            "correct": bool(r["correct"]),
+            "timestamp": r["created_at"],
+        }
+        for r in reversed(rows)
+    ]
+
+
+def error_patterns(user_id: str, limit: int = 10) -> list[dict[str, Any]]:
+    """Chunks this learner gets wrong most often."""
+    rows = get_connection().execute(
+        """
+        SELECT chunk_id, attempts, errors, last_error_at, last_wrong_answer
+        FROM error_patterns
+        WHERE user_id = ? AND errors > 0
+        ORDER BY errors DESC, last_error_at DESC
+        LIMIT ?
+        """,
+        (user_id, limit),
+    ).fetchall()
+    return [dict(r) for r in rows]
+
+
+def compact_attempts(
+    older_than_days: int = COMPACT_AFTER_DAYS, now: datetime | None = None
+) -> int:
+    """Roll attempts older than the cutoff into attempt_daily; returns rows compacted."""
+    cutoff = ((now or datetime.utcnow()) - timedelta(days=older_than_days)).isoformat()
+    with transaction() as conn:
+        conn.execute(
+            """
+            INSERT INTO attempt_daily (user_id, day, topic, attempts, correct)
+            SELECT user_id, substr(created_at, 1, 10), topic, COUNT(*), SUM(correct)
+            FROM attempts
+            WHERE created_at < ?
+            GROUP BY user_id, substr(created_at, 1, 10), topic
+            ON CONFLICT(user_id, day, topic) DO UPDATE SET
+                attempts = attempts + excluded.attempts,
+                correct = correct + excluded.correct
+            """,
+            (cutoff,),
+        )
+        cur = conn.execute("DELETE FROM attempts WHERE created_at < ?", (cutoff,))
+    return cur.rowcount
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compact old attempts into per-day summaries.")
+    parser.add_argument("--older-than-days", type=int, default=COMPACT_AFTER_DAYS)
+    args = parser.parse_args()
+    print(f"Compacted {compact_attempts(args.older_than_days)} attempts.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""
+Cohort analytics — cluster learners by weakness_centroid to find common struggle areas.
+
+Offline batch job:
+  1. Stream every non-zero weakness_centroid from user_profiles into one float32 matrix
+  2. Mini-batch k-means on the L2-normalised rows (cosine geometry, like ChromaDB)
+  3. Label each cluster with its nearest corpus chunks via RAGClient
+  4. Write cluster summaries + memberships to cohort_runs / cohort_clusters / cohort_members
+
+Run from project root: python -m games.cohorts --k 24
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from sabdakrida.db.connection import get_connection, transaction
+
+from .user_profile import EMBED_DIMS
+
+
+@dataclass
+class Cluster:
+    cluster_id: int
+    size: int
+    centroid: np.ndarray
+    label_chunk_ids: list[str] = field(default_factory=list)
+    label_text: str = ""
+
+
+def load_centroid_matrix(dims: int = EMBED_DIMS) -> tuple[list[str], np.ndarray]:
+    """(user_ids, matrix) for every learner with a non-zero weakness centroid."""
+    rows = get_connection().execute(
+        "SELECT user_id, weakness_centroid FROM user_profiles WHERE weakness_centroid IS NOT NULL"
+    )
+    user_ids: list[str] = []
+    buf = np.empty((1024, dims), dtype=np.float32)
+    n = 0
+    for r in rows:
+        try:
+            vec = np.asarray(json.loads(r["weakness_centroid"]), dtype=np.float32)
+        except (json.JSONDecodeError, TypeError, ValueError):
+            continue
+        if vec.shape != (dims,) or not vec.any():
+            continue
+        if n == len(buf):
+            buf = np.resize(buf, (len(buf) * 2, dims))
+        buf[n] = vec
+        user_ids.append(r["user_id"])
+        n += 1
+    return user_ids, buf[:n]
+
+
+def _normalise(x: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(x, axis=1, keepdims=True)
+    return x / np.maximum(norms, 1e-12)
+
+
+def _assign(x: np.ndarray, centers: np.ndarray, chunk: int = 8192) -> np.ndarray:
+    """Nearest center per row (rows and centers unit-norm → max dot product)."""
+    labels = np.empty(len(x), dtype=np.int32)
+    for i in range(0, len(x), chunk):
+        labels[i:i + chunk] = np.argmax(x[i:i + chunk] @ centers.T, axis=1)
+    return labels
+
+
+def _kmeans_pp(x: np.ndarray, k: int, rng: np.random.Generator) -> np.ndarray:
+    """k-means++ seeding on unit vectors (distance² = 2 − 2·cos)."""
+    centers = np.empty((k, x.shape[1]), dtype=x.dtype)
+    centers[0] = x[rng.integers(len(x))]
+    d2 = np.maximum(2 - 2 * (x @ centers[0]), 0)
+    for j in range(1, k):
+        total = d2.sum()
+        idx = rng.choice(len(x), p=d2 / total) if total > 0 else rng.integers(len(x))
+        centers[j] = x[idx]
+        d2 = np.minimum(d2, np.maximum(2 - 2 * (x @ centers[j]), 0))
+    return centers
+
+
+def minibatch_kmeans(
+    x: np.ndarray,
+    k: int,
+    batch_size: int = 2048,
+    n_iter: int = 200,
+    seed: int = 0,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Spherical mini-batch k-means (Sculley 2010) — per-center learning rate 1/count,
+    centers re-normalised each step. Returns (centers, labels for every row of x).
+    """
+    rng = np.random.default_rng(seed)
+    x = _normalise(np.asarray(x, dtype=np.float32))
+    k = min(k, len(x))
+    init_sample = x[rng.choice(len(x), size=min(len(x), max(10 * k, batch_size)), replace=False)]
+    centers = _kmeans_pp(init_sample, k, rng)
+    counts = np.zeros(k, dtype=np.float64)
+
+    for _ in range(n_iter):
+        batch = x[rng.integers(len(x), size=min(batch_size, len(x)))]
+        labels = _assign(batch, centers)
+        for j in np.unique(labels):
+            members = batch[labels == j]
+            counts[j] += len(members)
+            lr = len(members) / counts[j]
+            centers[j] = (1 - lr) * centers[j] + lr * members.mean(axis=0)
+        centers = _normalise(centers)
+
+    return centers, _assign(x, centers)
+
+
+def label_clusters(clusters: list[Cluster], corpus, n: int = 5) -> None:
+    """Attach the nearest corpus chunks to each cluster centroid."""
+    if corpus is None:
+        return
+    for c in clusters:
+        hits = corpus.query_by_embedding(c.centroid.tolist(), n=n)
+        c.label_chunk_ids = [h["id"] for h in hits]
+        c.label_text = hits[0]["text"][:200] if hits else ""
+
+
+def save_run(user_ids: list[str], labels: np.ndarray, clusters: list[Cluster]) -> int:
+    """Write one clustering run. Returns its run_id."""
+    with transaction() as conn:
+        cur = conn.execute(
+            "INSERT INTO cohort_runs (n_profiles, k) VALUES (?, ?)",
+            (len(user_ids), len(clusters)),
+        )
+        run_id = cur.lastrowid
+        conn.executemany(
+            """
+            INSERT INTO cohort_clusters
+                (run_id, cluster_id, size, centroid, label_chunk_ids, label_text)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            [
+                (
+                    run_id,
+                    c.cluster_id,
+                    c.size,
+                    c.centroid.astype(np.float32).tobytes(),
+                    json.dumps(c.label_chunk_ids),
+                    c.label_text,
+                )
+                for c in clusters
+            ],
+        )
+        conn.executemany(
+            "INSERT INTO cohort_members (run_id, user_id, cluster_id) VALUES (?, ?, ?)",
+            zip([run_id] * len(user_ids), user_ids, labels.tolist()),
+        )
+    return run_id
+
+
+def run_cohort_job(k: int = 24, corpus=None, seed: int = 0) -> dict:
+    """Load → cluster → label → save. Returns a small summary for logging."""
+    t0 = time.perf_counter()
+    user_ids, x = load_centroid_matrix()
+    if len(user_ids) == 0:
+        return {"n_profiles": 0, "k": 0, "run_id": None}
+    t_load = time.perf_counter()
+
+    centers, labels = minibatch_kmeans(x, k, seed=seed)
+    sizes = np.bincount(labels, minlength=len(centers))
+    clusters = [
+        Cluster(cluster_id=j, size=int(sizes[j]), centroid=centers[j])
+        for j in np.argsort(-sizes)
+        if sizes[j] > 0
+    ]
+    t_cluster = time.perf_counter()
+
+    label_clusters(clusters, corpus)
+    run_id = save_run(user_ids, labels, clusters)
+    return {
+        "run_id": run_id,
+        "n_profiles": len(user_ids),
+        "k": len(clusters),
+        "load_s": round(t_load - t0, 2),
+        "cluster_s": round(t_cluster - t_load, 2),
+        "total_s": round(time.perf_counter() - t0, 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Cluster learner weakness centroids into cohorts.")
+    parser.add_argument("--k", type=int, default=24)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-labels", action="store_true", help="Skip RAG cluster labelling")
+    args = parser.parse_args()
+
+    corpus = None
+    if not args.no_labels:
+        from .rag_client import RAGClient
+
+        corpus = RAGClient()
+    print(json.dumps(run_cohort_job(args.k, corpus, args.seed), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -9,17 +9,34 @@ from __future__ import annotations
 
 import json
 import random
+import threading
 import uuid
+from collections import OrderedDict
+from itertools import islice
+from datetime import datetime
 from pathlib import Path
 from dataclasses import dataclass, field
 
+import numpy as np
+
 from .engine.core import CoreEngine, Challenge, EvalResult
-from .user_profile import UserProfile
+from .normalize import canonicalize
+from .user_profile import EMBED_DIMS, UserProfile
 
+# Beginner-friendly roots (bhū, kṛ, gam, vac, dṛś) — favoured until the profile says otherwise
+COMMON_ROOT_IDS = frozenset({"dhatu-bhu", "dhatu-kri", "dhatu-gam", "dhatu-vach", "dhatu-drish"})
 
-def _normalize_iast(s: str) -> str:
-    """Normalize IAST for comparison: strip, lowercase (but preserve diacritics)."""
-    return s.strip().lower()
+# Root ranking weights (see RootRanker.scores)
+WEAKNESS_WEIGHT = 1.0
+STRENGTH_WEIGHT = 0.5
+DUE_BONUS = 0.5
+RECENT_PENALTY = 0.3
+COMMON_BONUS = 0.2
+DIFFICULTY_WEIGHT = 0.3
+# _pick_root draws from this many top-ranked roots so sessions still vary
+PICK_TOP_K = 3
+# How much of each ranking is kept (and cached)
+RANKING_DEPTH = 32
 
 
 @dataclass
@@ -29,15 +46,25 @@ class DhatuSession:
     root_iast: str
     root_meaning: str
     root_devanagari: str
-    valid_forms: list[str]  # All valid derived forms (IAST)
+    valid_forms: list[str]  # All valid derived forms (canonical IAST)
     tree: set[str]  # Forms already produced this session (includes root)
     challenge_count: int = 0
+    unused: set[str] = field(default_factory=set, repr=False)  # valid_forms − tree, kept in step
+
+    def __post_init__(self) -> None:
+        self.unused = set(self.valid_forms) - self.tree
 
     def unused_forms(self) -> list[str]:
-        return [f for f in self.valid_forms if f not in self.tree]
+        return [f for f in self.valid_forms if f in self.unused]
 
     def is_exhausted(self) -> bool:
-        return len(self.unused_forms()) == 0
+        return not self.unused
+
+    def add_form(self, form: str) -> None:
+        """Move a normalized form from unused into the tree."""
+        self.tree.add(form)
+        self.unused.discard(form)
+        self.challenge_count += 1
 
 
 def _load_dhatus() -> list[dict]:
@@ -50,18 +77,165 @@ def _load_dhatus() -> list[dict]:
 
 
 def _build_valid_forms(dhatu: dict) -> list[str]:
-    """Extract all valid IAST forms for a root (root + derived)."""
-    forms = [dhatu.get("iast", "")]
-    for df in dhatu.get("derivedForms", []):
-        f = df.get("form", "")
-        if f and f not in forms:
-            forms.append(f)
-    # Also check derivesTo for any we might have missed
-    for name in dhatu.get("derivesTo", []):
-        norm = _normalize_iast(name)
-        if norm and norm not in {_normalize_iast(f) for f in forms}:
-            forms.append(name)
-    return forms
+    """All valid normalized IAST forms for a root (root + derivedForms + derivesTo), in order."""
+    forms: dict[str, None] = {}
+    candidates = [dhatu.get("iast", "")]
+    candidates += [df.get("form", "") for df in dhatu.get("derivedForms", [])]
+    candidates += list(dhatu.get("derivesTo", []))
+    for f in candidates:
+        norm = canonicalize(f or "")
+        if norm:
+            forms.setdefault(norm)
+    return list(forms)
+
+
+@dataclass
+class DhatuIndex:
+    """
+    Lookup tables built once when dhatus.json loads, so evaluate never scans.
+      forms:         normalized form → [(root_id, derivedForms entry or {})]
+      by_id:         root_id → dhatu record
+      valid_forms:   root_id → normalized valid forms, in data order
+    """
+    forms: dict[str, list[tuple[str, dict]]] = field(default_factory=dict)
+    by_id: dict[str, dict] = field(default_factory=dict)
+    valid_forms: dict[str, list[str]] = field(default_factory=dict)
+
+    def form_info(self, root_id: str, form: str) -> dict:
+        for rid, info in self.forms.get(form, ()):
+            if rid == root_id:
+                return info
+        return {}
+
+    def roots_for(self, form: str) -> list[str]:
+        return [rid for rid, _ in self.forms.get(form, ())]
+
+
+def _build_index(dhatus: list[dict]) -> DhatuIndex:
+    index = DhatuIndex()
+    for d in dhatus:
+        root_id = d.get("id")
+        if not root_id:
+            continue
+        index.by_id[root_id] = d
+        index.valid_forms[root_id] = _build_valid_forms(d)
+        infos = {
+            canonicalize(df.get("form", "")): df
+            for df in d.get("derivedForms", [])
+            if df.get("form")
+        }
+        for form in index.valid_forms[root_id]:
+            index.forms.setdefault(form, []).append((root_id, infos.get(form, {})))
+    return index
+
+
+def _unit_rows(x: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(x, axis=-1, keepdims=True)
+    return x / np.maximum(norms, 1e-12)
+
+
+class RootRanker:
+    """
+    Scores every root for a learner in one vectorized pass.
+
+    Root embeddings (chunk id "dhatu_<root id>") are stacked once into a unit-norm
+    float32 matrix; each ranking is one matrix-vector product plus FSRS and
+    difficulty terms. Rankings are cached per user until profile.version changes.
+    """
+
+    def __init__(
+        self,
+        index: DhatuIndex,
+        embeddings: dict[str, list[float]],
+        dims: int = EMBED_DIMS,
+        max_cached: int = 10_000,
+    ) -> None:
+        self.root_ids = list(index.by_id)
+        self._row = {f"dhatu_{rid}": i for i, rid in enumerate(self.root_ids)}
+        n = len(self.root_ids)
+
+        vectors = np.zeros((n, dims), dtype=np.float32)
+        for chunk_id, i in self._row.items():
+            emb = embeddings.get(chunk_id)
+            if emb is not None and len(emb) == dims:
+                vectors[i] = emb
+        self.has_embeddings = bool(vectors.any())
+        self._vectors = _unit_rows(vectors)
+
+        # Bigger trees make longer, harder games: rank of tree size in [0, 1]
+        sizes = np.array([len(index.valid_forms[rid]) for rid in self.root_ids], dtype=np.float32)
+        order = np.argsort(np.argsort(sizes, kind="stable"), kind="stable")
+        self._hardness = order / max(n - 1, 1)
+        self._prior = np.where(
+            np.isin(self.root_ids, list(COMMON_ROOT_IDS)), COMMON_BONUS, 0.0
+        ).astype(np.float32)
+
+        self.max_cached = max_cached
+        self._cache: OrderedDict[str, tuple[tuple, np.ndarray]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def scores(
+        self, profile: UserProfile, difficulty: float, now: datetime | None = None
+    ) -> np.ndarray:
+        """
+        Per-root score, higher = better pick:
+          near the weakness centroid, away from the strength centroid,
+          FSRS-due roots up, just-reviewed roots down, tree size near difficulty.
+        """
+        s = self._prior - DIFFICULTY_WEIGHT * np.abs(self._hardness - difficulty)
+        if self.has_embeddings:
+            query = np.zeros(self._vectors.shape[1], dtype=np.float32)
+            for centroid, weight in (
+                (profile.weakness_centroid, WEAKNESS_WEIGHT),
+                (profile.strength_centroid, -STRENGTH_WEIGHT),
+            ):
+                v = np.asarray(centroid, dtype=np.float32)
+                if v.shape == query.shape and v.any():
+                    query += weight * _unit_rows(v)
+            if query.any():
+                s = s + self._vectors @ query
+
+        now_iso = (now or datetime.utcnow()).isoformat(timespec="seconds")
+        # Look up the roots' own cards: O(roots), however many other cards the learner has
+        states = profile.chunk_states
+        for chunk_id, i in self._row.items():
+            card = states.get(chunk_id)
+            if card is None or not card.get("due"):
+                continue
+            s[i] += DUE_BONUS if card["due"] <= now_iso else -RECENT_PENALTY
+        return s
+
+    def ranking(self, profile: UserProfile, difficulty: float) -> np.ndarray:
+        """Indices of the top RANKING_DEPTH roots, best first — cached until the profile changes."""
+        key = (profile.version, round(difficulty, 2))
+        with self._lock:
+            hit = self._cache.get(profile.user_id)
+            if hit is not None and hit[0] == key:
+                self._cache.move_to_end(profile.user_id)
+                return hit[1]
+        scores = self.scores(profile, difficulty)
+        if len(scores) > RANKING_DEPTH:
+            top = np.argpartition(-scores, RANKING_DEPTH)[:RANKING_DEPTH]
+        else:
+            top = np.arange(len(scores))
+        order = top[np.argsort(-scores[top], kind="stable")]
+        with self._lock:
+            self._cache[profile.user_id] = (key, order)
+            self._cache.move_to_end(profile.user_id)
+            while len(self._cache) > self.max_cached:
+                self._cache.popitem(last=False)
+        return order
+
+    def pick(self, profile: UserProfile, difficulty: float, top_k: int = PICK_TOP_K) -> str:
+        order = self.ranking(profile, difficulty)
+        return self.root_ids[int(random.choice(order[:top_k]))]
+
+    def pick_many(self, profile: UserProfile, difficulty: float, n: int, top_k: int = PICK_TOP_K) -> list[str]:
+        """n roots from one ranking, distinct while the ranking has enough of them."""
+        order = [int(i) for i in self.ranking(profile, difficulty)[: max(top_k, n)]]
+        picks = random.sample(order, min(n, len(order)))
+        picks += [random.choice(order[:top_k]) for _ in range(n - len(picks))]
+        return [self.root_ids[i] for i in picks]
 
 
 class DhatuDashEngine(CoreEngine):
@@ -72,22 +246,77 @@ class DhatuDashEngine(CoreEngine):
 
     game_type = "dhatu_dash"
     _dhatus: list[dict] = []
+    _index: DhatuIndex = DhatuIndex()
+    _ranker: RootRanker | None = None
+    _ranker_corpus = None
+    _paradigms = None  # games.paradigms.ParadigmIndex, when it can be built
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         if not DhatuDashEngine._dhatus:
             DhatuDashEngine._dhatus = _load_dhatus()
+            DhatuDashEngine._index = _build_index(DhatuDashEngine._dhatus)
+            try:
+                from .paradigms import get_paradigm_index
+
+                DhatuDashEngine._paradigms = get_paradigm_index()
+            except (ImportError, OSError, ValueError):
+                DhatuDashEngine._paradigms = None
+
+    def _paradigm_tags(self, session: DhatuSession, form: str) -> list[str]:
+        """Tags of form in the root's generated verb paradigm (empty if none / no index)."""
+        if self._paradigms is None:
+            return []
+        from .paradigms import iast_to_slp1
+
+        return self._paradigms.tags(iast_to_slp1(session.root_iast), iast_to_slp1(form))
+
+    def _root_ranker(self) -> RootRanker:
+        """Shared ranker; rebuilt once if it was first built by an engine without a corpus."""
+        ranker = DhatuDashEngine._ranker
+        if ranker is None or (DhatuDashEngine._ranker_corpus is None and self.corpus is not None):
+            chunk_ids = [f"dhatu_{rid}" for rid in self._index.by_id]
+            embeddings = self.corpus.get_embeddings(chunk_ids) if self.corpus else {}
+            ranker = RootRanker(self._index, embeddings)
+            DhatuDashEngine._ranker = ranker
+            DhatuDashEngine._ranker_corpus = self.corpus
+        return ranker
+
+    def warm(self) -> None:
+        """Fetch root embeddings and build the ranker now rather than on the first pick."""
+        self._root_ranker()
 
     def _pick_root(self, profile: UserProfile, difficulty: float) -> dict | None:
-        """Pick a root — prefer common ones, can use weakness targeting later."""
+        """Pick a root targeted at the learner's weaknesses, FSRS due cards and difficulty."""
         if not self._dhatus:
             return None
-        # Common roots first (bhū, kṛ, gam, vac, etc.)
-        common_ids = {"dhatu-bhu", "dhatu-kri", "dhatu-gam", "dhatu-vach", "dhatu-drish"}
-        candidates = [d for d in self._dhatus if d.get("id") in common_ids]
-        if not candidates:
-            candidates = self._dhatus[:15]
-        return random.choice(candidates)
+        return self._index.by_id[self._root_ranker().pick(profile, difficulty)]
+
+    def _new_session(self, dhatu: dict) -> DhatuSession:
+        return DhatuSession(
+            root_id=dhatu["id"],
+            root_iast=dhatu["iast"],
+            root_meaning=dhatu.get("meaning", "to be"),
+            root_devanagari=dhatu.get("devanagari", ""),
+            valid_forms=self._index.valid_forms[dhatu["id"]],
+            tree={canonicalize(dhatu["iast"])},
+        )
+
+    def generate_many(
+        self,
+        user_profile: UserProfile,
+        n: int,
+        difficulty: float | None = None,
+    ) -> list[Challenge]:
+        """n new-root challenges from a single ranking, without repeating a root where possible."""
+        if not self._dhatus:
+            raise ValueError("No dhatu data loaded. Add data/dhatus.json")
+        diff = difficulty if difficulty is not None else user_profile.target_difficulty()
+        root_ids = self._root_ranker().pick_many(user_profile, diff, n)
+        return [
+            self.generate(user_profile, diff, session=self._new_session(self._index.by_id[rid]))
+            for rid in root_ids
+        ]
 
     def generate(
         self,
@@ -105,14 +334,7 @@ class DhatuDashEngine(CoreEngine):
             dhatu = self._pick_root(user_profile, diff)
             if not dhatu:
                 raise ValueError("No dhatu data loaded. Add data/dhatus.json")
-            session = DhatuSession(
-                root_id=dhatu["id"],
-                root_iast=dhatu["iast"],
-                root_meaning=dhatu.get("meaning", "to be"),
-                root_devanagari=dhatu.get("devanagari", ""),
-                valid_forms=_build_valid_forms(dhatu),
-                tree={dhatu["iast"]},
-            )
+            session = self._new_session(dhatu)
 
         unused = session.unused_forms()
         if not unused:
@@ -154,10 +376,9 @@ class DhatuDashEngine(CoreEngine):
         player_input: str,
         challenge: Challenge,
     ) -> EvalResult:
-        """Check if player's input is a valid derived form not yet in tree."""
+        """Check if player's input is a valid derived form not yet in tree. O(1) per guess."""
         meta = challenge.meta or {}
         session: DhatuSession | None = meta.get("session")
-        valid_forms: list[str] = meta.get("valid_forms", [])
 
         if meta.get("exhausted"):
             return EvalResult(
@@ -166,14 +387,19 @@ class DhatuDashEngine(CoreEngine):
                 feedback="Start a new root.",
             )
 
-        if not session or not valid_forms:
+        if not session:
             return EvalResult(
                 correct=False,
                 explanation="Invalid challenge state.",
                 feedback="Try again.",
             )
 
-        normalized = _normalize_iast(player_input)
+        return self.evaluate_session(player_input, session)
+
+    def evaluate_session(self, player_input: str, session: DhatuSession) -> EvalResult:
+        """Evaluate a guess directly against a held session — set lookups, no challenge needed."""
+        chunk_id = f"dhatu_{session.root_id}"
+        normalized = canonicalize(player_input)
 
         # Check: must be valid and not already in tree
         if normalized in session.tree:
@@ -182,38 +408,76 @@ class DhatuDashEngine(CoreEngine):
                 rule_id="dhatu_repeat",
                 explanation=f"You already used {player_input}. Produce a different form.",
                 feedback="That form is already in the tree.",
-                chunk_id=challenge.source_chunk_ids[0] if challenge.source_chunk_ids else "",
+                chunk_id=chunk_id,
             )
 
-        # Match against valid forms (normalize both)
-        for vf in valid_forms:
-            if _normalize_iast(vf) == normalized:
-                # Correct! Add to tree for next challenge
-                session.tree.add(normalized)
-                session.challenge_count += 1
-                # Find the form info for explanation
-                dhatu = next((d for d in self._dhatus if d.get("id") == session.root_id), {})
-                form_info = next(
-                    (f for f in dhatu.get("derivedForms", []) if _normalize_iast(f.get("form", "")) == normalized),
-                    {},
-                )
-                suffix = form_info.get("suffix", "")
-                meaning = form_info.get("meaning", "")
-
-                return EvalResult(
-                    correct=True,
-                    rule_id="dhatu_valid",
-                    explanation=f"Correct. {player_input} = {suffix} → {meaning}" if suffix else f"Correct. {player_input}",
-                    feedback="sādhu!",
-                    chunk_id=challenge.source_chunk_ids[0] if challenge.source_chunk_ids else "",
-                )
+        if normalized in session.unused:
+            # Correct! Add to tree for next challenge
+            session.add_form(normalized)
+            form_info = self._index.form_info(session.root_id, normalized)
+            suffix = form_info.get("suffix", "")
+            meaning = form_info.get("meaning", "")
+
+            return EvalResult(
+                correct=True,
+                rule_id="dhatu_valid",
+                explanation=f"Correct. {player_input} = {suffix} → {meaning}" if suffix else f"Correct. {player_input}",
+                feedback="sādhu!",
+                chunk_id=chunk_id,
+            )
 
+        tags = self._paradigm_tags(session, normalized)
+        if tags:
+            session.add_form(normalized)
+            return EvalResult(
+                correct=True,
+                rule_id="dhatu_paradigm",
+                explanation=f"Correct. {player_input} = {', '.join(tags)}",
+                feedback="sādhu!",
+                chunk_id=chunk_id,
+            )
+
+        other_roots = [
+            self._index.by_id[rid].get("iast", rid) for rid in self._index.roots_for(normalized)
+        ]
+        if other_roots:
+            return EvalResult(
+                correct=False,
+                rule_id="dhatu_other_root",
+                explanation=f"'{player_input}' is a form of √{other_roots[0]}, not √{session.root_iast}.",
+                feedback="punar vadatu. Stay with this root.",
+                chunk_id=chunk_id,
+            )
+
+        hints = list(islice((f for f in session.valid_forms if f in session.unused), 5))
         return EvalResult(
             correct=False,
             rule_id="dhatu_invalid",
-            explanation=f"'{player_input}' is not a valid derived form of √{session.root_iast}. Valid unused: {', '.join(valid_forms[:5])}...",
+            explanation=f"'{player_input}' is not a valid derived form of √{session.root_iast}. Valid unused: {', '.join(hints)}...",
             feedback="punar vadatu. Try another form.",
-            chunk_id=challenge.source_chunk_ids[0] if challenge.source_chunk_ids else "",
+            chunk_id=chunk_id,
+        )
+
+    def accepts(self, session: DhatuSession, form: str) -> bool:
+        """
+        True if a canonical form is a new valid form of the session's root: one of its listed
+        forms, or in the root's generated paradigm. Solo play and rooms both accept exactly these.
+        """
+        if form in session.tree:
+            return False
+        return form in session.unused or bool(self._paradigm_tags(session, form))
+
+    def session_challenge(self, session: DhatuSession, difficulty: float = 0.5) -> Challenge:
+        """Minimal challenge for update_profile after evaluate_session — no prompt, no form list."""
+        return Challenge(
+            challenge_id=f"dhatu_{session.root_id}",
+            game_type=self.game_type,
+            prompt="",
+            correct_answer="",
+            source_chunk_ids=[f"dhatu_{session.root_id}"],
+            topic="dhatu",
+            difficulty=difficulty,
+            meta={"session": session},
         )
 
     def get_session_from_challenge(self, challenge: Challenge) -> DhatuSession | None:
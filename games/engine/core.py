@@ -3,6 +3,7 @@ CoreEngine — unified game engine for all 5 Sanskrit games.
 
 Every game is a different UI over this engine:
   - generate(user_profile, difficulty) → Challenge
+  - generate_many(user_profile, n) → [Challenge] (prefetch queues)
   - evaluate(input, challenge, corpus) → EvalResult
   - updateProfile(user_profile, result) → UserProfile
   - speak(text) → AudioBlob
@@ -56,6 +57,9 @@ class CorpusProvider(Protocol):
     def get_embedding(self, chunk_id: str) -> list[float] | None:
         ...
 
+    def get_embeddings(self, chunk_ids: list[str]) -> dict[str, list[float]]:
+        ...
+
     def query_by_embedding(
         self, embedding: list[float], n: int = 20, topic_filter: list[str] | None = None
     ) -> list[dict]:
@@ -103,16 +107,33 @@ class CoreEngine(ABC):
         """Evaluate player input against the challenge."""
         ...
 
+    def generate_many(
+        self,
+        user_profile: UserProfile,
+        n: int,
+        difficulty: float | None = None,
+    ) -> list[Challenge]:
+        """
+        n challenges for the same profile, e.g. to fill a prefetch queue.
+        Override to share per-batch work (ranking, corpus retrieval) across the batch.
+        """
+        return [self.generate(user_profile, difficulty) for _ in range(n)]
+
+    def warm(self) -> None:
+        """Build per-process indexes ahead of the first request. Override if the game has any."""
+
     def update_profile(
         self,
         profile: UserProfile,
         challenge: Challenge,
         result: EvalResult,
         learner_answer: str,
+        save: bool = True,
     ) -> UserProfile:
         """
         Update user profile after a drill interaction.
         Override in subclasses for game-specific logic.
+        save=False leaves persistence to the caller (e.g. the write-behind ProfileCache).
         """
         from ..user_profile import update_profile, save_profile
 
@@ -134,7 +155,8 @@ class CoreEngine(ABC):
             topic=challenge.topic,
             learner_answer=learner_answer,
         )
-        save_profile(profile)
+        if save:
+            save_profile(profile)
         return profile
 
     def speak(self, text: str, style: str = "narration") -> bytes | str | None:
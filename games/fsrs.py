@@ -0,0 +1,158 @@
+"""
+FSRS (Free Spaced Repetition Scheduler, v4) for chunk review cards.
+
+Same algorithm, forgetting curve and default weights as ts-fsrs 2.2 (the
+version package-lock.json pins for lib/fsrs.ts on the client), so
+server-scheduled and client-scheduled cards behave alike. Moving to FSRS
+v4.5+ (DECAY -0.5, FACTOR 19/81, new weights) has to happen on both sides.
+
+A card is the plain dict stored in UserProfile.chunk_states:
+  stability (days), difficulty (1–10), due (ISO datetime), last_review,
+  reps, lapses.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any
+
+# Grades — Again / Hard / Good / Easy
+AGAIN, HARD, GOOD, EASY = 1, 2, 3, 4
+
+DECAY = -1.0
+FACTOR = 1 / 9  # R(S, S) = 0.9
+
+DEFAULT_WEIGHTS = (
+    0.4, 0.6, 2.4, 5.8, 4.93, 0.94, 0.86, 0.01, 1.49,
+    0.14, 0.94, 2.18, 0.05, 0.34, 1.26, 0.29, 2.61,
+)
+
+# Shortest interval FSRS may schedule — keeps an Again card out of the very next turn
+MIN_INTERVAL_DAYS = 1 / 1440
+
+
+@dataclass(frozen=True)
+class FSRSParams:
+    w: tuple[float, ...] = DEFAULT_WEIGHTS
+    request_retention: float = 0.9
+    maximum_interval: float = 36500.0
+
+
+DEFAULT_PARAMS = FSRSParams()
+
+
+def grade_for(correct: bool) -> int:
+    """Binary game answers map to Good / Again."""
+    return GOOD if correct else AGAIN
+
+
+def _clamp_difficulty(d: float) -> float:
+    return min(10.0, max(1.0, d))
+
+
+def _init_stability(grade: int, p: FSRSParams) -> float:
+    return max(p.w[grade - 1], 0.1)
+
+
+def _init_difficulty(grade: int, p: FSRSParams) -> float:
+    return _clamp_difficulty(p.w[4] - (grade - 3) * p.w[5])
+
+
+def retrievability(elapsed_days: float, stability: float) -> float:
+    """Probability of recall after elapsed_days for a card with this stability."""
+    return (1 + FACTOR * max(elapsed_days, 0.0) / stability) ** DECAY
+
+
+def next_interval(stability: float, p: FSRSParams = DEFAULT_PARAMS) -> float:
+    """Days until retrievability falls to request_retention."""
+    interval = stability / FACTOR * (p.request_retention ** (1 / DECAY) - 1)
+    return min(max(interval, MIN_INTERVAL_DAYS), p.maximum_interval)
+
+
+def _next_difficulty(d: float, grade: int, p: FSRSParams) -> float:
+    d = d - p.w[6] * (grade - 3)
+    # Mean reversion towards the initial difficulty of a Good answer
+    return _clamp_difficulty(p.w[7] * _init_difficulty(GOOD, p) + (1 - p.w[7]) * d)
+
+
+def _recall_stability(d: float, s: float, r: float, grade: int, p: FSRSParams) -> float:
+    hard_penalty = p.w[15] if grade == HARD else 1.0
+    easy_bonus = p.w[16] if grade == EASY else 1.0
+    return s * (
+        1
+        + math.exp(p.w[8])
+        * (11 - d)
+        * s ** -p.w[9]
+        * (math.exp(p.w[10] * (1 - r)) - 1)
+        * hard_penalty
+        * easy_bonus
+    )
+
+
+def _forget_stability(d: float, s: float, r: float, p: FSRSParams) -> float:
+    s_forget = p.w[11] * d ** -p.w[12] * ((s + 1) ** p.w[13] - 1) * math.exp(p.w[14] * (1 - r))
+    return min(s_forget, s)
+
+
+def _parse_time(value: Any) -> datetime | None:
+    if isinstance(value, datetime):
+        return value
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
+
+
+def new_card() -> dict[str, Any]:
+    """An unreviewed card — review() initialises it on the first grade."""
+    return {
+        "stability": 0.0,
+        "difficulty": 0.0,
+        "due": None,
+        "last_review": None,
+        "reps": 0,
+        "lapses": 0,
+    }
+
+
+def review(
+    card: dict[str, Any],
+    grade: int,
+    now: datetime | None = None,
+    params: FSRSParams = DEFAULT_PARAMS,
+) -> dict[str, Any]:
+    """Apply one graded review to card (in place) and schedule its next due time."""
+    if grade not in (AGAIN, HARD, GOOD, EASY):
+        raise ValueError(f"FSRS grade must be 1–4, got {grade}")
+    now = now or datetime.utcnow()
+    reps = int(card.get("reps") or 0)
+    last = _parse_time(card.get("last_review"))
+
+    if reps == 0 or last is None:
+        stability = _init_stability(grade, params)
+        difficulty = _init_difficulty(grade, params)
+    else:
+        s = float(card.get("stability") or _init_stability(GOOD, params))
+        d = _clamp_difficulty(float(card.get("difficulty") or _init_difficulty(GOOD, params)))
+        elapsed = (now - last).total_seconds() / 86400
+        r = retrievability(elapsed, s)
+        difficulty = _next_difficulty(d, grade, params)
+        if grade == AGAIN:
+            stability = _forget_stability(d, s, r, params)
+            card["lapses"] = int(card.get("lapses") or 0) + 1
+        else:
+            stability = _recall_stability(d, s, r, grade, params)
+
+    card["stability"] = stability
+    card["difficulty"] = difficulty
+    card["reps"] = reps + 1
+    card.setdefault("lapses", 0)
+    card["last_review"] = now.isoformat(timespec="seconds")
+    card["due"] = (now + timedelta(days=next_interval(stability, params))).isoformat(
+        timespec="seconds"
+    )
+    return card
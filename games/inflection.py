@@ -0,0 +1,219 @@
+"""
+Nominal inflection: analyze an inflected form into (stem, case, number, gender).
+
+data/nominal-endings-inflected.csv gives endings per stem type ("a" + "ena" →
+deva → devena). Every ending is inserted reversed into a suffix trie whose
+nodes carry (stem type, case, number, gender); analyze() walks the form from
+its last letter, and at each node with entries rebuilds the stem as the
+unmatched head + stem type (consonant-stem endings only after a consonant).
+That is one dict step per letter — O(len(form)) plus the analyses returned.
+data/nouns-irregular-inflected.csv is an overlay looked up by whole form
+before the trie, and irregular stems are not re-analyzed as regular ones.
+
+The endings table lists n- and ṇ-variants side by side (devena / gajeṇa);
+inflect() emits the ṇ one only when the stem has r/ṛ/ṣ with no blocking
+consonant after it. Forms are SLP1. A pausal final visarga/anusvāra (narEH, vanaM) is read as the
+s/m of the ending. Pass stems= to keep only analyses whose stem is known.
+
+Benchmark: python scripts/benchmarks/bench_inflection.py
+"""
+
+from __future__ import annotations
+
+import csv
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, NamedTuple
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+ENDINGS_CSV = DATA_DIR / "nominal-endings-inflected.csv"
+IRREGULAR_CSV = DATA_DIR / "nouns-irregular-inflected.csv"
+
+CASES = ("1", "2", "3", "4", "5", "6", "7", "8")
+NUMBERS = ("s", "d", "p")
+
+CASE_NAMES = {
+    "1": "nominative",
+    "2": "accusative",
+    "3": "instrumental",
+    "4": "dative",
+    "5": "ablative",
+    "6": "genitive",
+    "7": "locative",
+    "8": "vocative",
+}
+NUMBER_NAMES = {"s": "singular", "d": "dual", "p": "plural"}
+GENDER_NAMES = {"m": "masculine", "f": "feminine", "n": "neuter"}
+
+# Irregular stems (SLP1) the games draw words from; the rest of the overlay (compounds, rare or
+# misspelled stems) is only used for analysis
+IRREGULAR_GLOSSES = {
+    "akzi": "eye",
+    "anaquh": "ox",
+    "asTi": "bone",
+    "BrAtf": "brother",
+    "daDi": "curd",
+    "devf": "husband's brother",
+    "duhitf": "daughter",
+    "jAmAtf": "son-in-law",
+    "krozwu": "jackal",
+    "maGavan": "bountiful one (Indra)",
+    "maTin": "churning stick",
+    "mAtf": "mother",
+    "nanandf": "husband's sister",
+    "nf": "man",
+    "paTin": "path",
+    "pati": "lord, husband",
+    "pitf": "father",
+    "pUzan": "Pūṣan (a god)",
+    "saKi": "friend",
+    "sakTi": "thigh",
+    "svasf": "sister",
+    "Svan": "dog",
+    "vftrahan": "slayer of Vṛtra (Indra)",
+    "yAtf": "husband's brother's wife",
+    "yuvan": "young man",
+}
+
+_ENTRIES = ""  # Trie key for a node's analyses; never a letter
+_VOWELS = frozenset("aAiIuUfFxXeEoO")
+# ṇatva: r/ṛ/ṝ/ṣ turn a following n into ṇ unless one of these intervenes
+_NATVA_TRIGGER = frozenset("rfFz")
+_NATVA_BLOCK = frozenset("cCjJYwWqQRtTdDnlSs")
+
+
+class Analysis(NamedTuple):
+    stem: str  # SLP1
+    case: str  # "1".."8"
+    number: str  # s / d / p
+    gender: str  # m / f / n
+    irregular: bool = False
+
+    def describe(self) -> str:
+        return f"{CASE_NAMES[self.case]} {NUMBER_NAMES[self.number]} ({GENDER_NAMES.get(self.gender, self.gender)})"
+
+
+def _read(path: Path) -> list[dict]:
+    if not path.exists():
+        return []
+    with path.open(encoding="utf-8", newline="") as f:
+        return list(csv.DictReader(f))
+
+
+class InflectionAnalyzer:
+    """Reversed-suffix trie over nominal endings with an irregular-forms overlay."""
+
+    def __init__(
+        self,
+        endings_path: Path = ENDINGS_CSV,
+        irregular_path: Path = IRREGULAR_CSV,
+        stems: Iterable[str] | None = None,
+    ) -> None:
+        self.stems = set(stems) if stems is not None else None
+        # (stem type, gender) → [(ending, case, number)], for inflect()
+        self.endings: dict[tuple[str, str], list[tuple[str, str, str]]] = {}
+        # Reversed endings; a node's entries are (stem type, ((case, number, gender, False), ...))
+        self.trie: dict = {}
+        grouped: dict[int, tuple[dict, dict[str, list[tuple]]]] = {}
+        for r in _read(endings_path):
+            stem_type = "" if r["stem_type"] == "_" else r["stem_type"]
+            node = self.trie
+            for ch in reversed(r["ending"]):
+                node = node.setdefault(ch, {})
+            tails = grouped.setdefault(id(node), (node, {}))[1].setdefault(stem_type, [])
+            tail = (r["case"], r["number"], r["form_gender"], False)
+            if tail not in tails:
+                tails.append(tail)
+            self.endings.setdefault((stem_type, r["form_gender"]), []).append((r["ending"], r["case"], r["number"]))
+        for node, by_type in grouped.values():
+            node[_ENTRIES] = tuple((t, tuple(tails)) for t, tails in by_type.items())
+        self.stem_types = sorted({t for t, _ in self.endings}, key=len, reverse=True)
+
+        self.irregular: dict[str, tuple[Analysis, ...]] = {}
+        self.irregular_stems: dict[str, list[tuple[str, str, str, str]]] = {}
+        overlay: dict[str, list[Analysis]] = {}
+        for r in _read(irregular_path):
+            a = Analysis(r["stem"], r["case"], r["number"], r["form_gender"], True)
+            if a not in overlay.setdefault(r["form"], []):
+                overlay[r["form"]].append(a)
+            self.irregular_stems.setdefault(r["stem"], []).append((r["form"], r["case"], r["number"], r["form_gender"]))
+        self.irregular = {form: tuple(items) for form, items in overlay.items()}
+
+    def analyze(self, form: str) -> list[Analysis]:
+        """Every (stem, case, number, gender) reading of an SLP1 form."""
+        if form[-1:] == "H":
+            form = form[:-1] + "s"
+        elif form[-1:] == "M":
+            form = form[:-1] + "m"
+        out = list(self.irregular.get(form, ()))
+        stems, irregular_stems = self.stems, self.irregular_stems
+        seen: set[str] = set()
+        new = tuple.__new__  # Analysis(...) without the NamedTuple constructor's overhead
+        n = len(form)
+        node = self.trie
+        depth = 0
+        while True:
+            entries = node.get(_ENTRIES)
+            if entries and depth < n:
+                head = form[: n - depth]
+                consonant_head = head[-1] not in _VOWELS
+                for stem_type, tails in entries:
+                    if not stem_type and not consonant_head:
+                        continue  # Consonant-stem endings need a consonant stem
+                    stem = head + stem_type
+                    if stem in irregular_stems or (stems is not None and stem not in stems):
+                        continue
+                    key = (stem,)
+                    if stem in seen:  # Same stem via another stem type: skip repeats
+                        out += [a for a in (new(Analysis, key + t) for t in tails) if a not in out]
+                        continue
+                    seen.add(stem)
+                    out += [new(Analysis, key + t) for t in tails]
+            if depth == n:
+                break
+            node = node.get(form[n - 1 - depth])
+            if node is None:
+                break
+            depth += 1
+        return out
+
+    def stem_type(self, stem: str, gender: str) -> str | None:
+        """Longest stem type with endings for this gender that stem ends in."""
+        for t in self.stem_types:
+            if stem.endswith(t) and (t, gender) in self.endings:
+                return t
+        return None
+
+    def inflect(self, stem: str, gender: str) -> list[tuple[str, str, str]]:
+        """(form, case, number) for every form of an SLP1 stem in the given gender."""
+        if stem in self.irregular_stems:
+            return [(f, c, num) for f, c, num, g in self.irregular_stems[stem] if g == gender]
+        t = self.stem_type(stem, gender)
+        if t is None:
+            return []
+        head = stem[: len(stem) - len(t)]
+        rows = self.endings[(t, gender)]
+        # Of each n/ṇ variant pair keep the row ṇatva picks for this stem
+        retroflex = {(e.replace("R", "n"), c, num): _natva(head + e[: e.index("R")]) for e, c, num in rows if "R" in e}
+        return [
+            (head + ending, case, number)
+            for ending, case, number in rows
+            if retroflex.get((ending.replace("R", "n"), case, number), False) == ("R" in ending)
+        ]
+
+
+def _natva(stem: str) -> bool:
+    """True if an n right after this text becomes ṇ: nar-eRa, brahm-ARO, but gaj-ena, dev-AnAm."""
+    trigger = False
+    for c in stem:
+        if c in _NATVA_TRIGGER:
+            trigger = True
+        elif c in _NATVA_BLOCK:
+            trigger = False
+    return trigger
+
+
+@lru_cache(maxsize=1)
+def get_analyzer() -> InflectionAnalyzer:
+    """Process-wide analyzer over the bundled data (all stems accepted)."""
+    return InflectionAnalyzer()
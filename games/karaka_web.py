@@ -0,0 +1,193 @@
+"""
+Kāraka Web — every noun in a sentence hangs on the verb by a case role.
+Given an inflected noun, name the role its case marks.
+
+Level 1: kartṛ / karman (nominative, accusative), singular
+Level 2: + karaṇa / sampradāna (instrumental, dative)
+Level 3: + apādāna / sambandha / adhikaraṇa (ablative, genitive, locative), plural
+Level 4: + sambodhana (vocative), dual
+
+Forms come from games.inflection over the nouns in data/words.json and the
+irregular nouns glossed in IRREGULAR_GLOSSES, and are shown in pausa (devaḥ).
+Grading re-analyzes the form, so a syncretic form (devAByAm: instrumental,
+dative or ablative dual) accepts every role it can mark.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import uuid
+from pathlib import Path
+
+from .engine.core import CoreEngine, Challenge, EvalResult
+from .inflection import CASE_NAMES, IRREGULAR_GLOSSES, NUMBER_NAMES, InflectionAnalyzer
+from .normalize import ascii_fold
+from .sandhi import pausal, to_iast, to_slp1
+from .user_profile import UserProfile
+
+_DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+
+MAX_LEVEL = 4
+
+# case → (kāraka, English role)
+KARAKAS = {
+    "1": ("kartṛ", "agent"),
+    "2": ("karman", "object"),
+    "3": ("karaṇa", "instrument"),
+    "4": ("sampradāna", "recipient"),
+    "5": ("apādāna", "source"),
+    "6": ("sambandha", "relation"),
+    "7": ("adhikaraṇa", "location"),
+    "8": ("sambodhana", "address"),
+}
+VIBHAKTIS = {
+    "1": "prathamā",
+    "2": "dvitīyā",
+    "3": "tṛtīyā",
+    "4": "caturthī",
+    "5": "pañcamī",
+    "6": "ṣaṣṭhī",
+    "7": "saptamī",
+    "8": "sambodhana",
+}
+LEVEL_CASES = {1: "12", 2: "1234", 3: "1234567", 4: "12345678"}
+LEVEL_NUMBERS = {1: "s", 2: "s", 3: "sp", 4: "sdp"}
+
+
+def _aliases() -> dict[str, str]:
+    """Folded answer → case: kāraka, English role, case name, vibhakti or case number."""
+    aliases: dict[str, str] = {}
+    for case, (karaka, role) in KARAKAS.items():
+        for name in (karaka, role, CASE_NAMES[case], VIBHAKTIS[case], case):
+            aliases.setdefault(ascii_fold(name), case)
+    # Nominative spellings of the kāraka names
+    aliases.update({"karta": "1", "kartr": "1", "karma": "2"})
+    return aliases
+
+
+ANSWER_ALIASES = _aliases()
+
+
+def _load_nouns() -> list[dict]:
+    """Stems (SLP1) with gender and meaning: words.json nouns, then irregular stems."""
+    nouns: list[dict] = []
+    path = _DATA_DIR / "words.json"
+    if path.exists():
+        for w in json.loads(path.read_text(encoding="utf-8")):
+            if w.get("iast") and w.get("gender"):
+                nouns.append({"stem": to_slp1(w["iast"]), "gender": w["gender"], "meaning": w.get("meaning", "")})
+    return nouns
+
+
+class KarakaWebEngine(CoreEngine):
+    """
+    Kāraka Web game engine.
+    Challenge: given an inflected noun, name the kāraka (case role) it marks.
+    """
+
+    game_type = "karaka_web"
+    _nouns: list[dict] = []
+    _analyzer: InflectionAnalyzer | None = None
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if KarakaWebEngine._analyzer is None:
+            nouns = _load_nouns()
+            analyzer = InflectionAnalyzer(stems=[n["stem"] for n in nouns])
+            nouns += [
+                {"stem": stem, "gender": forms[0][3], "meaning": IRREGULAR_GLOSSES[stem]}
+                for stem, forms in analyzer.irregular_stems.items()
+                if stem not in analyzer.stems and stem in IRREGULAR_GLOSSES
+            ]
+            KarakaWebEngine._nouns = [n for n in nouns if analyzer.inflect(n["stem"], n["gender"])]
+            KarakaWebEngine._analyzer = analyzer
+
+    def accepted_cases(self, form: str, stem: str, gender: str) -> list[str]:
+        """Every case form can be of stem in gender (SLP1)."""
+        cases = {a.case for a in self._analyzer.analyze(form) if a.stem == stem and a.gender == gender}
+        return sorted(cases)
+
+    def generate(
+        self,
+        user_profile: UserProfile,
+        difficulty: float | None = None,
+    ) -> Challenge:
+        """Pick a noun and one of its forms in a case allowed at the learner's level."""
+        diff = difficulty if difficulty is not None else user_profile.target_difficulty()
+        if not self._nouns:
+            raise ValueError("No nouns loaded. Add gendered nouns to data/words.json")
+        level = min(MAX_LEVEL, 1 + int(diff * MAX_LEVEL))
+        cases, numbers = LEVEL_CASES[level], LEVEL_NUMBERS[level]
+
+        noun = random.choice(self._nouns)
+        forms = [
+            (f, c, num) for f, c, num in self._analyzer.inflect(noun["stem"], noun["gender"])
+            if c in cases and num in numbers
+        ]
+        form, case, number = random.choice(forms)
+        karaka, role = KARAKAS[case]
+        gloss = f" '{noun['meaning']}'" if noun["meaning"] else ""
+        shown = to_iast(pausal(form))
+
+        return Challenge(
+            challenge_id=f"karaka_{uuid.uuid4().hex[:8]}",
+            game_type=self.game_type,
+            prompt=f"{shown} ({to_iast(noun['stem'])}{gloss}) — which kāraka does this form mark?",
+            correct_answer=karaka,
+            source_chunk_ids=[f"karaka_{case}"],
+            topic="karaka",
+            difficulty=diff,
+            meta={
+                "form": shown,
+                "stem": to_iast(noun["stem"]),
+                "gender": noun["gender"],
+                "meaning": noun["meaning"],
+                "case": case,
+                "number": number,
+                "accepted": self.accepted_cases(form, noun["stem"], noun["gender"]),
+                "level": level,
+                "choices": [KARAKAS[c][0] for c in cases],
+            },
+        )
+
+    def evaluate(
+        self,
+        player_input: str,
+        challenge: Challenge,
+    ) -> EvalResult:
+        """Correct if the answer names a role any reading of the form can mark."""
+        meta = challenge.meta or {}
+        case = meta.get("case", "1")
+        accepted = meta.get("accepted") or [case]
+        answered = ANSWER_ALIASES.get(ascii_fold(player_input))
+        karaka, role = KARAKAS[case]
+        why = (
+            f"{meta.get('form')} = {meta.get('stem')}, {CASE_NAMES[case]} "
+            f"{NUMBER_NAMES.get(meta.get('number', 's'), '')} → {karaka} ({role})."
+        )
+        others = [c for c in accepted if c != case]
+        if others:
+            why += " Also readable as " + ", ".join(f"{CASE_NAMES[c]} → {KARAKAS[c][0]}" for c in others) + "."
+        chunk_id = challenge.source_chunk_ids[0] if challenge.source_chunk_ids else ""
+
+        if answered in accepted:
+            return EvalResult(
+                correct=True,
+                rule_id=f"karaka-{KARAKAS[answered][0]}",
+                explanation=f"Correct. {why}",
+                feedback="sādhu!",
+                chunk_id=f"karaka_{answered}",
+            )
+        return EvalResult(
+            correct=False,
+            rule_id=f"karaka-{karaka}",
+            explanation=why,
+            feedback="punar vadatu. Look at the ending.",
+            chunk_id=chunk_id,
+        )
+
+
+def create_karaka_web(corpus=None, tts=None) -> KarakaWebEngine:
+    """Factory for Kāraka Web engine."""
+    return KarakaWebEngine(corpus=corpus, tts=tts)
@@ -0,0 +1,304 @@
+"""
+Multiplayer Dhātu Dash — players in a room race to exhaust one shared root.
+
+Server-authoritative: the room owns the DhatuSession and the game clock.
+A valid move claims its form for the mover (first claim wins) and the updated
+tree is broadcast to every player. Everything runs on the event loop — no
+per-room tasks or threads, timers are loop.call_later handles — so one worker
+can hold thousands of idle-heavy rooms.
+
+Protocol (JSON over WebSocket):
+  client → {"type": "start"}                    start early (e.g. solo play)
+  client → {"type": "move", "form": "gacchati"}
+  server → state | start | move | rejected | end
+
+The server closes every connection once the room has ended. A player id
+that connects again takes over its player; the older connection is closed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable
+
+from .dhatu_dash import DhatuSession
+from .normalize import canonicalize
+
+logger = logging.getLogger(__name__)
+
+# Game length once a room starts
+ROUND_SECONDS = 90.0
+# The clock starts by itself when this many players are in the room
+MIN_PLAYERS = 2
+MAX_PLAYERS = 8
+
+SendFn = Callable[[dict[str, Any]], Awaitable[None]]
+CloseFn = Callable[[], Awaitable[None]]
+# (session, canonical form) → is it a new valid form, e.g. DhatuDashEngine.accepts
+AcceptsFn = Callable[[DhatuSession, str], bool]
+
+
+class RoomError(Exception):
+    """Join refused (room full or already finished)."""
+
+
+@dataclass
+class Player:
+    player_id: str
+    send: SendFn
+    claimed: list[str] = field(default_factory=list)
+    close: CloseFn | None = None  # Closes this player's connection when a newer one takes over
+
+
+class Room:
+    """One shared root, its players and its clock. Only touched from the event loop."""
+
+    def __init__(
+        self,
+        room_id: str,
+        session: DhatuSession,
+        round_seconds: float = ROUND_SECONDS,
+        min_players: int = MIN_PLAYERS,
+        max_players: int = MAX_PLAYERS,
+        on_finish: Callable[[Room], None] | None = None,
+        accepts: AcceptsFn | None = None,
+    ) -> None:
+        self.room_id = room_id
+        self.accepts = accepts
+        self.session = session
+        self.round_seconds = round_seconds
+        self.min_players = min_players
+        self.max_players = max_players
+        self.players: dict[str, Player] = {}
+        self.deadline: float | None = None  # loop.time() when the round ends
+        self.finished = False
+        self.closed = asyncio.Event()  # Set by finish(): connection handlers stop reading
+        self._timer: asyncio.TimerHandle | None = None
+        self._end_task: asyncio.Task | None = None
+        self._on_finish = on_finish
+
+    @property
+    def started(self) -> bool:
+        return self.deadline is not None
+
+    def scores(self) -> dict[str, int]:
+        return {pid: len(p.claimed) for pid, p in self.players.items()}
+
+    def _remaining_ms(self) -> int | None:
+        if self.deadline is None:
+            return None
+        return max(0, int((self.deadline - asyncio.get_running_loop().time()) * 1000))
+
+    def snapshot(self) -> dict[str, Any]:
+        s = self.session
+        return {
+            "room_id": self.room_id,
+            "root_id": s.root_id,
+            "root_iast": s.root_iast,
+            "root_meaning": s.root_meaning,
+            "root_devanagari": s.root_devanagari,
+            "tree": sorted(s.tree),
+            "remaining": len(s.unused),
+            "players": sorted(self.players),
+            "scores": self.scores(),
+            "started": self.started,
+            "remaining_ms": self._remaining_ms(),
+        }
+
+    async def join(self, player_id: str, send: SendFn, close: CloseFn | None = None) -> None:
+        """
+        Add a player, or move an existing one to a new connection (reconnect, second tab):
+        the claims are kept and the superseded connection is closed.
+        """
+        if self.finished:
+            raise RoomError("Game already finished")
+        if player_id not in self.players and len(self.players) >= self.max_players:
+            raise RoomError("Room is full")
+        player = self.players.get(player_id)
+        if player is None:
+            self.players[player_id] = Player(player_id, send, close=close)
+        else:
+            superseded = player.close
+            player.send, player.close = send, close
+            if superseded is not None:
+                try:
+                    await superseded()
+                except Exception as e:
+                    logger.debug("Closing superseded connection of %s failed: %s", player_id, e)
+        await send({"type": "state", **self.snapshot()})
+        if not self.started and len(self.players) >= self.min_players:
+            await self.start()
+
+    async def leave(self, player_id: str, send: SendFn | None = None) -> None:
+        """Drop a player; with send (the object passed to join), only if it is still the player's connection."""
+        player = self.players.get(player_id)
+        if player is not None and send is not None and player.send is not send:
+            return  # A superseded connection closing; the player is still on the newer one
+        self.players.pop(player_id, None)
+        if not self.players:
+            self.finish()
+        elif not self.finished:
+            await self.broadcast({"type": "state", **self.snapshot()})
+
+    async def start(self) -> None:
+        if self.started or self.finished:
+            return
+        loop = asyncio.get_running_loop()
+        self.deadline = loop.time() + self.round_seconds
+        self._timer = loop.call_later(self.round_seconds, self._on_timeout)
+        await self.broadcast({"type": "start", "remaining_ms": self._remaining_ms()})
+
+    async def move(self, player_id: str, player_input: str) -> bool:
+        """
+        Validate a move with accepts (the engine's check, so a room takes the same forms as solo
+        play), else against the session's unused forms. True if it claimed a form.
+        """
+        player = self.players.get(player_id)
+        if player is None:
+            return False
+        reason = None
+        form = canonicalize(player_input)
+        if not self.started:
+            reason = "not_started"
+        elif self.finished:
+            reason = "finished"
+        elif form in self.session.tree:
+            reason = "repeat"
+        elif not (self.accepts(self.session, form) if self.accepts else form in self.session.unused):
+            reason = "invalid"
+        if reason:
+            await player.send({"type": "rejected", "form": player_input, "reason": reason})
+            return False
+
+        self.session.add_form(form)
+        player.claimed.append(form)
+        await self.broadcast(
+            {
+                "type": "move",
+                "player_id": player_id,
+                "form": form,
+                "tree": sorted(self.session.tree),
+                "remaining": len(self.session.unused),
+                "scores": self.scores(),
+                "remaining_ms": self._remaining_ms(),
+            }
+        )
+        if self.session.is_exhausted():
+            await self._end("exhausted")
+        return True
+
+    async def broadcast(self, message: dict[str, Any]) -> None:
+        """Send to every player concurrently; players whose socket fails are dropped."""
+        players = list(self.players.values())
+        results = await asyncio.gather(
+            *(p.send(message) for p in players), return_exceptions=True
+        )
+        for p, r in zip(players, results):
+            if isinstance(r, Exception):
+                logger.debug("Dropping player %s from room %s: %s", p.player_id, self.room_id, r)
+                self.players.pop(p.player_id, None)
+
+    def _on_timeout(self) -> None:
+        if not self.finished:
+            # Keep a reference so the task is not collected mid-broadcast
+            self._end_task = asyncio.get_running_loop().create_task(self._end("timeout"))
+            self._end_task.add_done_callback(self._log_end_failure)
+
+    def _log_end_failure(self, task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Ending room %s on timeout failed", self.room_id, exc_info=task.exception())
+            self.finish()
+
+    async def _end(self, reason: str) -> None:
+        if self.finished:
+            return
+        scores = self.scores()
+        best = max(scores.values(), default=0)
+        winners = sorted(pid for pid, n in scores.items() if n == best and best > 0)
+        await self.broadcast(
+            {
+                "type": "end",
+                "reason": reason,
+                "scores": scores,
+                "winners": winners,
+                "tree": sorted(self.session.tree),
+            }
+        )
+        self.finish()
+
+    def finish(self) -> None:
+        """Stop the clock and release the room. Idempotent."""
+        if self.finished:
+            return
+        self.finished = True
+        self.closed.set()
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._on_finish is not None:
+            self._on_finish(self)
+
+
+class RoomManager:
+    """Rooms by id for one worker. A room is created on first join and dropped when it ends."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], DhatuSession],
+        round_seconds: float = ROUND_SECONDS,
+        min_players: int = MIN_PLAYERS,
+        max_players: int = MAX_PLAYERS,
+        max_rooms: int = 20_000,
+        accepts: AcceptsFn | None = None,
+    ) -> None:
+        self.session_factory = session_factory
+        self.accepts = accepts
+        self.round_seconds = round_seconds
+        self.min_players = min_players
+        self.max_players = max_players
+        self.max_rooms = max_rooms
+        self.rooms: dict[str, Room] = {}
+
+    def __len__(self) -> int:
+        return len(self.rooms)
+
+    def get_or_create(self, room_id: str) -> Room:
+        room = self.rooms.get(room_id)
+        if room is None:
+            if len(self.rooms) >= self.max_rooms:
+                raise RoomError("Too many rooms on this server")
+            room = Room(
+                room_id,
+                self.session_factory(),
+                round_seconds=self.round_seconds,
+                min_players=self.min_players,
+                max_players=self.max_players,
+                on_finish=self._forget,
+                accepts=self.accepts,
+            )
+            self.rooms[room_id] = room
+        return room
+
+    async def join(self, room_id: str, player_id: str, send: SendFn, close: CloseFn | None = None) -> Room:
+        room = self.get_or_create(room_id)
+        await room.join(player_id, send, close)
+        return room
+
+    def _forget(self, room: Room) -> None:
+        if self.rooms.get(room.room_id) is room:
+            del self.rooms[room.room_id]
+
+
+async def handle_message(room: Room, player_id: str, message: dict[str, Any]) -> None:
+    """Dispatch one client message to the room."""
+    kind = message.get("type")
+    if kind == "move":
+        await room.move(player_id, str(message.get("form", "")))
+    elif kind == "start":
+        await room.start()
+    else:
+        player = room.players.get(player_id)
+        if player is not None:
+            await player.send({"type": "rejected", "reason": f"unknown message type {kind!r}"})
@@ -0,0 +1,104 @@
+"""
+One canonical form for every Sanskrit answer: NFC, lowercase IAST.
+
+Learners type Devanagari, IAST (precomposed or NFD-decomposed), Harvard-Kyoto,
+ITRANS or SLP1. canonicalize() detects the scheme, transliterates to IAST and
+memoizes the result in a bounded LRU — game turns repeat the same handful of
+forms, so nearly every call is a cache hit.
+
+Detection is per string (schemes are not mixed within one answer):
+  - any Devanagari code point                      → Devanagari
+  - any IAST diacritic                              → IAST
+  - ASCII with ITRANS-only spellings (aa, sh, RRi…) → ITRANS
+  - ASCII with SLP1-only letters (K, f, w, E…)      → SLP1
+  - other ASCII with upper case                     → Harvard-Kyoto
+  - plain lower-case ASCII                          → already IAST
+A single leading capital ("Bhavati" from a phone keyboard) and all-caps input
+("BHAVATI", caps lock) are read as capitalisation, not as scheme letters.
+
+ascii_fold() strips diacritics (kṛ → kri, bhū → bhu) for lookups that should
+tolerate a learner typing without them.
+
+Benchmark: python scripts/benchmarks/bench_normalize.py
+"""
+
+from __future__ import annotations
+
+import re
+import unicodedata
+from functools import lru_cache
+
+from indic_transliteration import sanscript
+
+# Distinct inputs kept in the canonicalize LRU
+CACHE_SIZE = 65536
+
+DEVANAGARI = "devanagari"
+IAST = "iast"
+HK = "hk"
+ITRANS = "itrans"
+SLP1 = "slp1"
+
+_SCHEMES = {
+    DEVANAGARI: sanscript.DEVANAGARI,
+    HK: sanscript.HK,
+    ITRANS: sanscript.ITRANS,
+    SLP1: sanscript.SLP1,
+}
+
+_DEVANAGARI_RE = re.compile("[ऀ-ॿ]")
+_IAST_MARKS = set("āīūṛṝḷḹṅñṭḍṇśṣṃṁḥĀĪŪṚṜḶḸṄÑṬḌṆŚṢṂṀḤ")
+_ITRANS_RE = re.compile(r"aa|ii|uu|sh|Sh|chh|Ch|RRi|RRI|LLi|R\^i|L\^i|~n|~N|\.n|\.h|\.a|N\^|GY|x")
+# Letters SLP1 uses that Harvard-Kyoto does not: aspirates, vocalic f/x, w/q retroflexes, E/O, Y
+_SLP1_RE = re.compile("[KCWQPBEOFXYfwq]")
+# Aspirate digraphs — SLP1 never needs them, HK always does
+_HK_DIGRAPH_RE = re.compile("[kgcjTDtdpb]h")
+_SPACE_RE = re.compile(r"\s+")
+
+_FOLD = str.maketrans({"ṛ": "ri", "ṝ": "ri", "ḷ": "li", "ḹ": "li", "ṃ": "m", "ṁ": "m", "ḥ": "h"})
+
+
+def _typed_case(text: str) -> str:
+    """Lower-case text whose capitals are capitalisation: just a leading capital, or all caps."""
+    if text[1:] == text[1:].lower() or text == text.upper():
+        return text.lower()
+    return text
+
+
+def detect_scheme(text: str) -> str:
+    """Best guess at the input scheme of text (one of the module constants)."""
+    if _DEVANAGARI_RE.search(text):
+        return DEVANAGARI
+    if any(c in _IAST_MARKS for c in text):
+        return IAST
+    if not text.isascii():
+        return IAST
+    text = _typed_case(text)
+    if text == text.lower():
+        return ITRANS if _ITRANS_RE.search(text) else IAST
+    if _ITRANS_RE.search(text):
+        return ITRANS
+    if _SLP1_RE.search(text) and not _HK_DIGRAPH_RE.search(text):
+        return SLP1
+    return HK
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def canonicalize(text: str) -> str:
+    """NFC lower-case IAST for text in any supported scheme; whitespace collapsed."""
+    if not text:
+        return ""
+    text = _SPACE_RE.sub(" ", unicodedata.normalize("NFC", text).strip())
+    scheme = detect_scheme(text)
+    if scheme == IAST:
+        return text.lower()
+    text = _typed_case(text)
+    out = sanscript.transliterate(text, _SCHEMES[scheme], sanscript.IAST)
+    return unicodedata.normalize("NFC", out).lower()
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def ascii_fold(text: str) -> str:
+    """canonicalize(), then strip diacritics: kṛ → kri, bhū → bhu, śabda → sabda."""
+    decomposed = unicodedata.normalize("NFD", canonicalize(text).translate(_FOLD))
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
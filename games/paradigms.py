@@ -0,0 +1,661 @@
+"""
+Verb paradigm generator — every root × every ending, compiled into a minimal automaton.
+
+Present system (pres / ipft / impv / opt) plus the parasmaipada benedictive are
+generated for each root from its gaṇa and pada:
+  - roots: data/dhatus.json, plus the Dhātupāṭha (panini_data/dhatu) when present
+  - endings: data/verb-endings.csv (simple = gaṇas 1/4/6/10, complex = the rest)
+  - stems: gaṇa rules with an override table for irregular presents (gam → gacCa)
+  - joins: internal sandhi at the stem/ending boundary (vac + Di → vagDi,
+    karo + E → karavE, ṣatva), kuru → kur before m/v/y, ṇatva over the word
+Athematic roots whose stem-final consonant the joins do not model (h, j, s,
+nasals) get no present system unless PRESENT_STEMS lists them.
+
+Keys "root|form|tag" (SLP1, e.g. "BU|Bavati|pres.3s.para") are compiled into a
+minimal DAFSA (Daciuk et al. 2000), flattened into four arrays and written to
+data/build/paradigms.dafsa. At startup the file is memory-mapped, so a lookup is
+one walk of len(key) transitions and millions of forms cost a few MB shared by
+every worker.
+
+Build by hand: python -m games.paradigms
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import mmap
+import os
+import struct
+import tempfile
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from indic_transliteration import sanscript
+
+_PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DATA_DIR = _PROJECT_ROOT / "data"
+ENDINGS_CSV = DATA_DIR / "verb-endings.csv"
+SANDHI_CSV = DATA_DIR / "sandhi-rules.csv"
+DHATUS_JSON = DATA_DIR / "dhatus.json"
+DHATUPATHA = _PROJECT_ROOT / "panini_data" / "dhatu" / "data.txt"
+BUILD_PATH = DATA_DIR / "build" / "paradigms.dafsa"
+
+SEP = "|"
+
+# SLP1 phoneme classes
+SHORT_VOWELS = "aiufx"
+VOWELS = "aAiIuUfFxXeEoO"
+GUNA = {"i": "e", "I": "e", "u": "o", "U": "o", "f": "ar", "F": "ar", "x": "al"}
+VRDDHI = {"a": "A", "i": "E", "I": "E", "u": "O", "U": "O", "f": "Ar", "F": "Ar", "e": "E", "o": "O"}
+# Homorganic nasal for the 7th-gaṇa infix
+NASAL = {**dict.fromkeys("kKgG", "N"), **dict.fromkeys("cCjJ", "Y"), **dict.fromkeys("wWqQ", "R"),
+         **dict.fromkeys("tTdD", "n"), **dict.fromkeys("pPbB", "m")}
+
+SIMPLE_GANAS = (1, 4, 6, 10)
+
+# Irregular present stems: thematic (stem,) or athematic
+# (strong, weak[, weak before vowels[, strong before vowels]])
+PRESENT_STEMS: dict[str, tuple[str, ...]] = {
+    "gam": ("gacCa",),
+    "yam": ("yacCa",),
+    "iz": ("icCa",),
+    "dfS": ("paSya",),
+    "sTA": ("tizWa",),
+    "pA": ("piba",),
+    "GrA": ("jiGra",),
+    "sad": ("sIda",),
+    "Sru": ("SfRo", "SfRu"),
+    "jYA": ("jAnA", "jAnI", "jAn"),
+    "kf": ("karo", "kuru"),
+    "as": ("as", "s"),
+    "dA": ("dadA", "dad"),
+    "DA": ("daDA", "Dad"),
+    "brU": ("bravI", "brU", "bruv", "brav"),
+}
+
+# Single slots the stem rules get wrong
+IRREGULAR_FORMS: dict[tuple[str, str], str] = {
+    ("as", "pres.2s.para"): "asi",
+    ("as", "ipft.3s.para"): "AsIt",
+    ("as", "ipft.2s.para"): "AsIs",
+    ("as", "impv.2s.para"): "eDi",
+    ("dA", "impv.2s.para"): "dehi",
+    ("DA", "impv.2s.para"): "Dehi",
+    ("hu", "impv.2s.para"): "juhuDi",
+}
+
+# Samprasāraṇa in the benedictive (vac → ucyAt)
+SAMPRASARANA = {"vac": "uc", "vad": "ud", "vap": "up", "vas": "us", "vah": "uh", "yaj": "ij",
+                "svap": "sup", "grah": "gfh", "praC": "pfC"}
+
+
+@dataclass(frozen=True)
+class Root:
+    root: str  # SLP1
+    gana: int
+    voices: tuple[str, ...]  # "para" and/or "atma"
+
+
+@dataclass(frozen=True)
+class Ending:
+    ending: str
+    category: str  # simple | complex | both
+    person: int
+    number: str
+    mode: str
+    voice: str
+
+    @property
+    def tag(self) -> str:
+        return f"{self.mode}.{self.person}{self.number}.{self.voice}"
+
+
+# ── Transliteration ───────────────────────────────────────────────────
+
+
+@lru_cache(maxsize=65536)
+def iast_to_slp1(text: str) -> str:
+    return sanscript.transliterate(text.strip().lower(), sanscript.IAST, sanscript.SLP1)
+
+
+# ── Sources ───────────────────────────────────────────────────────────
+
+
+def _voices(pada: str) -> tuple[str, ...]:
+    p = (pada or "").strip().lower()
+    if p.startswith(("para", "p", "प")):
+        return ("para",)
+    if p.startswith(("atma", "ātma", "a", "आ")):
+        return ("atma",)
+    return ("para", "atma")
+
+
+def load_roots() -> list[Root]:
+    """Roots from dhatus.json, then the Dhātupāṭha if it is checked out. Deduplicated."""
+    roots: dict[tuple[str, int], Root] = {}
+    if DHATUS_JSON.exists():
+        data = json.loads(DHATUS_JSON.read_text(encoding="utf-8"))
+        for d in data if isinstance(data, list) else data.get("data", []):
+            if d.get("iast") and d.get("gana"):
+                r = Root(iast_to_slp1(d["iast"]), int(d["gana"]), _voices(d.get("voice", "")))
+                roots.setdefault((r.root, r.gana), r)
+    if DHATUPATHA.exists():
+        raw = json.loads(DHATUPATHA.read_text(encoding="utf-8"))
+        for e in raw.get("data", []):
+            try:
+                gana = int(str(e.get("gana", "")).strip())
+            except ValueError:
+                continue
+            dhatu = sanscript.transliterate(
+                str(e.get("dhatu", "")).strip(), sanscript.DEVANAGARI, sanscript.SLP1
+            )
+            if dhatu and 1 <= gana <= 10:
+                r = Root(dhatu, gana, _voices(e.get("pada", "")))
+                roots.setdefault((r.root, r.gana), r)
+    return list(roots.values())
+
+
+def load_endings(path: Path = ENDINGS_CSV) -> list[Ending]:
+    with path.open(encoding="utf-8", newline="") as f:
+        return [
+            Ending(row["ending"], row["category"], int(row["person"]), row["number"], row["mode"], row["voice"])
+            for row in csv.DictReader(f)
+        ]
+
+
+@lru_cache(maxsize=1)
+def _sandhi_rules() -> dict[tuple[str, str], str]:
+    """(vowel, vowel) → result from the internal and common rules; internal wins.
+    Consonant rows are word-boundary sandhi (t + m → nm) and do not apply inside a verb form."""
+    rules: dict[tuple[str, str], str] = {}
+    with SANDHI_CSV.open(encoding="utf-8", newline="") as f:
+        rows = [r for r in csv.DictReader(f) if r["type"] in ("common", "internal")]
+    for r in sorted(rows, key=lambda r: r["type"] == "internal"):
+        if r["first"] in VOWELS and r["second"] in VOWELS and len(r["first"]) == len(r["second"]) == 1:
+            rules[(r["first"], r["second"])] = r["result"].replace(" ", "")
+    return rules
+
+
+# ── Morphology ────────────────────────────────────────────────────────
+
+# Stem-final consonants the internal sandhi below handles in athematic classes
+MODELLED_FINALS = frozenset(VOWELS + "kKgGcCtTdDpPbBSz")
+_VOICELESS = {**dict.fromkeys("kKgGcC", "k"), **dict.fromkeys("tTdD", "t"), **dict.fromkeys("pPbB", "p")}
+_VOICED = {**dict.fromkeys("kKgGcC", "g"), **dict.fromkeys("tTdD", "d"), **dict.fromkeys("pPbB", "b")}
+_BARTHOLOMAE = {"G": "g", "D": "d", "B": "b"}  # Voiced aspirate + t → unaspirated + dh
+_PAUSAL = {**_VOICELESS, "S": "w", "z": "w"}
+_SEMIVOWEL = {"e": "ay", "o": "av", "E": "Ay", "O": "Av"}
+# ṇatva: n → ṇ after r/ṛ/ṣ unless one of these intervenes
+_NATVA_BLOCK = frozenset("cCjJYwWqQRtTdDnlSsz")
+
+
+def _consonant_join(last: str, first: str) -> str:
+    """Internal sandhi of a stem-final consonant and an ending-initial consonant."""
+    if first in "tT":
+        if last in _BARTHOLOMAE:
+            return _BARTHOLOMAE[last] + "D"  # rundh + ti → runaddhi
+        if last in "Sz":
+            return "zw" if first == "t" else "zW"  # dviz + ti → dvezwi
+        return _VOICELESS.get(last, last) + first  # vac + ti → vakti, dad + tas → dattas
+    if first == "s":
+        if last in "Sz" or _VOICELESS.get(last) == "k":
+            return "kz"  # vac + si → vakzi
+        return _VOICELESS.get(last, last) + "s"  # dad + se → datse
+    if first == "D":
+        if last in "Sz":
+            return "qQ"  # dviz + Di → dviqQi
+        return _VOICED.get(last, last) + "D"  # vac + Di → vagDi
+    return last + first
+
+
+def _join(stem: str, ending: str, thematic: bool = False) -> str:
+    """Stem + ending with internal sandhi at the boundary."""
+    if not stem or not ending:
+        return stem + ending
+    last, first = stem[-1], ending[0]
+    if thematic and last == "a":
+        if first == "a":
+            return stem[:-1] + ending  # bhava + anti → bhavanti
+        if first in "mv":
+            return stem[:-1] + "A" + ending  # bhava + mi → bhavAmi
+    if last not in VOWELS:
+        return stem[:-1] + _consonant_join(last, first) + ending[1:]
+    if first in VOWELS:
+        if last in _SEMIVOWEL:
+            return stem[:-1] + _SEMIVOWEL[last] + ending  # karo + E → karavE
+        if last in "uU" and len(stem) >= 3 and stem[-2] not in VOWELS and stem[-3] not in VOWELS:
+            return stem[:-1] + "uv" + ending  # Apnu + anti → Apnuvanti
+        res = _sandhi_rules().get((last, first))
+        return stem + ending if res is None else stem[:-1] + res + ending[1:]
+    if first == "s" and len(ending) > 1 and last not in "aA":
+        return stem + "z" + ending[1:]  # ṣatva: karo + si → karozi
+    return stem + ending
+
+
+def _retroflex_n(form: str) -> str:
+    """ṇatva over the whole word: karavAni → karavARi, krInAti → krIRAti, but SfRavAni stays."""
+    out = []
+    trigger = False
+    for i, c in enumerate(form):
+        if c in "rfFz":
+            trigger = True
+        elif c == "n" and trigger and i + 1 < len(form) and form[i + 1] in VOWELS + "yvmn":
+            c = "R"
+        if c in _NATVA_BLOCK:
+            trigger = False
+        out.append(c)
+    return "".join(out)
+
+
+def _guna(root: str) -> str:
+    """Guṇa of a final vowel, or of a short penultimate vowel before one consonant."""
+    if root[-1] in GUNA:
+        return root[:-1] + GUNA[root[-1]]
+    if len(root) >= 2 and root[-2] in SHORT_VOWELS and root[-2] in GUNA:
+        return root[:-2] + GUNA[root[-2]] + root[-1]
+    return root
+
+
+def _vrddhi(root: str) -> str:
+    if root[-1] in VRDDHI:
+        return root[:-1] + VRDDHI[root[-1]]
+    return _guna(root)
+
+
+def _reduplicate(root: str) -> str:
+    """Reduplicating syllable: first consonant de-aspirated / palatalised + short vowel."""
+    vowel = next((c for c in root if c in VOWELS), "a")
+    short = {"A": "a", "I": "i", "U": "u", "F": "i", "f": "i", "e": "i", "o": "u"}.get(vowel, vowel)
+    first = root[0] if root[0] not in VOWELS else ""
+    first = {"K": "c", "k": "c", "g": "j", "G": "j", "h": "j", "C": "c", "J": "j",
+             "T": "t", "D": "d", "P": "p", "B": "b", "W": "w", "Q": "q"}.get(first, first)
+    return first + short
+
+
+def _drop_nasal(root: str) -> str:
+    """Penultimate nasal lost before the 9th-gaṇa suffix and the benedictive: banD → baDnAti, baDyAt."""
+    if len(root) >= 3 and root[-2] in "NYRnmM" and root[-1] not in VOWELS:
+        return root[:-2] + root[-1]
+    return root
+
+
+def _light_u(stem: str) -> bool:
+    """Stem ends in u after a single consonant (kuru, SfRu, sunu — not Apnu)."""
+    return len(stem) >= 3 and stem[-1] == "u" and stem[-2] not in VOWELS and stem[-3] in VOWELS
+
+
+def present_stems(r: Root) -> tuple[str, ...]:
+    """(stem,) for thematic gaṇas; (strong, weak, weak before vowels, strong before vowels) for athematic ones."""
+    if r.root in PRESENT_STEMS:
+        stems = PRESENT_STEMS[r.root]
+    elif r.gana == 1:
+        stems = (_join(_guna(r.root), "a"),)
+    elif r.gana == 4:
+        stems = (r.root + "ya",)
+    elif r.gana == 6:
+        stems = (_join(r.root, "a"),)
+    elif r.gana == 10:
+        stems = (_join(_vrddhi(r.root) if r.root[-1] in VOWELS else _guna(r.root), "aya"),)
+    elif r.gana == 2:
+        stems = (_guna(r.root), r.root)
+    elif r.gana == 3:
+        red = _reduplicate(r.root)
+        stems = (red + _guna(r.root), red + r.root)
+    elif r.gana == 5:
+        stems = (r.root + "no", r.root + "nu")
+    elif r.gana == 7:
+        head, tail = r.root[:-1], r.root[-1]
+        stems = (head + "na" + tail, head + NASAL.get(tail, "M") + tail)
+    elif r.gana == 8:
+        stems = (_guna(r.root) + "o", r.root + "u")
+    else:  # 9: final ū shortened (pU → punAti)
+        base = _drop_nasal(r.root)
+        if base[-1] == "U":
+            base = base[:-1] + "u"
+        stems = (base + "nA", base + "nI", base + "n")
+    if len(stems) == 2:
+        stems = (*stems, stems[1])
+    if len(stems) == 3:
+        stems = (*stems, stems[0])
+    return stems
+
+
+def _modelled(r: Root, stems: tuple[str, ...]) -> bool:
+    """
+    Whether the present system of the root is generated. Thematic stems always are; athematic
+    ones when listed in PRESENT_STEMS or when their stem finals are ones the sandhi above handles
+    (not h, j, s, nasals...) and, in gaṇa 2, not an i/u/ṛ root (stauti-type vṛddhi).
+    """
+    if len(stems) == 1 or r.root in PRESENT_STEMS:
+        return True
+    if r.gana == 2 and r.root[-1] in "iIuUfF":
+        return False
+    return all(s[-1] in MODELLED_FINALS for s in stems[:2])
+
+
+def _strong(e: Ending) -> bool:
+    """Athematic strong-stem slots: singular active of pres/ipft, impv 3s active, impv 1st person."""
+    if e.mode == "impv":
+        return e.person == 1 or (e.voice == "para" and e.person == 3 and e.number == "s")
+    return e.voice == "para" and e.mode in ("pres", "ipft") and e.number == "s"
+
+
+def _athematic(r: Root, stems: tuple[str, ...], e: Ending) -> tuple[str, str]:
+    """(stem, ending) for an athematic slot, with the class-specific ending changes."""
+    ending = e.ending
+    if _strong(e):
+        stem = stems[3] if ending[:1] in VOWELS else stems[0]
+    else:
+        stem = stems[2] if ending[:1] in VOWELS else stems[1]
+    if r.gana == 3 and e.voice == "para" and e.person == 3 and e.number == "p":
+        # No n in the reduplicated 3rd plural active: dadati, dadatu, adaduH, ajuhavuH
+        if e.mode == "ipft":
+            ending = "us"
+            if stem[-1] in VOWELS:
+                stem = stems[0][:-1] if stems[0][-1] == "A" else stems[0]
+        else:
+            ending = ending.replace("n", "", 1)
+    if e.tag == "impv.2s.para":
+        if r.gana in (5, 8) and _light_u(stem):
+            ending = ""  # kuru, SfRu
+        elif r.gana == 9 and r.root[-1] not in VOWELS:
+            stem, ending = stems[2][:-1], "Ana"  # aSAna
+        elif stem[-1] not in VOWELS:
+            ending = "Di"  # vagDi, vidDi
+    return stem, ending
+
+
+def _u_stems(r: Root, stem: str, ending: str) -> list[str]:
+    """kuru → kur before m/v/y; other light u-stems drop u optionally before m/v (SfRumas, SfRmas)."""
+    if r.gana in (5, 8) and ending and _light_u(stem):
+        if r.root == "kf" and ending[0] in "mvy":
+            return [stem[:-1]]
+        if ending[0] in "mv":
+            return [stem, stem[:-1]]
+    return [stem]
+
+
+def _augment(form: str, root: str) -> str:
+    """Imperfect augment: a + consonant, vṛddhi of an initial vowel (also one the weak stem lost: as → Asan)."""
+    if form[0] in VOWELS:
+        return VRDDHI.get(form[0], form[0]) + form[1:]
+    if root[0] in VOWELS:
+        return VRDDHI.get(root[0], root[0]) + form
+    return "a" + form
+
+
+def _benedictive_base(r: Root) -> str:
+    root = SAMPRASARANA.get(r.root, r.root)
+    if r.gana == 9:
+        root = _drop_nasal(root)
+    last = root[-1]
+    return root[:-1] + {"A": "e", "f": "ri", "i": "I", "u": "U"}.get(last, last)
+
+
+PRESENT_MODES = ("pres", "ipft", "impv", "opt")
+
+
+def _present_forms(r: Root, stems: tuple[str, ...], e: Ending) -> list[str]:
+    if len(stems) == 1:
+        bases, ending, thematic = [stems[0]], e.ending, True
+    else:
+        stem, ending = _athematic(r, stems, e)
+        bases, thematic = _u_stems(r, stem, ending), False
+    forms = []
+    for stem in bases:
+        if not thematic and e.mode == "ipft" and ending in ("t", "s") and stem[-1] not in VOWELS:
+            form = stem[:-1] + _PAUSAL.get(stem[-1], stem[-1])  # Final cluster reduced: avac-t → avak
+        else:
+            form = _join(stem, ending, thematic)
+        if e.mode == "ipft":
+            form = _augment(form, r.root)
+        forms.append(_retroflex_n(form))
+    return forms
+
+
+def generate_forms(r: Root, endings: list[Ending]) -> Iterator[tuple[str, str]]:
+    """(form, tag) for every ending that applies to the root's gaṇa and pada."""
+    category = "simple" if r.gana in SIMPLE_GANAS else "complex"
+    stems = present_stems(r)
+    present = _modelled(r, stems)
+    for e in endings:
+        if e.voice not in r.voices or e.category not in (category, "both"):
+            continue
+        if e.mode in PRESENT_MODES:
+            if not present:
+                continue
+            irregular = IRREGULAR_FORMS.get((r.root, e.tag))
+            forms = [irregular] if irregular else _present_forms(r, stems, e)
+        elif e.mode == "ben" and e.voice == "para":
+            forms = [_retroflex_n(_benedictive_base(r) + e.ending)]
+        else:
+            continue  # Periphrastic future / ātmanepada benedictive need stems not modelled here
+        for form in forms:
+            yield form, e.tag
+            if form[-1] in "sr":
+                yield form[:-1] + "H", e.tag  # Pausal form: bhavāmaḥ
+
+
+def paradigm_keys(roots: Iterable[Root], endings: list[Ending]) -> list[str]:
+    """Sorted, unique "root|form|tag" keys."""
+    keys = {
+        f"{r.root}{SEP}{form}{SEP}{tag}"
+        for r in roots
+        for form, tag in generate_forms(r, endings)
+    }
+    return sorted(keys)
+
+
+# ── Minimal DAFSA ─────────────────────────────────────────────────────
+
+_MAGIC = b"SKDAFSA1"
+_HEADER = struct.Struct("<8sIII4x")
+
+
+class _Node:
+    __slots__ = ("final", "edges")
+
+    def __init__(self) -> None:
+        self.final = False
+        self.edges: dict[int, _Node] = {}
+
+    def signature(self) -> tuple:
+        return (self.final, tuple((label, id(child)) for label, child in sorted(self.edges.items())))
+
+
+def _build_dafsa(keys: list[bytes]) -> _Node:
+    """Incremental minimal automaton for sorted input (Daciuk, Mihov, Watson & Watson 2000)."""
+    root = _Node()
+    register: dict[tuple, _Node] = {}
+    unchecked: list[tuple[_Node, int, _Node]] = []
+    previous = b""
+
+    def minimize(down_to: int) -> None:
+        while len(unchecked) > down_to:
+            parent, label, child = unchecked.pop()
+            sig = child.signature()
+            if sig in register:
+                parent.edges[label] = register[sig]
+            else:
+                register[sig] = child
+
+    for key in keys:
+        if key <= previous and previous:
+            raise ValueError("DAFSA keys must be sorted and unique")
+        common = 0
+        for a, b in zip(key, previous):
+            if a != b:
+                break
+            common += 1
+        minimize(common)
+        node = unchecked[-1][2] if unchecked else root
+        for label in key[common:]:
+            child = _Node()
+            node.edges[label] = child
+            unchecked.append((node, label, child))
+            node = child
+        node.final = True
+        previous = key
+    minimize(0)
+    return root
+
+
+def _serialize(root: _Node, n_keys: int) -> bytes:
+    """Flatten to: header | edge starts u32[n+1] | targets u32[e] | finals u8[n] | labels u8[e]."""
+    order: list[_Node] = [root]
+    ids = {id(root): 0}
+    i = 0
+    while i < len(order):
+        for _, child in sorted(order[i].edges.items()):
+            if id(child) not in ids:
+                ids[id(child)] = len(order)
+                order.append(child)
+        i += 1
+
+    starts = [0]
+    targets: list[int] = []
+    labels = bytearray()
+    finals = bytearray()
+    for node in order:
+        for label, child in sorted(node.edges.items()):
+            labels.append(label)
+            targets.append(ids[id(child)])
+        starts.append(len(labels))
+        finals.append(1 if node.final else 0)
+
+    return b"".join(
+        (
+            _HEADER.pack(_MAGIC, len(order), len(labels), n_keys),
+            struct.pack(f"<{len(starts)}I", *starts),
+            struct.pack(f"<{len(targets)}I", *targets),
+            bytes(finals),
+            bytes(labels),
+        )
+    )
+
+
+class ParadigmIndex:
+    """Read-only, memory-mapped paradigm automaton."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, n_states, n_edges, n_keys = _HEADER.unpack_from(self._mm, 0)
+        if magic != _MAGIC:
+            raise ValueError(f"{path} is not a paradigm automaton")
+        self.n_states, self.n_edges, self.n_keys = n_states, n_edges, n_keys
+        off = _HEADER.size
+        view = memoryview(self._mm)
+        self._starts = view[off:off + 4 * (n_states + 1)].cast("I")
+        off += 4 * (n_states + 1)
+        self._targets = view[off:off + 4 * n_edges].cast("I")
+        off += 4 * n_edges
+        self._finals = view[off:off + n_states]
+        off += n_states
+        self._labels_off = off
+
+    def __len__(self) -> int:
+        return self.n_keys
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._mm)
+
+    def _step(self, state: int, label: int) -> int:
+        lo, hi = self._starts[state], self._starts[state + 1]
+        pos = self._mm.find(bytes((label,)), self._labels_off + lo, self._labels_off + hi)
+        return -1 if pos < 0 else self._targets[pos - self._labels_off]
+
+    def _walk(self, key: bytes) -> int:
+        state = 0
+        for label in key:
+            state = self._step(state, label)
+            if state < 0:
+                return -1
+        return state
+
+    def _suffixes(self, state: int, prefix: bytes = b"") -> Iterator[bytes]:
+        if self._finals[state]:
+            yield prefix
+        for e in range(self._starts[state], self._starts[state + 1]):
+            label = self._mm[self._labels_off + e]
+            yield from self._suffixes(self._targets[e], prefix + bytes((label,)))
+
+    def tags(self, root: str, form: str) -> list[str]:
+        """Grammatical tags of form (SLP1) under root (SLP1); empty if not generated."""
+        state = self._walk(f"{root}{SEP}{form}{SEP}".encode("ascii", "replace"))
+        if state < 0:
+            return []
+        return [s.decode("ascii") for s in self._suffixes(state)]
+
+    def has_form(self, root: str, form: str) -> bool:
+        """O(len) check that form is in root's generated paradigm."""
+        return self._walk(f"{root}{SEP}{form}{SEP}".encode("ascii", "replace")) >= 0
+
+    def close(self) -> None:
+        for view in (self._starts, self._targets, self._finals):
+            view.release()
+        self._mm.close()
+
+
+def build(path: Path = BUILD_PATH, roots: list[Root] | None = None) -> dict:
+    """Generate, compile and atomically write the automaton. Returns build stats."""
+    roots = load_roots() if roots is None else roots
+    keys = [k.encode("ascii") for k in paradigm_keys(roots, load_endings())]
+    blob = _serialize(_build_dafsa(keys), len(keys))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Unique temp name: several workers may rebuild a stale file at once
+    with tempfile.NamedTemporaryFile(dir=path.parent, prefix=path.name, suffix=".tmp", delete=False) as tmp:
+        tmp.write(blob)
+    os.replace(tmp.name, path)
+    return {
+        "roots": len(roots),
+        "forms": len(keys),
+        "bytes": len(blob),
+        "key_bytes": sum(len(k) for k in keys),
+    }
+
+
+def _sources() -> list[Path]:
+    return [p for p in (ENDINGS_CSV, SANDHI_CSV, DHATUS_JSON, DHATUPATHA, Path(__file__)) if p.exists()]
+
+
+def _is_stale(path: Path) -> bool:
+    if not path.exists():
+        return True
+    built = path.stat().st_mtime
+    return any(p.stat().st_mtime > built for p in _sources())
+
+
+_index: ParadigmIndex | None = None
+_index_lock = threading.Lock()
+
+
+def get_paradigm_index(path: Path = BUILD_PATH) -> ParadigmIndex:
+    """Process-wide index, rebuilt first if missing or older than its sources."""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                if _is_stale(path):
+                    build(path)
+                _index = ParadigmIndex(path)
+    return _index
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build the verb paradigm automaton.")
+    parser.add_argument("--out", type=Path, default=BUILD_PATH)
+    args = parser.parse_args()
+    stats = build(args.out)
+    print(json.dumps({**stats, "path": str(args.out)}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
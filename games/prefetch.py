@@ -0,0 +1,174 @@
+"""
+Per-user prefetched challenge queues — a game turn becomes a queue pop.
+
+Each (user, game) queue is refilled in the background with
+engine.generate_many() whenever it drops below a low watermark, so ranking and
+corpus retrieval run off the request path. Only a cold queue generates inline.
+
+A queue is stamped with the profile's targeting key (difficulty bucket, weak
+topics, current chapter). When a pop sees a different key the queued
+challenges were aimed at a learner who no longer exists: the queue is dropped
+and refilled for the new targeting. Entries also expire after max_age_seconds
+so FSRS due cards are not served stale. Refills generate from a snapshot of
+the profile, never the live object the request thread mutates.
+Per-process, like the session store.
+"""
+
+from __future__ import annotations
+
+import copy
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable
+
+from .engine.core import Challenge, CoreEngine
+from .user_profile import UserProfile
+
+logger = logging.getLogger(__name__)
+
+# Target difficulty is bucketed to this width for the targeting key
+DIFFICULTY_STEP = 0.1
+
+
+def targeting_key(profile: UserProfile) -> tuple:
+    """What generate() aims at; a change invalidates that user's queued challenges."""
+    return (
+        round(profile.target_difficulty() / DIFFICULTY_STEP),
+        frozenset(profile.weak_topics()),
+        profile.current_chapter(),
+    )
+
+
+def snapshot(profile: UserProfile) -> UserProfile:
+    """Copy of profile safe to read on another thread while the original is updated."""
+    snap = copy.copy(profile)
+    snap.chunk_states = dict(profile.chunk_states)
+    snap.topic_mastery = dict(profile.topic_mastery)
+    snap.chapter_progress = dict(profile.chapter_progress)
+    snap.seen_drill_ids = set(profile.seen_drill_ids)
+    snap.weakness_centroid = list(profile.weakness_centroid)
+    snap.strength_centroid = list(profile.strength_centroid)
+    return snap
+
+
+@dataclass
+class _Queue:
+    key: tuple
+    items: deque = field(default_factory=deque)  # (queued_at, Challenge)
+    refilling: bool = False
+
+
+class ChallengePrefetcher:
+    """Thread-safe LRU of per-user challenge queues with background refills."""
+
+    def __init__(
+        self,
+        engine_for: Callable[[str], CoreEngine],
+        batch_size: int = 8,
+        low_watermark: int = 3,
+        max_age_seconds: float = 600.0,
+        max_queues: int = 10_000,
+        workers: int = 2,
+    ) -> None:
+        self.engine_for = engine_for
+        self.batch_size = batch_size
+        self.low_watermark = low_watermark
+        self.max_age_seconds = max_age_seconds
+        self.max_queues = max_queues
+        self._queues: OrderedDict[tuple[str, str], _Queue] = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="prefetch")
+        self._inflight: set[Future] = set()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._queues)
+
+    def queued(self, user_id: str, game_type: str) -> int:
+        q = self._queues.get((user_id, game_type))
+        return len(q.items) if q else 0
+
+    def pop(self, game_type: str, profile: UserProfile) -> Challenge:
+        """Next challenge for profile; generated inline only when nothing usable is queued."""
+        key = (profile.user_id, game_type)
+        target = targeting_key(profile)
+        now = time.monotonic()
+        challenge = None
+        with self._lock:
+            q = self._queues.get(key)
+            if q is None or q.key != target:
+                q = self._queues[key] = _Queue(target)  # Stale targeting: drop queued challenges
+            self._queues.move_to_end(key)
+            while len(self._queues) > self.max_queues:
+                self._queues.popitem(last=False)
+            while q.items and now - q.items[0][0] > self.max_age_seconds:
+                q.items.popleft()
+            if q.items:
+                challenge = q.items.popleft()[1]
+                self.hits += 1
+            else:
+                self.misses += 1
+            refill = len(q.items) < self.low_watermark and not q.refilling
+            if refill:
+                q.refilling = True
+        if refill:
+            self._schedule(key, q, snapshot(profile))
+        if challenge is None:
+            challenge = self.engine_for(game_type).generate(profile)
+        return challenge
+
+    def prefill(self, game_type: str, profile: UserProfile) -> None:
+        """Start filling a user's queue ahead of their first turn."""
+        key = (profile.user_id, game_type)
+        with self._lock:
+            q = self._queues.get(key)
+            if q is None or q.key != targeting_key(profile):
+                q = self._queues[key] = _Queue(targeting_key(profile))
+            if q.refilling or len(q.items) >= self.low_watermark:
+                return
+            q.refilling = True
+        self._schedule(key, q, snapshot(profile))
+
+    def invalidate(self, user_id: str, game_type: str | None = None) -> None:
+        """Drop a user's queued challenges (one game, or all)."""
+        with self._lock:
+            for key in [k for k in self._queues if k[0] == user_id and game_type in (None, k[1])]:
+                del self._queues[key]
+
+    def _schedule(self, key: tuple[str, str], q: _Queue, profile: UserProfile) -> None:
+        future = self._executor.submit(self._refill, key, q, profile)
+        with self._lock:
+            self._inflight.add(future)
+        future.add_done_callback(self._done)
+
+    def _done(self, future: Future) -> None:
+        with self._lock:
+            self._inflight.discard(future)
+
+    def _refill(self, key: tuple[str, str], q: _Queue, profile: UserProfile) -> None:
+        try:
+            challenges = self.engine_for(key[1]).generate_many(profile, self.batch_size)
+        except Exception:
+            logger.exception("Prefetch for %s/%s failed", *key)
+            challenges = []
+        now = time.monotonic()
+        with self._lock:
+            q.refilling = False
+            if self._queues.get(key) is q:  # Not invalidated or evicted meanwhile
+                q.items.extend((now, c) for c in challenges)
+
+    def wait(self, timeout: float | None = None) -> None:
+        """Block until in-flight refills finish (tests, shutdown)."""
+        with self._lock:
+            pending = list(self._inflight)
+        wait(pending, timeout=timeout)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        with self._lock:
+            self._queues.clear()
@@ -0,0 +1,168 @@
+"""
+Write-behind profile cache — rapid-fire game turns hit memory, not SQLite.
+
+Profiles are loaded once and kept in-process. Each turn marks its profile
+dirty; dirty profiles are flushed together in one transaction when:
+  - flush_interval seconds have passed (background thread),
+  - batch_size profiles are dirty, or
+  - the process shuts down (FastAPI shutdown hook + atexit).
+
+Durability (PROFILE_CACHE_DURABILITY):
+  - "write_through": save on every turn (old behaviour, no loss window)
+  - "batched": default; at most flush_interval seconds of turns lost on a hard kill
+
+A flush is all-or-nothing: dirty flags clear only after the commit, so a failed
+flush is retried on the next one. The cache is per-process — run one worker per
+user shard, or use write_through, when several workers share sabdakrida.db.
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Iterator
+
+from .user_profile import UserProfile, load_profile, save_profiles
+
+logger = logging.getLogger(__name__)
+
+DURABILITY_MODES = ("write_through", "batched")
+
+
+class ProfileCache:
+    """In-process profile cache with dirty tracking and batched, atomic flushes."""
+
+    def __init__(
+        self,
+        flush_interval: float = 2.0,
+        batch_size: int = 64,
+        durability: str = "batched",
+        max_profiles: int = 10_000,
+    ) -> None:
+        if durability not in DURABILITY_MODES:
+            raise ValueError(f"durability must be one of {DURABILITY_MODES}, got {durability!r}")
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.durability = durability
+        self.max_profiles = max_profiles
+        self._profiles: OrderedDict[str, UserProfile] = OrderedDict()
+        self._dirty: set[str] = set()
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def get(self, user_id: str) -> UserProfile:
+        """Cached profile for user_id, loading it on first access."""
+        with self._lock:
+            profile = self._profiles.get(user_id)
+            if profile is None:
+                profile = load_profile(user_id)
+                self._profiles[user_id] = profile
+                self._evict()
+            else:
+                self._profiles.move_to_end(user_id)
+            return profile
+
+    @contextmanager
+    def checkout(self, user_id: str) -> Iterator[UserProfile]:
+        """
+        Mutate a profile under the cache lock; it is marked dirty on exit.
+        Flushes never observe a half-applied update.
+        """
+        with self._lock:
+            profile = self.get(user_id)
+            yield profile
+            self.mark_dirty(profile)
+
+    def mark_dirty(self, profile: UserProfile) -> None:
+        with self._lock:
+            self._profiles[profile.user_id] = profile
+            self._dirty.add(profile.user_id)
+            if self.durability == "write_through" or len(self._dirty) >= self.batch_size:
+                self.flush()
+
+    def flush(self) -> int:
+        """Write every dirty profile in one transaction. Returns how many were written."""
+        with self._lock:
+            if not self._dirty:
+                return 0
+            profiles = [self._profiles[uid] for uid in self._dirty if uid in self._profiles]
+            try:
+                save_profiles(profiles)
+            except Exception:
+                logger.exception("Profile flush failed; %d profiles stay dirty", len(profiles))
+                return 0
+            self._dirty.clear()
+            return len(profiles)
+
+    def _evict(self) -> None:
+        """Drop least-recently-used clean profiles beyond max_profiles."""
+        if len(self._profiles) <= self.max_profiles:
+            return
+        for uid in list(self._profiles):
+            if len(self._profiles) <= self.max_profiles:
+                break
+            if uid not in self._dirty:
+                del self._profiles[uid]
+
+    def invalidate(self, user_id: str) -> None:
+        """Forget a cached profile (after flushing it if dirty)."""
+        with self._lock:
+            if user_id in self._dirty:
+                self.flush()
+            self._profiles.pop(user_id, None)
+
+    def start(self) -> None:
+        """Start the interval flusher thread (no-op for write_through)."""
+        if self.durability == "write_through" or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="profile-cache-flusher", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+    def stop(self) -> None:
+        """Stop the flusher and write anything still dirty."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.flush_interval + 5)
+            self._thread = None
+        self.flush()
+
+
+_cache: ProfileCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_profile_cache() -> ProfileCache:
+    """Process-wide cache, configured from PROFILE_CACHE_* env vars and started on first use."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                cache = ProfileCache(
+                    flush_interval=float(os.environ.get("PROFILE_CACHE_FLUSH_SECONDS", "2.0")),
+                    batch_size=int(os.environ.get("PROFILE_CACHE_BATCH", "64")),
+                    durability=os.environ.get("PROFILE_CACHE_DURABILITY", "batched"),
+                )
+                cache.start()
+                atexit.register(cache.stop)
+                _cache = cache
+    return _cache
+
+
+def shutdown_profile_cache() -> None:
+    """Flush and stop the process-wide cache, if one was created."""
+    global _cache
+    if _cache is not None:
+        _cache.stop()
+        _cache = None
@@ -64,6 +64,22 @@ class RAGClient:
             pass
         return None
 
+    def get_embeddings(self, chunk_ids: list[str]) -> dict[str, list[float]]:
+        """Stored embeddings for many chunks in one collection lookup."""
+        col = self._get_collection()
+        if not col or not chunk_ids:
+            return {}
+        try:
+            results = col.get(ids=list(dict.fromkeys(chunk_ids)), include=["embeddings"])
+            if results and results["embeddings"] is not None:
+                return {
+                    cid: list(emb)
+                    for cid, emb in zip(results["ids"], results["embeddings"])
+                }
+        except Exception:
+            pass
+        return {}
+
     def query_by_embedding(
         self,
         embedding: list[float],
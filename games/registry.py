@@ -0,0 +1,109 @@
+"""
+Engine registry — every game engine built once per process, at startup.
+
+Engines share one corpus client and one TTS provider; their indexes (Dhātu
+Dash ranker, Sandhi Forge rule table, Kāraka Web analyzer) are built by the
+constructors and warm() before the first request, so request handlers only
+look engines up:
+
+    engine = get_registry().get("sandhi_forge")
+
+New games register a factory with register_engine(game_type, factory); the
+factory takes (corpus, tts) like create_dhatu_dash.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Callable
+
+from .dhatu_dash import create_dhatu_dash
+from .engine.core import CoreEngine, CorpusProvider, TTSProvider
+from .karaka_web import create_karaka_web
+from .sandhi_forge import create_sandhi_forge
+
+EngineFactory = Callable[..., CoreEngine]
+
+ENGINE_FACTORIES: dict[str, EngineFactory] = {
+    "dhatu_dash": create_dhatu_dash,
+    "sandhi_forge": create_sandhi_forge,
+    "karaka_web": create_karaka_web,
+}
+
+
+def register_engine(game_type: str, factory: EngineFactory) -> None:
+    """Add a game to registries built from now on."""
+    ENGINE_FACTORIES[game_type] = factory
+
+
+class EngineRegistry:
+    """Built engines by game type, sharing one corpus and TTS provider."""
+
+    def __init__(
+        self,
+        corpus: CorpusProvider | None = None,
+        tts: TTSProvider | None = None,
+        factories: dict[str, EngineFactory] | None = None,
+    ) -> None:
+        self.corpus = corpus
+        self.tts = tts
+        self._factories = dict(factories if factories is not None else ENGINE_FACTORIES)
+        self._engines: dict[str, CoreEngine] = {}
+
+    def build(self) -> "EngineRegistry":
+        """Construct and warm every engine. Safe to call again; built engines are kept."""
+        for game_type, factory in self._factories.items():
+            if game_type not in self._engines:
+                engine = factory(corpus=self.corpus, tts=self.tts)
+                engine.warm()
+                self._engines[game_type] = engine
+        return self
+
+    def get(self, game_type: str) -> CoreEngine:
+        """The engine for game_type; KeyError if no such game is registered."""
+        if game_type not in self._engines:
+            if game_type not in self._factories:
+                raise KeyError(f"Unknown game type: {game_type}")
+            self.build()
+        return self._engines[game_type]
+
+    def game_types(self) -> list[str]:
+        return list(self._factories)
+
+
+_registry: EngineRegistry | None = None
+_registry_lock = threading.Lock()
+
+
+def _default_corpus() -> CorpusProvider | None:
+    """RAG corpus when a Chutes embedding key is configured, else None."""
+    from .rag_client import RAGClient, get_embed_fn_from_chutes
+
+    embed_fn = get_embed_fn_from_chutes()
+    return RAGClient(embed_fn=embed_fn) if embed_fn else None
+
+
+def init_registry(
+    corpus: CorpusProvider | None = None,
+    tts: TTSProvider | None = None,
+) -> EngineRegistry:
+    """Build the process-wide registry (call from app startup). corpus defaults to the RAG client."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = EngineRegistry(corpus if corpus is not None else _default_corpus(), tts).build()
+    return _registry
+
+
+def get_registry() -> EngineRegistry:
+    """Process-wide registry; built on first use if startup did not build it."""
+    if _registry is None:
+        return init_registry()
+    return _registry
+
+
+def reset_registry() -> None:
+    """Drop the process-wide registry (tests, config reload)."""
+    global _registry
+    with _registry_lock:
+        _registry = None
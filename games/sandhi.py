@@ -0,0 +1,409 @@
+"""
+Sandhi joiner and splitter, compiled from data/sandhi-rules.csv.
+
+join(left, right) applies the longest matching word-boundary rule. split(text)
+undoes sandhi: every rule result is compiled into a reverse-lookup trie keyed
+by its surface spellings ("o 'tra", "o'tra", "otra" for as + a), and a DP over
+(position, restored start of the next word) picks the segmentation whose words
+are all in the lexicon, with the fewest words. Each DP state is expanded once
+by walking the lexicon automaton forward from that position, so a 200-character
+śloka line takes a few milliseconds.
+
+The lexicon is a minimal DAFSA (games.paradigms) over SLP1 words from data/:
+irregular nouns, indeclinables, words.json stems and their declensions, dhātu
+forms and generated verb paradigms. Monier-Williams headwords (or any word
+list, one per line, any scheme) are added from SANDHI_LEXICON (os.pathsep-
+separated paths) or data/mw-headwords.txt when present. Pass a Lexicon to
+Splitter to use another vocabulary.
+
+Benchmark: python scripts/benchmarks/bench_sandhi_split.py
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable
+
+from indic_transliteration import sanscript
+
+from .normalize import canonicalize
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+RULES_CSV = DATA_DIR / "sandhi-rules.csv"
+MW_HEADWORDS = DATA_DIR / "mw-headwords.txt"
+
+SLP1_VOWELS = "aAiIuUfFxXeEoO"
+
+# Word-final m is written as anusvāra at the end of a line as well as before consonants
+PAUSAL_EXTRA = (("m", "M"),)
+
+_NON_SLP1 = re.compile(r"[^A-Za-z' ]+")
+
+
+@dataclass(frozen=True)
+class SandhiRule:
+    first: str  # SLP1, end of the first word
+    second: str  # SLP1, start of the second word ("" for pausal rules)
+    result: str  # SLP1; a space marks the word boundary that survives
+    level: int  # 1 a/ā + vowel, 2 other vowels, 3 visarga, 4 consonants
+
+
+def rule_level(first: str, second: str) -> int:
+    if second and first[-1] in SLP1_VOWELS and second[0] in SLP1_VOWELS:
+        return 1 if first[-1] in "aA" else 2
+    if first[-1] in "sr":
+        return 3
+    return 4
+
+
+@lru_cache(maxsize=65536)
+def to_slp1(text: str) -> str:
+    """Any supported scheme → SLP1, letters, avagraha and single spaces only."""
+    iast = canonicalize(text).replace("’", "'").replace("ṁ", "ṃ")
+    slp1 = sanscript.transliterate(iast, sanscript.IAST, sanscript.SLP1)
+    return " ".join(_NON_SLP1.sub(" ", slp1).split())
+
+
+@lru_cache(maxsize=65536)
+def to_iast(slp1: str) -> str:
+    # SLP1 ~ (candrabindu) has no IAST letter in sanscript's table: written m̐ (tA~l → tām̐l)
+    return sanscript.transliterate(slp1, sanscript.SLP1, sanscript.IAST).replace("~", "m\u0310")
+
+
+def pausal(form: str) -> str:
+    """A word as said alone (SLP1): final s and r become visarga — devas → devaH."""
+    return form[:-1] + "H" if form[-1:] in ("s", "r") else form
+
+
+def _surfaces(result: str) -> set[str]:
+    """How a rule result may be written: with or without the space and the avagraha."""
+    no_avagraha = result.replace("'", "").strip()
+    return {s for s in (result, result.replace(" ", ""), no_avagraha, no_avagraha.replace(" ", "")) if s}
+
+
+class SandhiRules:
+    """Word-boundary rules (common + external) with a forward table and a reverse trie."""
+
+    def __init__(self, path: Path = RULES_CSV) -> None:
+        rows: list[dict] = []
+        if path.exists():
+            with path.open(encoding="utf-8", newline="") as f:
+                rows = [r for r in csv.DictReader(f) if r["type"] in ("common", "external")]
+        self.rules: dict[tuple[str, str], SandhiRule] = {}
+        self.pausal: list[SandhiRule] = []
+        # External rules override common ones for the same pair
+        for r in sorted(rows, key=lambda r: r["type"] == "external"):
+            rule = SandhiRule(r["first"], r["second"], r["result"], rule_level(r["first"], r["second"]))
+            if rule.second:
+                self.rules[(rule.first, rule.second)] = rule
+            else:
+                self.pausal.append(rule)
+        self.pausal += [SandhiRule(first, "", result, 4) for first, result in PAUSAL_EXTRA]
+        self.max_first = max((len(f) for f, _ in self.rules), default=1)
+        self.max_second = max((len(s) for _, s in self.rules), default=1)
+
+        # Reverse trie: surface spelling → rules that produce it
+        self.reverse: dict = {}
+        for rule in self.rules.values():
+            for surface in _surfaces(rule.result):
+                node = self.reverse
+                for ch in surface:
+                    node = node.setdefault(ch, {})
+                node.setdefault("", []).append(rule)
+        self.max_surface = max((len(s) for r in self.rules.values() for s in _surfaces(r.result)), default=1)
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def lookup(self, left: str, right: str) -> SandhiRule | None:
+        """Longest matching rule at the junction of left + right (SLP1)."""
+        for n1 in range(min(self.max_first, len(left)), 0, -1):
+            for n2 in range(min(self.max_second, len(right)), 0, -1):
+                rule = self.rules.get((left[-n1:], right[:n2]))
+                if rule is not None:
+                    return rule
+        return None
+
+    def join(self, left: str, right: str) -> tuple[str, SandhiRule | None]:
+        """Sandhied left + right (SLP1) and the rule applied; unchanged pair if none applies."""
+        rule = self.lookup(left, right)
+        if rule is None:
+            return f"{left} {right}", None
+        return left[: -len(rule.first)] + rule.result + right[len(rule.second):], rule
+
+    def matches_at(self, text: str, pos: int) -> list[tuple[int, SandhiRule]]:
+        """(surface length, rule) for every rule result spelled at text[pos:]."""
+        out: list[tuple[int, SandhiRule]] = []
+        node = self.reverse
+        for k in range(pos, min(len(text), pos + self.max_surface)):
+            node = node.get(text[k])
+            if node is None:
+                break
+            for rule in node.get("", ()):
+                out.append((k + 1 - pos, rule))
+        return out
+
+
+# ── Lexicon ───────────────────────────────────────────────────────────
+
+
+class Lexicon:
+    """SLP1 word set as a minimal automaton; walked one letter at a time by the splitter."""
+
+    def __init__(self, words: Iterable[str]) -> None:
+        from .paradigms import _build_dafsa
+
+        keys = sorted({w.encode("ascii") for w in words if w and w.isascii() and " " not in w})
+        self.root = _build_dafsa(keys)
+        self.size = len(keys)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __contains__(self, word: str) -> bool:
+        node = self.walk(self.root, word)
+        return node is not None and node.final
+
+    @staticmethod
+    def walk(node, letters: str):
+        """Node reached from node by letters, or None."""
+        for ch in letters:
+            node = node.edges.get(ord(ch))
+            if node is None:
+                return None
+        return node
+
+
+def _declined(stems: Iterable[str]) -> set[str]:
+    """Stems inflected with nominal-endings-inflected.csv wherever the stem type fits."""
+    path = DATA_DIR / "nominal-endings-inflected.csv"
+    if not path.exists():
+        return set()
+    with path.open(encoding="utf-8", newline="") as f:
+        endings = [(r["stem_type"], r["ending"]) for r in csv.DictReader(f) if r["stem_type"] != "_"]
+    return {
+        stem[: -len(stem_type)] + ending
+        for stem in stems
+        for stem_type, ending in endings
+        if stem.endswith(stem_type)
+    }
+
+
+def lexicon_words() -> set[str]:
+    """SLP1 words from the bundled data files."""
+    words: set[str] = set()
+    for name, column in (("nouns-irregular-inflected.csv", "form"), ("indeclinables.csv", "name")):
+        path = DATA_DIR / name
+        if path.exists():
+            with path.open(encoding="utf-8", newline="") as f:
+                words |= {r[column] for r in csv.DictReader(f) if r[column]}
+    stems: set[str] = set()
+    path = DATA_DIR / "words.json"
+    if path.exists():
+        stems = {to_slp1(w["iast"]) for w in json.loads(path.read_text(encoding="utf-8")) if w.get("iast")}
+    words |= stems | _declined(stems)
+    path = DATA_DIR / "dhatus.json"
+    if path.exists():
+        data = json.loads(path.read_text(encoding="utf-8"))
+        for d in data if isinstance(data, list) else data.get("data", []):
+            forms = [d.get("iast"), *d.get("derivesTo", []), *(f.get("form") for f in d.get("derivedForms", []))]
+            words |= {to_slp1(f) for f in forms if f}
+    try:
+        from .paradigms import generate_forms, load_endings, load_roots
+
+        endings = load_endings()
+        words |= {form for root in load_roots() for form, _ in generate_forms(root, endings)}
+    except (ImportError, OSError, ValueError):
+        pass
+    return {w for w in words if w and w.isascii() and w.isalpha()}
+
+
+def inflected_words() -> set[str]:
+    """
+    Whole inflected SLP1 words from the bundled data, for drills that show words as they are
+    used: declined words.json nouns and glossed irregular nouns, generated verb forms and
+    indeclinables. Unlike lexicon_words(), no bare stems or roots.
+    """
+    from .inflection import IRREGULAR_GLOSSES, get_analyzer
+
+    analyzer = get_analyzer()
+    nouns: set[tuple[str, str]] = set()
+    path = DATA_DIR / "words.json"
+    if path.exists():
+        entries = json.loads(path.read_text(encoding="utf-8"))
+        nouns = {(to_slp1(w["iast"]), w["gender"]) for w in entries if w.get("iast") and w.get("gender")}
+    nouns |= {(stem, g) for stem in IRREGULAR_GLOSSES for *_, g in analyzer.irregular_stems.get(stem, ())}
+    words = {form for stem, gender in nouns for form, _, _ in analyzer.inflect(stem, gender)}
+    path = DATA_DIR / "indeclinables.csv"
+    if path.exists():
+        with path.open(encoding="utf-8", newline="") as f:
+            words |= {r["name"] for r in csv.DictReader(f) if r["name"]}
+    try:
+        from .paradigms import generate_forms, load_endings, load_roots
+
+        endings = load_endings()
+        words |= {form for root in load_roots() for form, _ in generate_forms(root, endings)}
+    except (ImportError, OSError, ValueError):
+        pass
+    return {w for w in words if w and w.isascii() and w.isalpha()}
+
+
+def _headword_files() -> list[Path]:
+    configured = os.environ.get("SANDHI_LEXICON", "")
+    paths = [Path(p) for p in configured.split(os.pathsep) if p] or [MW_HEADWORDS]
+    return [p for p in paths if p.exists()]
+
+
+def load_headwords(path: Path) -> set[str]:
+    """One word per line, any scheme; '#' comments and blank lines ignored."""
+    with path.open(encoding="utf-8") as f:
+        return {to_slp1(line.split("#", 1)[0]) for line in f if line.split("#", 1)[0].strip()}
+
+
+# ── Splitter ──────────────────────────────────────────────────────────
+
+# An unknown word costs as much as this many known ones
+UNKNOWN_COST = 4
+
+
+@dataclass
+class Split:
+    """A segmentation: words (SLP1) and the rule undone after each word (None = plain boundary)."""
+
+    words: list[str] = field(default_factory=list)
+    rules: list[SandhiRule | None] = field(default_factory=list)
+    unknown: list[int] = field(default_factory=list)  # Indexes of words not in the lexicon
+
+    @property
+    def complete(self) -> bool:
+        return not self.unknown
+
+    def iast(self) -> list[str]:
+        return [to_iast(w) for w in self.words]
+
+
+class Splitter:
+    """Sandhi splitter over compiled rules and a lexicon."""
+
+    def __init__(self, rules: SandhiRules, lexicon: Lexicon) -> None:
+        self.rules = rules
+        self.lexicon = lexicon
+
+    def split(self, text: str) -> Split:
+        """Best segmentation of text in any scheme."""
+        return self.split_slp1(to_slp1(text))
+
+    def split_slp1(self, s: str) -> Split:
+        n = len(s)
+        if not n:
+            return Split()
+        rule_matches = [self.rules.matches_at(s, j) for j in range(n)] + [[]]
+        pausal = [
+            (rule, j + len(rule.result))
+            for j in range(n)
+            for rule in self.rules.pausal
+            if s.startswith(rule.result, j) and (j + len(rule.result) == n or s[j + len(rule.result)] == " ")
+        ]
+        pausal_at: dict[int, list[tuple[SandhiRule, int]]] = {}
+        for rule, end in pausal:
+            pausal_at.setdefault(end - len(rule.result), []).append((rule, end))
+
+        # best[i][prefix] = (cost, back): cheapest way to reach position i with the next
+        # word's restored start = prefix; back = (from i, from prefix, word, rule, known)
+        best: list[dict[str, tuple]] = [dict() for _ in range(n + 1)]
+        best[0][""] = (0, None)
+
+        def relax(j: int, prefix: str, cost: int, back: tuple) -> None:
+            if j < n and s[j] == " " and not prefix:
+                j += 1  # Boundaries already at a space skip it
+            current = best[j].get(prefix)
+            if current is None or cost < current[0]:
+                best[j][prefix] = (cost, back)
+
+        root = self.lexicon.root
+        for i in range(n):
+            if s[i] == " ":
+                for prefix, (cost, back) in list(best[i].items()):
+                    relax(i + 1, prefix, cost, back)
+                continue
+            for prefix, (cost, _) in list(best[i].items()):
+                known = cost + 1
+                node = Lexicon.walk(root, prefix)
+                j = i
+                while node is not None:
+                    for length, rule in rule_matches[j]:
+                        end = Lexicon.walk(node, rule.first)
+                        if end is not None and end.final:
+                            word = prefix + s[i:j] + rule.first
+                            relax(j + length, rule.second, known, (i, prefix, word, rule, True))
+                    if j > i:
+                        if node.final:
+                            relax(j, "", known, (i, prefix, prefix + s[i:j], None, True))
+                        for rule, end_pos in pausal_at.get(j, ()):
+                            end_node = Lexicon.walk(node, rule.first)
+                            if end_node is not None and end_node.final:
+                                word = prefix + s[i:j] + rule.first
+                                relax(end_pos, "", known, (i, prefix, word, rule, True))
+                    if j == n or s[j] == " ":
+                        break
+                    node = node.edges.get(ord(s[j]))
+                    j += 1
+                # Fallback: the rest of the token as one unknown word. Not after an undone
+                # rule, whose restored start only stands if a known word follows it.
+                if not prefix:
+                    k = s.find(" ", i)
+                    k = n if k < 0 else k
+                    relax(k, "", cost + UNKNOWN_COST, (i, prefix, s[i:k], None, False))
+
+        out = Split()
+        state = best[n].get("")
+        pos, prefix = n, ""
+        while state is not None and state[1] is not None:
+            i, prev_prefix, word, rule, known = state[1]
+            out.words.append(word)
+            out.rules.append(rule)
+            if not known:
+                out.unknown.append(len(out.words) - 1)
+            pos, prefix = i, prev_prefix
+            state = best[pos].get(prefix)
+        out.words.reverse()
+        out.rules.reverse()
+        out.unknown = sorted(len(out.words) - 1 - k for k in out.unknown)
+        return out
+
+
+# ── Process-wide instances ────────────────────────────────────────────
+
+
+@lru_cache(maxsize=1)
+def get_rules() -> SandhiRules:
+    return SandhiRules()
+
+
+@lru_cache(maxsize=1)
+def default_lexicon() -> Lexicon:
+    words = lexicon_words()
+    for path in _headword_files():
+        words |= load_headwords(path)
+    return Lexicon(words)
+
+
+@lru_cache(maxsize=1)
+def get_splitter() -> Splitter:
+    return Splitter(get_rules(), default_lexicon())
+
+
+def join(left: str, right: str) -> str:
+    """Sandhied junction of two words in any scheme, as IAST."""
+    return to_iast(get_rules().join(to_slp1(left), to_slp1(right))[0])
+
+
+def split(text: str) -> list[str]:
+    """Words (IAST) of a sandhied text in any scheme; unknown stretches are kept whole."""
+    return get_splitter().split(text).iast()
@@ -0,0 +1,190 @@
+"""
+Sandhi Forge — two words meet at a junction; the player forges the sandhied result.
+
+Level 1: a/ā before vowels (a + a = ā, a + i = e)
+Level 2: other vowel sandhi (i/u/ṛ → semivowels, e/ai/o/au before vowels)
+Level 3: visarga sandhi (-as, -is, -s, -r before anything)
+Level 4: consonant sandhi
+
+Junctions use the compiled rule table in games.sandhi (data/sandhi-rules.csv);
+names and Pāṇini references for feedback come from data/sandhi-rules.json.
+Words are whole inflected forms (games.sandhi.inflected_words: declined nouns,
+verb forms, indeclinables — no bare stems or roots), bucketed once by ending
+and by initial into per-level candidate lists, so generate/evaluate do
+dictionary lookups only. A vowel junction is written as one word (iti + api →
+ityapi); a space is kept only where a hiatus remains (vana iha). The word ends
+away from the junction are shown in pausa (pitroḥ + yātuḥ → pitror yātuḥ).
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import re
+import uuid
+from pathlib import Path
+
+from .engine.core import CoreEngine, Challenge, EvalResult
+from .normalize import canonicalize
+from .sandhi import SLP1_VOWELS, SandhiRule, get_rules, inflected_words, pausal, to_iast
+from .user_profile import UserProfile
+
+_DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+
+MAX_LEVEL = 4
+
+
+def _load_rule_docs() -> dict[str, dict]:
+    path = _DATA_DIR / "sandhi-rules.json"
+    if not path.exists():
+        return {}
+    return {r["id"]: r for r in json.loads(path.read_text(encoding="utf-8"))}
+
+
+def _doc_id(rule: SandhiRule) -> str | None:
+    """sandhi-rules.json entry that explains this junction, if any."""
+    f, s = rule.first[-1], rule.second[0]
+    if rule.level == 3:
+        return "visarga-sandhi"
+    if rule.level > 2:
+        return None
+    if f in "aA":
+        if s in "aA":
+            return "vowel-sandhi-aa" if f == "A" else "vowel-sandhi-a"
+        return "vrddhi-sandhi" if s in "eEoO" else "guna-sandhi"
+    if f in "iI":
+        return "semivowel-sandhi-i"
+    if f in "uU":
+        return "semivowel-sandhi-u"
+    return None
+
+
+# Any other letter under a candrabindu (l̐): read as anusvāra before the letter
+_CANDRABINDU_RE = re.compile("(.)\u0310")
+
+
+def _compare_key(text: str) -> str:
+    """Spaces and avagraha are optional in answers; candrabindu and anusvāra count as the same."""
+    text = canonicalize(text).replace("ṁ", "ṃ").replace("m\u0310", "ṃ")
+    text = _CANDRABINDU_RE.sub("ṃ\\1", text)
+    return text.replace(" ", "").replace("'", "").replace("’", "")
+
+
+class SandhiTable:
+    """Rule docs + vocabulary buckets. Built once per process; read-only afterwards."""
+
+    def __init__(self) -> None:
+        self.rules = get_rules()
+        self.docs = _load_rule_docs()
+        by_end: dict[str, list[str]] = {}
+        by_start: dict[str, list[str]] = {}
+        for w in sorted(inflected_words()):
+            for n in range(1, self.rules.max_first + 1):
+                by_end.setdefault(w[-n:], []).append(w)
+            for n in range(1, self.rules.max_second + 1):
+                by_start.setdefault(w[:n], []).append(w)
+        self.by_end, self.by_start = by_end, by_start
+        # Rules with at least one word on each side, per level
+        self.playable: dict[int, list[SandhiRule]] = {lvl: [] for lvl in range(1, MAX_LEVEL + 1)}
+        for rule in self.rules.rules.values():
+            if by_end.get(rule.first) and by_start.get(rule.second):
+                self.playable[rule.level].append(rule)
+
+    def join(self, left: str, right: str) -> tuple[str, SandhiRule | None]:
+        """rules.join, with the table's word-boundary space closed up after a semivowel (ity api → ityapi)."""
+        joined, rule = self.rules.join(left, right)
+        if rule is not None and rule.level <= 2:
+            head, _, tail = rule.result.partition(" ")
+            if tail and head and head[-1] not in SLP1_VOWELS:
+                joined = left[: -len(rule.first)] + head + tail + right[len(rule.second):]
+        return joined, rule
+
+
+class SandhiForgeEngine(CoreEngine):
+    """
+    Sandhi Forge game engine.
+    Challenge: given two words, produce their sandhied junction.
+    """
+
+    game_type = "sandhi_forge"
+    _table: SandhiTable | None = None
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if SandhiForgeEngine._table is None:
+            SandhiForgeEngine._table = SandhiTable()
+
+    def _pick_rule(self, difficulty: float) -> SandhiRule | None:
+        level = min(MAX_LEVEL, 1 + int(difficulty * MAX_LEVEL))
+        for lvl in range(level, 0, -1):
+            if self._table.playable[lvl]:
+                return random.choice(self._table.playable[lvl])
+        return None
+
+    def generate(
+        self,
+        user_profile: UserProfile,
+        difficulty: float | None = None,
+    ) -> Challenge:
+        """Pick a junction for the learner's level and two words that meet at it."""
+        diff = difficulty if difficulty is not None else user_profile.target_difficulty()
+        rule = self._pick_rule(diff)
+        if rule is None:
+            raise ValueError("No sandhi data loaded. Add data/sandhi-rules.csv")
+        left = random.choice(self._table.by_end[rule.first])
+        right = random.choice(self._table.by_start[rule.second])
+        joined, applied = self._table.join(left, right)
+        applied = applied or rule
+        doc_id = _doc_id(applied)
+
+        return Challenge(
+            challenge_id=f"sandhi_{uuid.uuid4().hex[:8]}",
+            game_type=self.game_type,
+            prompt=f"{to_iast(pausal(left))} + {to_iast(pausal(right))} → ?",
+            correct_answer=to_iast(pausal(joined)),
+            source_chunk_ids=[f"sandhi_{doc_id or 'level' + str(applied.level)}"],
+            topic="sandhi",
+            difficulty=diff,
+            meta={
+                "left": to_iast(pausal(left)),
+                "right": to_iast(pausal(right)),
+                "rule": (to_iast(applied.first), to_iast(applied.second), to_iast(applied.result)),
+                "rule_id": doc_id,
+                "level": applied.level,
+            },
+        )
+
+    def evaluate(
+        self,
+        player_input: str,
+        challenge: Challenge,
+    ) -> EvalResult:
+        """Correct if the input matches the forged junction (spacing and avagraha optional)."""
+        meta = challenge.meta or {}
+        expected = str(challenge.correct_answer)
+        first, second, result = meta.get("rule", ("", "", ""))
+        doc = self._table.docs.get(meta.get("rule_id") or "", {})
+        rule_text = f"{first} + {second} → {result.replace(' ', ' | ')}"
+        why = f"{doc['name']} ({doc['paniniReference']}): {rule_text}" if doc else rule_text
+        chunk_id = challenge.source_chunk_ids[0] if challenge.source_chunk_ids else ""
+
+        if _compare_key(player_input) == _compare_key(expected):
+            return EvalResult(
+                correct=True,
+                rule_id=meta.get("rule_id"),
+                explanation=f"Correct. {meta.get('left')} + {meta.get('right')} → {expected}. {why}",
+                feedback="sādhu!",
+                chunk_id=chunk_id,
+            )
+        return EvalResult(
+            correct=False,
+            rule_id=meta.get("rule_id"),
+            explanation=f"{meta.get('left')} + {meta.get('right')} → {expected}. {why}",
+            feedback="punar vadatu. Watch the junction.",
+            chunk_id=chunk_id,
+        )
+
+
+def create_sandhi_forge(corpus=None, tts=None) -> SandhiForgeEngine:
+    """Factory for Sandhi Forge engine."""
+    return SandhiForgeEngine(corpus=corpus, tts=tts)
@@ -0,0 +1,77 @@
+"""
+Server-side game session store — bounded LRU with TTL, keyed by opaque session id.
+
+Clients hold only the session id; valid forms and the tree never leave the
+server, so evaluate payloads stay tiny and cannot be tampered with.
+Per-process: with several workers, route a session's requests to one worker.
+"""
+
+from __future__ import annotations
+
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass
+class _Entry:
+    user_id: str
+    session: Any
+    expires_at: float
+
+
+class SessionStore:
+    """Thread-safe LRU of live sessions. Expired entries are dropped lazily."""
+
+    def __init__(self, max_sessions: int = 10_000, ttl_seconds: float = 1800.0) -> None:
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def create(self, session: Any, user_id: str) -> str:
+        """Store session and return its new id (evicts the least recently used if full)."""
+        session_id = secrets.token_urlsafe(16)
+        with self._lock:
+            self._entries[session_id] = _Entry(user_id, session, time.monotonic() + self.ttl_seconds)
+            while len(self._entries) > self.max_sessions:
+                self._entries.popitem(last=False)
+        return session_id
+
+    def get(self, session_id: str, user_id: str | None = None) -> Any | None:
+        """
+        Session for session_id, or None if unknown, expired, or owned by another user.
+        A hit refreshes both recency and TTL.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is None:
+                return None
+            if entry.expires_at < now:
+                del self._entries[session_id]
+                return None
+            if user_id is not None and entry.user_id != user_id:
+                return None
+            entry.expires_at = now + self.ttl_seconds
+            self._entries.move_to_end(session_id)
+            return entry.session
+
+    def drop(self, session_id: str) -> None:
+        with self._lock:
+            self._entries.pop(session_id, None)
+
+    def purge_expired(self) -> int:
+        """Remove every expired entry. Returns how many were removed."""
+        now = time.monotonic()
+        with self._lock:
+            expired = [sid for sid, e in self._entries.items() if e.expires_at < now]
+            for sid in expired:
+                del self._entries[sid]
+        return len(expired)
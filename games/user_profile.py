@@ -10,13 +10,20 @@ Query ChromaDB with weakness_centroid to find nearest unmastered chunks. No LLM
 
 from __future__ import annotations
 
+import itertools
 import json
 import sqlite3
 from dataclasses import dataclass, field
-from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Any
 
+import numpy as np
+
+from sabdakrida.db.connection import get_connection, transaction
+
+from . import fsrs
+from .attempts import append_attempts, recent_attempts
+
 # Default embedding dims (Qwen3-Embedding-0.6B) — single space for RAG, grammar, pronunciation
 EMBED_DIMS = 1024
 
@@ -33,6 +40,14 @@ DEFAULT_TOPICS = (
 # Chapter gates (curriculum order)
 CHAPTER_ORDER = ("ch2", "ch3", "ch4", "ch5", "ch6", "ch7", "ch8", "ch9")
 
+# Attempts kept in memory as UserProfile.recent_errors (full history is in attempts)
+RECENT_ERRORS_LIMIT = 50
+# Window for avg_recent_score
+RECENT_SCORES_WINDOW = 20
+
+# Process-wide source of profile versions — unique across reloads of the same user
+_versions = itertools.count(1)
+
 
 def _zero_vec(dims: int = EMBED_DIMS) -> list[float]:
     """Zero vector for initial centroids."""
@@ -66,7 +81,13 @@ class UserProfile:
     recent_errors: list[dict] = field(default_factory=list)
     seen_drill_ids: set[str] = field(default_factory=set)
     avg_recent_score: float = 0.5
+    # Changes on every update; caches derived from the profile key off it
+    version: int = field(default_factory=lambda: next(_versions), repr=False, compare=False)
     _recent_scores: list[float] = field(default_factory=list, repr=False)
+    # Row-level write tracking — save_profile only touches what changed since load
+    _dirty_chunks: set[str] = field(default_factory=set, repr=False)
+    _new_seen_ids: set[str] = field(default_factory=set, repr=False)
+    _pending_attempts: list[dict] = field(default_factory=list, repr=False)
 
     def __post_init__(self) -> None:
         if not self.topic_mastery:
@@ -74,6 +95,40 @@ class UserProfile:
         if not self.chapter_progress:
             self.chapter_progress = {c: "locked" for c in CHAPTER_ORDER}
             self.chapter_progress["ch2"] = "active"
+        # Anything handed to the constructor is unsaved until proven otherwise
+        self._dirty_chunks |= set(self.chunk_states)
+        self._new_seen_ids |= set(self.seen_drill_ids)
+        if not self._pending_attempts:
+            self._pending_attempts = list(self.recent_errors)
+
+    def mark_chunk_dirty(self, chunk_id: str) -> None:
+        """Flag a chunk state for upsert on the next save."""
+        self._dirty_chunks.add(chunk_id)
+
+    def bump_version(self) -> None:
+        self.version = next(_versions)
+
+    def mark_seen(self, drill_id: str) -> None:
+        """Record a drill as seen; persisted as a single row on save."""
+        if drill_id not in self.seen_drill_ids:
+            self.seen_drill_ids.add(drill_id)
+            self._new_seen_ids.add(drill_id)
+
+    def _mark_clean(self) -> None:
+        self._dirty_chunks.clear()
+        self._new_seen_ids.clear()
+        self._pending_attempts.clear()
+
+    def record_score(self, score: float) -> None:
+        """Slide score into the recent window, updating avg_recent_score incrementally."""
+        scores = self._recent_scores
+        n = len(scores)
+        if n >= RECENT_SCORES_WINDOW:
+            dropped = scores.pop(0)
+            self.avg_recent_score += (score - dropped) / RECENT_SCORES_WINDOW
+        else:
+            self.avg_recent_score = (self.avg_recent_score * n + score) / (n + 1)
+        scores.append(score)
 
     def weak_topics(self, threshold: float = 0.5) -> list[str]:
         """Topics with mastery below threshold."""
@@ -95,66 +150,98 @@ class UserProfile:
         return self.avg_recent_score * 0.8 + 0.2
 
 
-def get_db_path() -> Path:
-    return Path(__file__).resolve().parent.parent / "sabdakrida" / "sabdakrida.db"
+def _parse_json(s: str | None, default: Any) -> Any:
+    if s is None or s == "":
+        return default
+    try:
+        return json.loads(s)
+    except json.JSONDecodeError:
+        return default
 
 
-def _connect() -> sqlite3.Connection:
-    conn = sqlite3.connect(get_db_path())
-    conn.row_factory = sqlite3.Row
-    return conn
+def _upsert_chunk_states(
+    conn: sqlite3.Connection, user_id: str, states: dict[str, dict[str, Any]]
+) -> None:
+    conn.executemany(
+        """
+        INSERT INTO chunk_states (
+            user_id, chunk_id, stability, difficulty, due,
+            last_review, reps, lapses, updated_at
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+        ON CONFLICT(user_id, chunk_id) DO UPDATE SET
+            stability = excluded.stability,
+            difficulty = excluded.difficulty,
+            due = excluded.due,
+            last_review = excluded.last_review,
+            reps = excluded.reps,
+            lapses = excluded.lapses,
+            updated_at = CURRENT_TIMESTAMP
+        """,
+        [
+            (
+                user_id,
+                cid,
+                st.get("stability", 0.0),
+                st.get("difficulty", 0.0),
+                st.get("due"),
+                st.get("last_review"),
+                st.get("reps", 0),
+                st.get("lapses", 0),
+            )
+            for cid, st in states.items()
+        ],
+    )
 
 
-def _ensure_tables(conn: sqlite3.Connection) -> None:
-    conn.executescript("""
-        CREATE TABLE IF NOT EXISTS user_profiles (
-            user_id TEXT PRIMARY KEY,
-            chunk_states TEXT DEFAULT '{}',
-            weakness_centroid TEXT,
-            strength_centroid TEXT,
-            topic_mastery TEXT,
-            chapter_progress TEXT,
-            recent_errors TEXT DEFAULT '[]',
-            seen_drill_ids TEXT DEFAULT '[]',
-            avg_recent_score REAL DEFAULT 0.5,
-            recent_scores TEXT DEFAULT '[]',
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        );
-    """)
+def _insert_seen(conn: sqlite3.Connection, user_id: str, drill_ids: set[str]) -> None:
+    conn.executemany(
+        "INSERT OR IGNORE INTO seen_drills (user_id, drill_id) VALUES (?, ?)",
+        [(user_id, d) for d in drill_ids],
+    )
 
 
 def load_profile(user_id: str) -> UserProfile:
     """Load or create user profile."""
-    conn = _connect()
-    _ensure_tables(conn)
-    c = conn.cursor()
-    c.execute(
+    conn = get_connection()
+    row = conn.execute(
         "SELECT * FROM user_profiles WHERE user_id = ?",
         (user_id,),
-    )
-    row = c.fetchone()
-    conn.close()
+    ).fetchone()
 
     if row is None:
         return UserProfile(user_id=user_id)
 
-    def parse_json(s: str | None, default: Any) -> Any:
-        if s is None or s == "":
-            return default
-        try:
-            return json.loads(s)
-        except json.JSONDecodeError:
-            return default
-
-    chunk_states = parse_json(row["chunk_states"], {})
-    weakness = parse_json(row["weakness_centroid"], _zero_vec())
-    strength = parse_json(row["strength_centroid"], _zero_vec())
-    topic_mastery = parse_json(row["topic_mastery"], {t: 0.0 for t in DEFAULT_TOPICS})
-    chapter_progress = parse_json(row["chapter_progress"], {c: "locked" for c in CHAPTER_ORDER})
-    recent_errors = parse_json(row["recent_errors"], [])
-    seen_ids = set(parse_json(row["seen_drill_ids"], []))
+    chunk_states = {
+        r["chunk_id"]: {
+            "stability": r["stability"],
+            "difficulty": r["difficulty"],
+            "due": r["due"],
+            "last_review": r["last_review"],
+            "reps": r["reps"] or 0,
+            "lapses": r["lapses"] or 0,
+        }
+        for r in conn.execute(
+            """
+            SELECT chunk_id, stability, difficulty, due, last_review, reps, lapses
+            FROM chunk_states WHERE user_id = ?
+            """,
+            (user_id,),
+        )
+    }
+    seen_ids = {
+        r["drill_id"]
+        for r in conn.execute("SELECT drill_id FROM seen_drills WHERE user_id = ?", (user_id,))
+    }
+    recent_errors = recent_attempts(user_id, RECENT_ERRORS_LIMIT)
+
+    weakness = _parse_json(row["weakness_centroid"], _zero_vec())
+    strength = _parse_json(row["strength_centroid"], _zero_vec())
+    topic_mastery = _parse_json(row["topic_mastery"], {t: 0.0 for t in DEFAULT_TOPICS})
+    chapter_progress = _parse_json(row["chapter_progress"], {c: "locked" for c in CHAPTER_ORDER})
     avg_score = row["avg_recent_score"] or 0.5
-    recent_scores = parse_json(row["recent_scores"], [])
+    recent_scores = [
+        1.0 if a["correct"] else 0.0 for a in recent_errors[-RECENT_SCORES_WINDOW:]
+    ]
 
     p = UserProfile(
         user_id=user_id,
@@ -163,52 +250,72 @@ def load_profile(user_id: str) -> UserProfile:
         strength_centroid=strength,
         topic_mastery=topic_mastery,
         chapter_progress=chapter_progress,
-        recent_errors=recent_errors[-50:],
+        recent_errors=recent_errors,
         seen_drill_ids=seen_ids,
         avg_recent_score=avg_score,
-        _recent_scores=recent_scores[-20:],
+        _recent_scores=recent_scores,
     )
+    p._mark_clean()
     return p
 
 
 def save_profile(profile: UserProfile) -> None:
-    """Persist profile to SQLite."""
-    conn = _connect()
-    _ensure_tables(conn)
+    """
+    Persist profile to SQLite.
+    Fixed-size fields go in user_profiles; chunk states, seen ids and errors are
+    row-level upserts of only what changed, so cost does not grow with history.
+    """
+    save_profiles([profile])
+
+
+def save_profiles(profiles: list[UserProfile]) -> None:
+    """Persist several profiles atomically — one transaction, all or nothing."""
+    with transaction() as conn:
+        for profile in profiles:
+            _save_profile_rows(conn, profile)
+    for profile in profiles:
+        profile._mark_clean()
+
+
+def _save_profile_rows(conn: sqlite3.Connection, profile: UserProfile) -> None:
     conn.execute(
         """
         INSERT INTO user_profiles (
-            user_id, chunk_states, weakness_centroid, strength_centroid,
-            topic_mastery, chapter_progress, recent_errors, seen_drill_ids,
-            avg_recent_score, recent_scores, updated_at
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+            user_id, weakness_centroid, strength_centroid,
+            topic_mastery, chapter_progress,
+            avg_recent_score, updated_at
+        ) VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
         ON CONFLICT(user_id) DO UPDATE SET
-            chunk_states = excluded.chunk_states,
             weakness_centroid = excluded.weakness_centroid,
             strength_centroid = excluded.strength_centroid,
             topic_mastery = excluded.topic_mastery,
             chapter_progress = excluded.chapter_progress,
-            recent_errors = excluded.recent_errors,
-            seen_drill_ids = excluded.seen_drill_ids,
             avg_recent_score = excluded.avg_recent_score,
-            recent_scores = excluded.recent_scores,
             updated_at = CURRENT_TIMESTAMP
         """,
         (
             profile.user_id,
-            json.dumps(profile.chunk_states),
             json.dumps(profile.weakness_centroid),
             json.dumps(profile.strength_centroid),
             json.dumps(profile.topic_mastery),
             json.dumps(profile.chapter_progress),
-            json.dumps(profile.recent_errors[-50:]),
-            json.dumps(list(profile.seen_drill_ids)),
             profile.avg_recent_score,
-            json.dumps(profile._recent_scores[-20:]),
         ),
     )
-    conn.commit()
-    conn.close()
+    if profile._dirty_chunks:
+        _upsert_chunk_states(
+            conn,
+            profile.user_id,
+            {
+                cid: profile.chunk_states[cid]
+                for cid in profile._dirty_chunks
+                if cid in profile.chunk_states
+            },
+        )
+    if profile._new_seen_ids:
+        _insert_seen(conn, profile.user_id, profile._new_seen_ids)
+    if profile._pending_attempts:
+        append_attempts(conn, profile.user_id, profile._pending_attempts)
 
 
 def update_profile(
@@ -219,23 +326,22 @@ def update_profile(
     topic: str = "dhatu",
     learner_answer: str = "",
     alpha: float = 0.1,
+    now: datetime | None = None,
 ) -> UserProfile:
     """
     Update profile after a drill question.
-    - FSRS: simplified — we just track whether seen (full FSRS can be added later).
+    - FSRS: review the chunk's card (Good if correct, Again if not) → new due.
     - Centroids: EMA of wrong → weakness, right → strength.
     - Topic mastery: 0.9 * current + 0.1 if correct.
-    - Recent errors: log for pattern detection.
-    - Recent scores: for adaptive difficulty.
+    - Attempt log: appended to attempts on save (error patterns update there).
+    - Recent scores: sliding window → avg_recent_score for adaptive difficulty.
     """
-    # 1. Chunk state (simplified — no full FSRS yet)
-    if chunk_id not in profile.chunk_states:
-        profile.chunk_states[chunk_id] = {
-            "stability": 1.0,
-            "difficulty": 0.5,
-            "due": datetime.utcnow().isoformat()[:10],
-        }
-    # TODO: fsrs_update(profile.chunk_states[chunk_id], grade=4 if correct else 1)
+    now = now or datetime.utcnow()
+
+    # 1. Chunk state (FSRS review card)
+    card = profile.chunk_states.setdefault(chunk_id, fsrs.new_card())
+    fsrs.review(card, fsrs.grade_for(correct), now)
+    profile.mark_chunk_dirty(chunk_id)
 
     # 2. Centroids (EMA)
     if len(chunk_embedding) == EMBED_DIMS:
@@ -253,20 +359,133 @@ def update_profile(
         cur = profile.topic_mastery[topic]
         profile.topic_mastery[topic] = cur * 0.9 + (0.1 if correct else 0)
 
-    # 4. Recent errors
-    profile.recent_errors.append({
+    # 4. Attempt log
+    entry = {
         "chunk_id": chunk_id,
+        "topic": topic,
         "learner_answer": learner_answer,
         "correct": correct,
-        "timestamp": datetime.utcnow().isoformat(),
-    })
-    profile.recent_errors = profile.recent_errors[-50:]
+        "timestamp": now.isoformat(),
+    }
+    profile.recent_errors.append(entry)
+    profile.recent_errors = profile.recent_errors[-RECENT_ERRORS_LIMIT:]
+    profile._pending_attempts.append(entry)
 
     # 5. Recent scores (for adaptive difficulty)
-    score = 1.0 if correct else 0.0
-    profile._recent_scores.append(score)
-    profile._recent_scores = profile._recent_scores[-20:]
-    if profile._recent_scores:
-        profile.avg_recent_score = sum(profile._recent_scores) / len(profile._recent_scores)
+    profile.record_score(1.0 if correct else 0.0)
 
+    profile.bump_version()
     return profile
+
+
+@dataclass
+class DrillResult:
+    """One graded answer, e.g. from an offline drill session synced later."""
+    chunk_id: str
+    correct: bool
+    topic: str = "dhatu"
+    learner_answer: str = ""
+    timestamp: datetime | None = None
+
+
+def _naive_utc(ts: datetime | None, default: datetime) -> datetime:
+    if ts is None:
+        return default
+    if ts.tzinfo is not None:
+        return ts.astimezone(timezone.utc).replace(tzinfo=None)
+    return ts
+
+
+def _ema_many(current: list[float], rows: list[list[float]], alpha: float) -> list[float]:
+    """
+    Closed form of applying _ema once per row, in order:
+    c·(1-α)^n + Σ α·(1-α)^(n-1-i)·row_i — one matrix-vector product.
+    """
+    n = len(rows)
+    decay = (1 - alpha) ** np.arange(n - 1, -1, -1)
+    out = np.asarray(current, dtype=np.float64) * (1 - alpha) ** n
+    out += (alpha * decay) @ np.asarray(rows, dtype=np.float64)
+    return out.tolist()
+
+
+def update_profile_batch(
+    profile: UserProfile,
+    results: list[DrillResult],
+    embeddings: dict[str, list[float]] | None = None,
+    alpha: float = 0.1,
+) -> UserProfile:
+    """
+    Apply many drill results in timestamp order — same end state as calling
+    update_profile for each, but centroid and mastery EMAs are computed in one
+    vectorised step instead of n passes over 1024-dim vectors.
+    """
+    if not results:
+        return profile
+    embeddings = embeddings or {}
+    now = datetime.utcnow()
+    ordered = sorted(results, key=lambda r: _naive_utc(r.timestamp, now))
+
+    weak_rows: list[list[float]] = []
+    strong_rows: list[list[float]] = []
+    topic_hits: dict[str, list[float]] = {}
+    for r in ordered:
+        ts = _naive_utc(r.timestamp, now)
+
+        # FSRS is inherently sequential per card, but only touches a small dict
+        card = profile.chunk_states.setdefault(r.chunk_id, fsrs.new_card())
+        fsrs.review(card, fsrs.grade_for(r.correct), ts)
+        profile.mark_chunk_dirty(r.chunk_id)
+
+        emb = embeddings.get(r.chunk_id)
+        if emb is not None and len(emb) == EMBED_DIMS:
+            (strong_rows if r.correct else weak_rows).append(emb)
+        if r.topic in profile.topic_mastery:
+            topic_hits.setdefault(r.topic, []).append(1.0 if r.correct else 0.0)
+
+        entry = {
+            "chunk_id": r.chunk_id,
+            "topic": r.topic,
+            "learner_answer": r.learner_answer,
+            "correct": r.correct,
+            "timestamp": ts.isoformat(),
+        }
+        profile.recent_errors.append(entry)
+        profile._pending_attempts.append(entry)
+        profile.record_score(1.0 if r.correct else 0.0)
+
+    if weak_rows:
+        profile.weakness_centroid = _ema_many(profile.weakness_centroid, weak_rows, alpha)
+    if strong_rows:
+        profile.strength_centroid = _ema_many(profile.strength_centroid, strong_rows, alpha)
+
+    # Topic mastery: m ← 0.9·m + 0.1·correct, closed form per topic
+    for topic, hits in topic_hits.items():
+        n = len(hits)
+        decay = 0.9 ** np.arange(n - 1, -1, -1)
+        profile.topic_mastery[topic] = float(
+            profile.topic_mastery[topic] * 0.9 ** n + 0.1 * decay @ np.asarray(hits)
+        )
+
+    profile.recent_errors = profile.recent_errors[-RECENT_ERRORS_LIMIT:]
+    profile.bump_version()
+    return profile
+
+
+def next_due(user_id: str, k: int = 20, now: datetime | None = None) -> list[dict[str, Any]]:
+    """
+    The k most overdue review cards for user_id (due <= now), oldest first.
+    Range scan on the (user_id, due) index — logarithmic in the user's card count.
+    Reads the database: flush a write-behind ProfileCache first for up-to-date results.
+    """
+    now = now or datetime.utcnow()
+    rows = get_connection().execute(
+        """
+        SELECT chunk_id, stability, difficulty, due, last_review, reps, lapses
+        FROM chunk_states
+        WHERE user_id = ? AND due <= ?
+        ORDER BY due
+        LIMIT ?
+        """,
+        (user_id, now.isoformat(timespec="seconds"), k),
+    ).fetchall()
+    return [dict(r) for r in rows]
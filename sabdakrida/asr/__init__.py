@@ -1,4 +1,5 @@
+from .audio import DecodedAudio, decode_audio
 from .whisper_sanskrit import whisper_transcribe
 from .phoneme_diff import phoneme_diff, phoneme_diff_with_positions, phoneme_similarity, normalize_iast
 
-__all__ = ["whisper_transcribe", "phoneme_diff", "phoneme_diff_with_positions", "phoneme_similarity", "normalize_iast"]
+__all__ = ["DecodedAudio", "decode_audio", "whisper_transcribe", "phoneme_diff", "phoneme_diff_with_positions", "phoneme_similarity", "normalize_iast"]
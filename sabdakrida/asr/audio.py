@@ -0,0 +1,129 @@
+"""
+Decoded learner audio — one decode + resample per request.
+
+Whisper, the vowel-duration check and the acoustic fallback all need the same
+16 kHz mono samples. decode_audio() decodes once; the result is passed through
+the pronunciation pipeline instead of the file path.
+
+Uploads are decoded straight from memory: WAV/FLAC/OGG through libsndfile,
+anything else (browser webm/opus) piped through ffmpeg's stdin/stdout. The
+upload is already fully in memory (capped by the upload limit), so it is
+written to ffmpeg's stdin as one buffer rather than streamed. No temp file is
+written.
+"""
+
+from __future__ import annotations
+
+import io
+import shutil
+import subprocess
+from dataclasses import dataclass, field
+
+import numpy as np
+
+SAMPLE_RATE = 16000  # Whisper's input rate
+FFMPEG_TIMEOUT_S = 30  # A clip ffmpeg can't finish in this long is treated as undecodable
+
+
+@dataclass
+class DecodedAudio:
+    """16 kHz mono float32 samples plus the summary stats every stage reads."""
+
+    samples: np.ndarray
+    sr: int = SAMPLE_RATE
+    _mel: dict = field(default_factory=dict, repr=False, compare=False)
+
+    @property
+    def duration(self) -> float:
+        return len(self.samples) / self.sr if self.sr else 0.0
+
+    @property
+    def rms(self) -> float:
+        if not len(self.samples):
+            return 0.0
+        return float(np.sqrt(np.mean(np.square(self.samples, dtype=np.float64))))
+
+    def mel(self, n_mels: int = 80) -> np.ndarray:
+        """Log-mel spectrogram (n_mels × frames), computed on first use and cached."""
+        if n_mels not in self._mel:
+            import librosa
+
+            spec = librosa.feature.melspectrogram(
+                y=self.samples, sr=self.sr, n_fft=400, hop_length=160, n_mels=n_mels
+            )
+            self._mel[n_mels] = librosa.power_to_db(spec).astype(np.float32)
+        return self._mel[n_mels]
+
+
+class AudioDecodeError(ValueError):
+    """Upload is not audio any available decoder understands."""
+
+
+def from_samples(samples: np.ndarray, sr: int) -> DecodedAudio:
+    """Already-decoded samples (any rate, mono or (n, channels)) as 16 kHz mono DecodedAudio."""
+    import librosa
+
+    if samples.ndim > 1:
+        samples = samples.mean(axis=1)
+    if sr != SAMPLE_RATE:
+        samples = librosa.resample(samples, orig_sr=sr, target_sr=SAMPLE_RATE)
+    return DecodedAudio(np.ascontiguousarray(samples, dtype=np.float32), SAMPLE_RATE)
+
+
+def _ffmpeg_decode(data: bytes) -> DecodedAudio:
+    """Containers libsndfile can't read (webm/opus, mp4/aac): ffmpeg over pipes, straight to 16 kHz f32."""
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg is None:
+        raise AudioDecodeError("Unsupported audio format (install ffmpeg for webm/opus uploads)")
+    try:
+        proc = subprocess.run(
+            [ffmpeg, "-nostdin", "-loglevel", "error", "-i", "pipe:0",
+             "-f", "f32le", "-ac", "1", "-ar", str(SAMPLE_RATE), "pipe:1"],
+            input=data, capture_output=True, timeout=FFMPEG_TIMEOUT_S,
+        )
+    except subprocess.TimeoutExpired:
+        raise AudioDecodeError(f"ffmpeg did not decode the upload within {FFMPEG_TIMEOUT_S} s") from None
+    if proc.returncode != 0:
+        raise AudioDecodeError(proc.stderr.decode("utf-8", "replace").strip() or "ffmpeg failed")
+    return DecodedAudio(np.frombuffer(proc.stdout, dtype=np.float32).copy(), SAMPLE_RATE)
+
+
+def decode_audio_bytes(data: bytes) -> DecodedAudio:
+    """Decode an in-memory clip to 16 kHz mono. Raises AudioDecodeError."""
+    import soundfile as sf
+
+    if not data:
+        raise AudioDecodeError("Empty audio upload")
+    try:
+        samples, sr = sf.read(io.BytesIO(data), dtype="float32")
+    except sf.LibsndfileError:
+        return _ffmpeg_decode(data)
+    return from_samples(samples, sr)
+
+
+PCM_ENCODINGS = {"pcm_s16le": "<i2", "pcm_f32le": "<f4"}
+
+
+def pcm_samples(data: bytes, encoding: str = "pcm_s16le") -> np.ndarray:
+    """Raw little-endian mono PCM as float32 in [-1, 1]."""
+    if encoding not in PCM_ENCODINGS:
+        raise AudioDecodeError(f"Unsupported PCM encoding {encoding!r}; expected one of {sorted(PCM_ENCODINGS)}")
+    samples = np.frombuffer(data, dtype=PCM_ENCODINGS[encoding])
+    if encoding == "pcm_s16le":
+        return samples.astype(np.float32) / 32768.0
+    return samples.astype(np.float32)
+
+
+def decode_audio(audio: str | bytes) -> DecodedAudio:
+    """Decode and resample a clip (file path or raw bytes) to 16 kHz mono."""
+    if isinstance(audio, (bytes, bytearray, memoryview)):
+        return decode_audio_bytes(bytes(audio))
+    import librosa
+
+    samples, sr = librosa.load(audio, sr=SAMPLE_RATE)
+    return DecodedAudio(np.asarray(samples, dtype=np.float32), sr)
+
+
+def as_decoded(audio: "str | bytes | DecodedAudio") -> DecodedAudio:
+    """Pass DecodedAudio through; decode a path or bytes. Lets stages accept either."""
+    return audio if isinstance(audio, DecodedAudio) else decode_audio(audio)
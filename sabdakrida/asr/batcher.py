@@ -0,0 +1,140 @@
+"""
+Dynamic micro-batching — concurrent requests share one model call.
+
+submit() queues an item and returns a concurrent.futures.Future. A single
+worker thread takes the first waiting item, keeps collecting for up to
+max_wait_ms or until max_batch items have arrived, then calls
+run_batch(items, key) once per key (e.g. Whisper language) and resolves each
+future with its own result. A lone request waits at most max_wait_ms extra;
+under load the model runs on padded batches instead of serializing at batch
+size 1.
+
+Futures are thread-level, so callers on any event loop (the app loop, the
+tutor's private loops) can await them with asyncio.wrap_future. With a gate,
+submissions past its limit raise Overloaded instead of queueing.
+"""
+
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import TYPE_CHECKING, Any, Callable, Hashable
+
+if TYPE_CHECKING:
+    from ..inference import AdmissionGate
+
+logger = logging.getLogger(__name__)
+
+BatchFn = Callable[[list[Any], Hashable], list[Any]]
+
+
+class MicroBatcher:
+    """Collects concurrent submissions into batches for one worker thread."""
+
+    def __init__(
+        self,
+        run_batch: BatchFn,
+        max_batch: int = 8,
+        max_wait_ms: float = 10.0,
+        name: str = "batcher",
+        gate: AdmissionGate | None = None,
+        initializer: Callable[[], None] | None = None,
+    ) -> None:
+        self.run_batch = run_batch
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max_wait_ms / 1000.0
+        self.name = name
+        self.gate = gate
+        self.initializer = initializer
+        self._queue: queue.Queue = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._closed = False
+        self.batches = 0
+        self.items = 0
+
+    def submit(self, item: Any, key: Hashable = None) -> Future:
+        """Queue item for the next batch with the same key; the future resolves to its result."""
+        if self._closed:
+            raise RuntimeError(f"{self.name} is shut down")
+        if self.gate is not None:
+            self.gate.enter()  # Overloaded when the queue is full
+        future: Future = Future()
+        self._ensure_worker()
+        self._queue.put((key, item, future))
+        return future
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def _ensure_worker(self) -> None:
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                    self._thread.start()
+
+    def _collect(self) -> list[tuple] | None:
+        """Block for one item, then gather more until the deadline or max_batch."""
+        first = self._queue.get()
+        if first is None:
+            return None
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                entry = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if entry is None:
+                self._queue.put(None)  # Finish this batch, then stop
+                break
+            batch.append(entry)
+        return batch
+
+    def _run(self) -> None:
+        if self.initializer is not None:
+            self.initializer()
+        while (batch := self._collect()) is not None:
+            groups: OrderedDict[Hashable, list[tuple]] = OrderedDict()
+            for key, item, future in batch:
+                if future.set_running_or_notify_cancel():
+                    groups.setdefault(key, []).append((item, future))
+                elif self.gate is not None:
+                    self.gate.leave()
+            for key, entries in groups.items():
+                self._dispatch(key, entries)
+
+    def _dispatch(self, key: Hashable, entries: list[tuple]) -> None:
+        start = time.monotonic()
+        try:
+            results = self.run_batch([item for item, _ in entries], key)
+            if len(results) != len(entries):
+                raise RuntimeError(f"{self.name}: {len(results)} results for {len(entries)} items")
+        except Exception as e:
+            logger.exception("%s batch of %d failed", self.name, len(entries))
+            for _, future in entries:
+                future.set_exception(e)
+            return
+        finally:
+            if self.gate is not None:
+                per_item = (time.monotonic() - start) / len(entries)
+                for _ in entries:
+                    self.gate.leave(per_item)
+        self.batches += 1
+        self.items += len(entries)
+        for (_, future), result in zip(entries, results):
+            future.set_result(result)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop after the queued items are processed."""
+        self._closed = True
+        if self._thread is not None:
+            self._queue.put(None)
+            if wait:
+                self._thread.join()
@@ -0,0 +1,59 @@
+"""
+Target-aware decode bounds for pronunciation ASR.
+
+A drill always knows what the learner was asked to say, so the transcript
+cannot sensibly be much longer than the target. token_budget() turns the
+target into a max_new_tokens cap (its Whisper token count × TOKEN_BUDGET_FACTOR
++ TOKEN_BUDGET_MARGIN) and RepetitionStop ends a sequence stuck repeating the
+same 1–4 tokens, Whisper's usual failure on noise. Together they keep a noisy
+one-word clip from decoding up to the model's 448-token limit.
+"""
+
+from __future__ import annotations
+
+import re
+
+import torch
+from transformers import StoppingCriteria
+
+_DEVANAGARI_RE = re.compile(r"[ऀ-ॿ]")
+
+TOKEN_BUDGET_FACTOR = 2.0  # Room for a mispronounced or split word
+TOKEN_BUDGET_MARGIN = 6
+MAX_NEW_TOKENS = 440  # Whisper decoder limit (448) less the forced prefix
+
+
+def to_devanagari(text: str) -> str:
+    """Target as the model writes it (Devanagari); IAST is transliterated."""
+    if not text or _DEVANAGARI_RE.search(text):
+        return text
+    from indic_transliteration import sanscript
+
+    return sanscript.transliterate(text, sanscript.IAST, sanscript.DEVANAGARI)
+
+
+def token_budget(tokenizer, target_text: str | None) -> int:
+    """max_new_tokens for a clip of target_text; MAX_NEW_TOKENS when there is no target."""
+    if not target_text:
+        return MAX_NEW_TOKENS
+    n = len(tokenizer(to_devanagari(target_text), add_special_tokens=False).input_ids)
+    return min(MAX_NEW_TOKENS, int(n * TOKEN_BUDGET_FACTOR) + TOKEN_BUDGET_MARGIN)
+
+
+class RepetitionStop(StoppingCriteria):
+    """Stop a sequence whose last `repeats` blocks of 1..max_ngram tokens are identical."""
+
+    def __init__(self, repeats: int = 4, max_ngram: int = 4) -> None:
+        self.repeats = repeats
+        self.max_ngram = max_ngram
+
+    def __call__(self, input_ids: torch.LongTensor, scores, **kwargs) -> torch.BoolTensor:
+        # The forced prefix (sot, language, task) is distinct tokens, so it never completes a run
+        done = torch.zeros(input_ids.shape[0], dtype=torch.bool, device=input_ids.device)
+        for n in range(1, self.max_ngram + 1):
+            span = n * self.repeats
+            if input_ids.shape[1] < span:
+                break
+            blocks = input_ids[:, -span:].reshape(input_ids.shape[0], self.repeats, n)
+            done |= (blocks == blocks[:, :1]).all(dim=2).all(dim=1)
+        return done
@@ -92,3 +92,29 @@ def phoneme_similarity(target: str, heard: str) -> float:
         return 0.0
     matcher = SequenceMatcher(None, target_norm, heard_norm)
     return matcher.ratio()
+
+
+# Aspirated stops and the diphthongs are one phoneme each in IAST
+_PHONEME_RE = re.compile(r"[kgcjṭḍtdpb]h|ai|au|\S", re.IGNORECASE)
+
+
+def iast_phonemes(text: str) -> list[str]:
+    """Split normalized IAST into phonemes (kh, ai, ā, ṃ, ...), ignoring spaces."""
+    return _PHONEME_RE.findall(normalize_iast(text).lower())
+
+
+def phoneme_error_rate(target: str, heard: str) -> float:
+    """
+    Levenshtein distance between the phoneme sequences over the target's length.
+    0.0 is exact; can exceed 1.0 when much extra speech is heard.
+    """
+    ref, hyp = iast_phonemes(target), iast_phonemes(heard)
+    if not ref:
+        return 0.0 if not hyp else 1.0
+    prev = list(range(len(hyp) + 1))
+    for i, r in enumerate(ref, 1):
+        cur = [i]
+        for j, h in enumerate(hyp, 1):
+            cur.append(min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (r != h)))
+        prev = cur
+    return prev[-1] / len(ref)
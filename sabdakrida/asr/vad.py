@@ -0,0 +1,138 @@
+"""
+Energy-based voice-activity detection for learner audio.
+
+EnergyVAD is fed audio as it arrives and reports the end of speech: voiced
+frames (RMS above both an absolute floor and a multiple of the running noise
+floor) for at least min_speech_ms start an utterance, and end_silence_ms of
+unvoiced frames after it end it. Cheap enough to run per WebSocket chunk;
+no model. split_on_silence() applies the same frame test to a whole
+recording and cuts it into segments at the pauses.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+FRAME_MS = 30
+MIN_RMS = 0.01  # Absolute voiced floor for float samples in [-1, 1]
+NOISE_FACTOR = 3.0  # Voiced = this many times the noise floor
+
+
+def frame_rms(samples: np.ndarray, frame: int) -> np.ndarray:
+    """RMS of each complete frame of `frame` samples."""
+    n = len(samples) // frame
+    if n == 0:
+        return np.zeros(0, dtype=np.float32)
+    frames = samples[: n * frame].reshape(n, frame).astype(np.float64)
+    return np.sqrt(np.mean(frames * frames, axis=1)).astype(np.float32)
+
+
+class EnergyVAD:
+    """Streaming end-of-speech detector; positions are sample indices of the fed audio."""
+
+    def __init__(
+        self,
+        sr: int = 16000,
+        frame_ms: int = FRAME_MS,
+        min_speech_ms: int = 150,
+        end_silence_ms: int = 600,
+        min_rms: float = MIN_RMS,
+    ) -> None:
+        self.sr = sr
+        self.frame = max(1, sr * frame_ms // 1000)
+        self.min_speech_frames = max(1, min_speech_ms // frame_ms)
+        self.end_silence_frames = max(1, end_silence_ms // frame_ms)
+        self.min_rms = min_rms
+        self.noise_floor: float | None = None
+        self.speech_start: int | None = None  # First voiced sample of the utterance
+        self.speech_end: int | None = None  # Just past its last voiced frame
+        self.ended = False
+        self._pending = np.zeros(0, dtype=np.float32)
+        self._offset = 0  # Sample index of _pending[0]
+        self._voiced_run = 0
+        self._silent_run = 0
+
+    @property
+    def in_speech(self) -> bool:
+        return self.speech_start is not None
+
+    def feed(self, samples: np.ndarray) -> bool:
+        """Process newly received samples; True once the utterance has ended."""
+        if self.ended:
+            return True
+        buf = np.concatenate([self._pending, samples]) if len(self._pending) else samples
+        energies = frame_rms(buf, self.frame)
+        for i, rms in enumerate(energies):
+            pos = self._offset + i * self.frame
+            voiced = rms >= self.min_rms and (self.noise_floor is None or rms >= NOISE_FACTOR * self.noise_floor)
+            if voiced:
+                self._voiced_run += 1
+                self._silent_run = 0
+                if self.speech_start is None and self._voiced_run >= self.min_speech_frames:
+                    self.speech_start = pos - (self._voiced_run - 1) * self.frame
+                self.speech_end = pos + self.frame
+            else:
+                self._voiced_run = 0
+                self._silent_run += 1
+                # Track the noise floor on unvoiced frames only
+                self.noise_floor = rms if self.noise_floor is None else 0.9 * self.noise_floor + 0.1 * rms
+                if self.speech_start is not None and self._silent_run >= self.end_silence_frames:
+                    self.ended = True
+                    break
+        used = len(energies) * self.frame
+        self._pending = buf[used:].astype(np.float32, copy=False)
+        self._offset += used
+        return self.ended
+
+    def speech_bounds(self, total: int, pad_ms: int = 150) -> tuple[int, int]:
+        """(start, end) of the utterance plus pad_ms each side, clipped to [0, total]; whole clip if none."""
+        if self.speech_start is None:
+            return 0, total
+        pad = self.sr * pad_ms // 1000
+        return max(0, self.speech_start - pad), min(total, (self.speech_end or total) + pad)
+
+
+def split_on_silence(
+    samples: np.ndarray,
+    sr: int = 16000,
+    min_silence_ms: int = 350,
+    min_segment_ms: int = 250,
+    max_segment_s: float = 25.0,
+    pad_ms: int = 100,
+) -> list[tuple[int, int]]:
+    """
+    (start, end) sample spans of the voiced stretches of a whole recording, for long-form ASR.
+    Pauses shorter than min_silence_ms stay inside a segment (so pieces come out pāda-sized);
+    a segment longer than max_segment_s (Whisper sees 30 s) is cut at its quietest frame.
+    """
+    frame = max(1, sr * FRAME_MS // 1000)
+    rms = frame_rms(samples, frame)
+    if not len(rms):
+        return []
+    # Noise floor from the quietest frames; capped below the loud ones for recordings with few pauses
+    noise, loud = np.percentile(rms, [10, 90])
+    threshold = max(MIN_RMS, min(NOISE_FACTOR * float(noise), 0.5 * float(loud)))
+    voiced = rms >= threshold
+    gap = max(1, min_silence_ms // FRAME_MS)
+
+    spans: list[list[int]] = []  # Frame indices [start, end)
+    for i in np.flatnonzero(voiced):
+        if spans and i - spans[-1][1] < gap:
+            spans[-1][1] = i + 1
+        else:
+            spans.append([i, i + 1])
+
+    max_frames = max(2, int(max_segment_s * 1000) // FRAME_MS)
+    pieces: list[tuple[int, int]] = []
+    while spans:
+        start, end = spans.pop(0)
+        if end - start > max_frames:
+            lo, hi = start + (end - start) // 4, end - (end - start) // 4
+            cut = lo + int(np.argmin(rms[lo:hi]))
+            spans[:0] = [[start, cut], [cut, end]]
+            continue
+        if (end - start) * FRAME_MS >= min_segment_ms:
+            pieces.append((start, end))
+
+    pad = sr * pad_ms // 1000
+    return [(max(0, s * frame - pad), min(len(samples), e * frame + pad)) for s, e in pieces]
@@ -1,45 +1,150 @@
 """
 Sanskrit ASR — Bidwill/whisper-medium-sanskrit-try-2 wrapper.
 Uses Whisper confusion errors as the diagnostic signal.
+
+Concurrent requests are micro-batched (asr.batcher): clips arriving within
+WHISPER_BATCH_WAIT_MS of each other, up to WHISPER_BATCH_SIZE, share one
+feature-extraction + generate call on the padded batch. The batcher's worker
+is the dedicated ASR thread (ASR_TORCH_THREADS intra-op threads); more than
+ASR_MAX_QUEUE waiting clips raise inference.Overloaded.
+
+WHISPER_BACKEND selects the weights: "fp32" (default, as published) or
+"int8" (dynamic int8 quantization of the Linear layers, CPU only).
+scripts/benchmarks/bench_whisper_backends.py measures real-time factor and
+phoneme error rate of each before switching.
+
+When the caller passes the target text, decoding is bounded by a token
+budget derived from it plus a repetition stop (asr.decoding). WHISPER_PROMPT=1
+additionally conditions the decoder on the target as a Whisper prompt — off
+by default, since biasing the model toward the target can hide the very
+mispronunciations a drill is meant to catch.
 """
 
 import asyncio
-from functools import partial
+import logging
+import os
+import threading
+import warnings
 
-import librosa
 import torch
-from transformers import WhisperProcessor, WhisperForConditionalGeneration
+from transformers import StoppingCriteriaList, WhisperProcessor, WhisperForConditionalGeneration
+
+from .audio import SAMPLE_RATE, DecodedAudio, as_decoded, decode_audio
+from .batcher import MicroBatcher
+from .decoding import RepetitionStop, to_devanagari, token_budget
+
+logger = logging.getLogger(__name__)
+
+WHISPER_MODEL_ID = "Bidwill/whisper-medium-sanskrit-try-2"
+WHISPER_BACKEND = os.environ.get("WHISPER_BACKEND", "fp32").lower()
+BACKENDS = ("fp32", "int8")
+WHISPER_BATCH_SIZE = int(os.environ.get("WHISPER_BATCH_SIZE", "8"))
+WHISPER_BATCH_WAIT_MS = float(os.environ.get("WHISPER_BATCH_WAIT_MS", "10"))
+WHISPER_PROMPT = os.environ.get("WHISPER_PROMPT", "0") == "1"
 
 # Lazy load to avoid import-time GPU allocation
 _processor = None
 _model = None
+_batcher: MicroBatcher | None = None
+_batcher_lock = threading.Lock()
+
+
+def apply_backend(model, backend: str):
+    """model prepared for backend: fp32 unchanged, int8 with dynamically quantized Linear layers."""
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown WHISPER_BACKEND {backend!r}; expected one of {BACKENDS}")
+    if backend == "fp32":
+        return model
+    if model.device.type != "cpu":
+        logger.warning("int8 Whisper backend is CPU-only; keeping fp32 on %s", model.device)
+        return model
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")  # torch.ao deprecation notices
+        return torch.ao.quantization.quantize_dynamic(model.eval(), {torch.nn.Linear}, dtype=torch.qint8)
 
 
 def _load_whisper():
     global _processor, _model
     if _processor is None:
-        _processor = WhisperProcessor.from_pretrained("Bidwill/whisper-medium-sanskrit-try-2")
-        _model = WhisperForConditionalGeneration.from_pretrained(
-            "Bidwill/whisper-medium-sanskrit-try-2"
-        ).to("cuda" if torch.cuda.is_available() else "cpu")
+        _processor = WhisperProcessor.from_pretrained(WHISPER_MODEL_ID)
+        model = WhisperForConditionalGeneration.from_pretrained(WHISPER_MODEL_ID).to(
+            "cuda" if torch.cuda.is_available() else "cpu"
+        )
+        _model = apply_backend(model.eval(), WHISPER_BACKEND)
     return _processor, _model
 
 
-def _transcribe_sync(audio_path: str, language: str = "sa") -> str:
+def _transcribe_batch_sync(
+    items: list[tuple[DecodedAudio, str | None]],
+    key: tuple[str, str | None] = ("sa", None),
+) -> list[str]:
+    """
+    One padded generate() over several (clip, target_text) items; transcripts in input order.
+    key is (language, prompt text or None). Decoding stops at the largest target budget.
+    """
+    language, prompt = key
     processor, model = _load_whisper()
-    audio, sr = librosa.load(audio_path, sr=16000)
-    inputs = processor(audio, sampling_rate=16000, return_tensors="pt").to(model.device)
+    inputs = processor(
+        [audio.samples for audio, _ in items], sampling_rate=SAMPLE_RATE, return_tensors="pt"
+    ).to(model.device)
+    kwargs = {}
+    if all(target for _, target in items):
+        kwargs["max_new_tokens"] = max(token_budget(processor.tokenizer, target) for _, target in items)
+        kwargs["stopping_criteria"] = StoppingCriteriaList([RepetitionStop()])
+    if prompt:
+        kwargs["prompt_ids"] = torch.as_tensor(processor.get_prompt_ids(prompt), device=model.device)
     with torch.no_grad():
-        predicted_ids = model.generate(
-            inputs["input_features"],
-            forced_decoder_ids=processor.get_decoder_prompt_ids(language=language, task="transcribe"),
-        )
-    return processor.batch_decode(predicted_ids, skip_special_tokens=True)[0]
+        predicted_ids = model.generate(inputs["input_features"], language=language, task="transcribe", **kwargs)
+    return processor.batch_decode(predicted_ids, skip_special_tokens=True)
+
+
+def _transcribe_sync(
+    audio: str | DecodedAudio, language: str = "sa", target_text: str | None = None, prompt: bool = False
+) -> str:
+    key = (language, to_devanagari(target_text) if prompt and target_text else None)
+    return _transcribe_batch_sync([(as_decoded(audio), target_text)], key)[0]
+
+
+def get_asr_batcher() -> MicroBatcher:
+    """Process-wide Whisper batcher (one worker thread owns the model)."""
+    global _batcher
+    if _batcher is None:
+        from ..inference import ASR_MAX_QUEUE, ASR_TORCH_THREADS, AdmissionGate, torch_thread_initializer
+
+        with _batcher_lock:
+            if _batcher is None:
+                _batcher = MicroBatcher(
+                    _transcribe_batch_sync,
+                    max_batch=WHISPER_BATCH_SIZE,
+                    max_wait_ms=WHISPER_BATCH_WAIT_MS,
+                    name="whisper-batcher",
+                    gate=AdmissionGate("asr", WHISPER_BATCH_SIZE + ASR_MAX_QUEUE),
+                    initializer=torch_thread_initializer(ASR_TORCH_THREADS),
+                )
+    return _batcher
+
+
+def shutdown_asr_batcher() -> None:
+    global _batcher
+    with _batcher_lock:
+        if _batcher is not None:
+            _batcher.shutdown(wait=False)
+            _batcher = None
 
 
-async def whisper_transcribe(audio_path: str, language: str = "sa") -> str:
-    """Transcribe audio with Sanskrit-finetuned Whisper. Runs in thread pool to avoid blocking."""
-    loop = asyncio.get_event_loop()
-    return await loop.run_in_executor(
-        None, partial(_transcribe_sync, audio_path, language)
-    )
+async def whisper_transcribe(
+    audio: str | DecodedAudio,
+    language: str = "sa",
+    target_text: str | None = None,
+    prompt: bool | None = None,
+) -> str:
+    """
+    Transcribe audio (path or DecodedAudio) with Sanskrit-finetuned Whisper, batched with concurrent requests.
+    With target_text, decoding is bounded by the target's token budget; prompt (default WHISPER_PROMPT)
+    also conditions the decoder on it.
+    """
+    if not isinstance(audio, DecodedAudio):
+        audio = await asyncio.get_event_loop().run_in_executor(None, decode_audio, audio)
+    prompt = WHISPER_PROMPT if prompt is None else prompt
+    key = (language, to_devanagari(target_text) if prompt and target_text else None)
+    return await asyncio.wrap_future(get_asr_batcher().submit((audio, target_text), key))
@@ -3,27 +3,27 @@ Acoustic analysis for waveform-based pronunciation feedback.
 Uses librosa to extract features and suggest targeted advice.
 """
 
-import numpy as np
-
 try:
-    import librosa
+    import librosa  # noqa: F401
     HAVE_LIBROSA = True
 except ImportError:
     HAVE_LIBROSA = False
 
+from ..asr.audio import DecodedAudio, as_decoded
+
 
-def analyze_audio(audio_path: str, reference_duration: float | None = None) -> dict:
+def analyze_audio(audio: str | DecodedAudio, reference_duration: float | None = None) -> dict:
     """
-    Analyze learner audio for pronunciation feedback.
+    Analyze learner audio (path or DecodedAudio) for pronunciation feedback.
     Returns dict with duration_ratio, rms_energy, advice_hints.
     """
-    if not HAVE_LIBROSA:
+    if not HAVE_LIBROSA and not isinstance(audio, DecodedAudio):
         return {"duration_ratio": 1.0, "rms_energy": 0.5, "advice_hints": []}
 
     try:
-        y, sr = librosa.load(audio_path, sr=16000)
-        duration = len(y) / sr
-        rms = float(np.sqrt(np.mean(y**2)))
+        decoded = as_decoded(audio)
+        duration = decoded.duration
+        rms = decoded.rms
 
         # Normalize RMS to 0–1 (typical speech is ~0.01–0.3)
         rms_norm = min(1.0, rms * 10) if rms > 0 else 0
@@ -63,7 +63,7 @@ def analyze_audio(audio_path: str, reference_duration: float | None = None) -> d
 
 
 def get_generic_fallback_advice(
-    audio_path: str,
+    audio: str | DecodedAudio,
     target_text: str,
     errors: list,
     reference_duration: float | None,
@@ -72,7 +72,7 @@ def get_generic_fallback_advice(
     When no known error type matches, use waveform analysis to suggest what to improve.
     Never returns the bland 'Try again' — always gives actionable advice.
     """
-    analysis = analyze_audio(audio_path, reference_duration)
+    analysis = analyze_audio(audio, reference_duration)
     hints = analysis.get("advice_hints", [])
 
     if hints:
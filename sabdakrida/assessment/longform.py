@@ -0,0 +1,156 @@
+"""
+Long-form recitation — whole ślokas and readings passages, past Whisper's 30 s window.
+
+The recording is cut at its pauses into pāda-sized segments
+(asr.vad.split_on_silence) and the segments are submitted to Whisper in waves
+of WHISPER_BATCH_SIZE, so the micro-batcher runs each wave as one padded batch:
+a 2-minute recitation costs about one long segment per batch, not the sum of
+all of them, and holds at most one batch of ASR admission slots. The segment
+transcripts are aligned back to the target's lines (split at newlines and
+daṇḍas) and scored per line.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import re
+from difflib import SequenceMatcher
+
+from ..asr import DecodedAudio, decode_audio, normalize_iast, phoneme_diff, phoneme_similarity, whisper_transcribe
+from ..asr.vad import split_on_silence
+from ..asr.whisper_sanskrit import WHISPER_BATCH_SIZE
+from ..data import PHONEME_CONFUSIONS
+from ..db import record_pronunciation_score, update_user_profile
+from .mode1 import _to_iast
+
+# Line breaks: newline, or daṇḍa(s) with an optional verse number between them (।, ॥, |, ||)
+_LINE_BREAK_RE = re.compile(r"\s*(?:\n|[।॥|]+(?:\s*[\d०-९]+\s*[।॥|]+)?)\s*")
+
+
+def split_lines(target_text: str) -> list[str]:
+    """Target lines (pādas / half-verses) in IAST, without daṇḍas or verse numbers."""
+    lines = [normalize_iast(_to_iast(line)) for line in _LINE_BREAK_RE.split(target_text)]
+    return [line for line in lines if line]
+
+
+def align_lines(lines: list[str], heard: list[str]) -> list[tuple[str, list[int]]]:
+    """
+    For each target line, the heard text aligned to it and the indices of the segments it came from.
+    Character alignment of the joined texts, so a segment may cover several lines and a line
+    may span several segments.
+    """
+    target = " ".join(lines)
+    hyp = " ".join(heard)
+    segment_of: list[int] = []
+    for i, text in enumerate(heard):
+        segment_of += [i] * len(text) + [-1]  # -1: the joining space
+
+    line_spans, pos = [], 0
+    for line in lines:
+        line_spans.append((pos, pos + len(line)))
+        pos += len(line) + 1
+    claimed: list[list[int] | None] = [None] * len(lines)
+
+    def claim(line: int, b0: int, b1: int) -> None:
+        if b1 > b0:
+            span = claimed[line]
+            claimed[line] = [b0, b1] if span is None else [min(span[0], b0), max(span[1], b1)]
+
+    matcher = SequenceMatcher(None, target, hyp, autojunk=False)
+    for tag, a0, a1, b0, b1 in matcher.get_opcodes():
+        if tag == "insert":
+            # Extra heard text goes to the line it was heard in
+            at = a0 - 1 if a0 > 0 else 0
+            line = next((i for i, (s, e) in enumerate(line_spans) if s <= at < e + 1), len(lines) - 1)
+            claim(line, b0, b1)
+            continue
+        if tag == "delete":
+            continue
+        scale = (b1 - b0) / (a1 - a0)  # equal: 1; replace: proportional
+        for i, (s, e) in enumerate(line_spans):
+            lo, hi = max(a0, s), min(a1, e)
+            if lo < hi:
+                claim(i, b0 + round((lo - a0) * scale), b0 + round((hi - a0) * scale))
+
+    aligned = []
+    for span in claimed:
+        if span is None:
+            aligned.append(("", []))
+            continue
+        b0, b1 = span
+        segments = sorted({segment_of[j] for j in range(b0, b1) if segment_of[j] >= 0})
+        aligned.append((hyp[b0:b1].strip(), segments))
+    return aligned
+
+
+async def transcribe_segments(clips: list[DecodedAudio], target_text: str | None = None) -> list[str]:
+    """
+    Transcripts of clips, in order, submitted one Whisper batch at a time. Each wave
+    runs to completion before an Overloaded refusal is raised, so no segment is
+    left running for a recitation that already failed.
+    """
+    heard: list[str] = []
+    for i in range(0, len(clips), WHISPER_BATCH_SIZE):
+        batch = clips[i:i + WHISPER_BATCH_SIZE]
+        wave = await asyncio.gather(
+            *(whisper_transcribe(clip, language="sa", target_text=target_text) for clip in batch),
+            return_exceptions=True,
+        )
+        for result in wave:
+            if isinstance(result, BaseException):
+                raise result
+        heard += wave
+    return heard
+
+
+async def recitation_session(audio: str | DecodedAudio, target_text: str, user_id: str) -> dict:
+    """
+    Long-form assessment: segment at pauses, transcribe the segments in batches,
+    align to the target's lines, score each line, update the profile per line.
+    """
+    if not isinstance(audio, DecodedAudio):
+        audio = await asyncio.get_event_loop().run_in_executor(None, decode_audio, audio)
+    lines = split_lines(target_text) or [normalize_iast(_to_iast(target_text))]
+    spans = split_on_silence(audio.samples, audio.sr) or [(0, len(audio.samples))]
+
+    # Budget each segment by the longest line: a missed pause can join two pādas
+    longest = max(lines, key=len)
+    heard = await transcribe_segments([DecodedAudio(audio.samples[s:e], audio.sr) for s, e in spans], longest)
+    heard_iast = [normalize_iast(_to_iast(h)) for h in heard]
+
+    results = []
+    error_types = []
+    for line, (heard_line, segments) in zip(lines, align_lines(lines, heard_iast)):
+        errors = phoneme_diff(line, heard_line)
+        error_types += [PHONEME_CONFUSIONS[e] for e in errors if e in PHONEME_CONFUSIONS]
+        results.append({
+            "line": line,
+            "heard": heard_line,
+            "score": round(phoneme_similarity(line, heard_line), 2),
+            "errors": [(str(a), str(b)) for a, b in errors],
+            "segments": segments,
+            "start": round(spans[segments[0]][0] / audio.sr, 2) if segments else None,
+            "end": round(spans[segments[-1]][1] / audio.sr, 2) if segments else None,
+        })
+
+    # Overall score weights lines by length
+    total = sum(len(r["line"]) for r in results)
+    score = round(sum(r["score"] * len(r["line"]) for r in results) / total, 2) if total else 0.0
+    correct = all(not r["errors"] and r["heard"] for r in results)
+    if error_types:
+        update_user_profile(user_id, error_types)
+    # Scores are kept per line, the unit drills are picked by — not for the whole passage
+    for r in results:
+        record_pronunciation_score(user_id, r["line"], r["score"], not r["errors"] and bool(r["heard"]))
+
+    return {
+        "target": target_text,
+        "heard": heard,
+        "heard_iast": " ".join(heard_iast),
+        "lines": results,
+        "segments": [{"start": round(s / audio.sr, 2), "end": round(e / audio.sr, 2)} for s, e in spans],
+        "duration": round(audio.duration, 2),
+        "error_types": error_types,
+        "correct": correct,
+        "score": score,
+    }
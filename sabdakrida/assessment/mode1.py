@@ -4,14 +4,13 @@ Whisper confusion → phoneme diff → user profile → TTS feedback.
 Score 0–1, waveform-based advice, strict perfect criteria.
 """
 
+import asyncio
 import base64
 import os
 import re
 from collections import Counter
 
-import librosa
-
-from ..asr import whisper_transcribe, phoneme_diff_with_positions, phoneme_similarity
+from ..asr import DecodedAudio, decode_audio, whisper_transcribe, phoneme_diff_with_positions, phoneme_similarity
 from ..asr.phoneme_diff import get_syllable_at
 from ..data import PHONEME_CONFUSIONS, ERROR_EXPLANATIONS
 from ..db import update_user_profile, record_pronunciation_score
@@ -34,7 +33,7 @@ def _to_iast(text: str) -> str:
         return text
 
 
-def _check_vowel_duration_fast(audio_path: str, target_text: str) -> tuple[bool, float | None]:
+def _check_vowel_duration_fast(audio: DecodedAudio, target_text: str) -> tuple[bool, float | None]:
     """
     Fast heuristic without TTS: if target has long vowels, require minimum duration.
     ~0.15s per char as rough reference; learner <50% of that = too fast.
@@ -42,25 +41,24 @@ def _check_vowel_duration_fast(audio_path: str, target_text: str) -> tuple[bool,
     """
     if not any(v in target_text for v in LONG_VOWELS):
         return (False, None)
-    try:
-        learner_y, sr = librosa.load(audio_path, sr=16000)
-        learner_dur = len(learner_y) / sr
-        ref_estimate = max(0.5, 0.12 * len(target_text))  # rough: ~0.12s per char
-        if learner_dur < ref_estimate * 0.5:
-            return True, ref_estimate
-        return False, ref_estimate
-    except Exception:
-        return False, None
+    ref_estimate = max(0.5, 0.12 * len(target_text))  # rough: ~0.12s per char
+    if audio.duration < ref_estimate * 0.5:
+        return True, ref_estimate
+    return False, ref_estimate
 
 
 async def pronunciation_session(
-    audio_path: str, target_text: str, user_id: str
+    audio: str | DecodedAudio, target_text: str, user_id: str
 ) -> dict:
     """
     Core pronunciation session: transcribe, diff, score, update profile, speak feedback.
+    audio is a file path or an already-decoded clip; it is decoded once and shared by every stage.
     """
-    # 1. Transcribe with Sanskrit Whisper (returns Devanagari)
-    heard = await whisper_transcribe(audio_path, language="sa")
+    if not isinstance(audio, DecodedAudio):
+        audio = await asyncio.get_event_loop().run_in_executor(None, decode_audio, audio)
+
+    # 1. Transcribe with Sanskrit Whisper (returns Devanagari); decode bounded by the target's length
+    heard = await whisper_transcribe(audio, language="sa", target_text=target_text)
     heard_iast = _to_iast(heard)
 
     # 2. Phoneme diff — use IAST for both so PHONEME_CONFUSIONS matches
@@ -69,7 +67,7 @@ async def pronunciation_session(
 
     # 3. Score 0–1 (phoneme similarity; strict perfect = 0 errors + duration ok)
     base_score = phoneme_similarity(target_text, heard_iast)
-    vowel_duration_fail, ref_dur = _check_vowel_duration_fast(audio_path, target_text)
+    vowel_duration_fail, ref_dur = _check_vowel_duration_fast(audio, target_text)
 
     # Strict perfect: exact phoneme match AND acceptable duration for long-vowel words
     # Cap at 99% — granular similarity can't truly reach 100% (ASR/measurement limits)
@@ -144,7 +142,7 @@ async def pronunciation_session(
         else:
             response_text = "punar vadatu. śuddhataraṃ uccāraya."
             feedback_english = get_generic_fallback_advice(
-                audio_path, target_text, errors, ref_dur
+                audio, target_text, errors, ref_dur
             )
             style = "command"
             if error_details:
@@ -0,0 +1,81 @@
+"""
+Streamed Mode 1 capture — assessment starts when the learner stops talking.
+
+The browser streams raw mono PCM over a WebSocket while recording.
+StreamCapture runs EnergyVAD on every chunk; once end of speech is detected
+(or the stream hits STREAM_MAX_SECONDS, Whisper's 30 s window) the utterance
+is trimmed, resampled to 16 kHz and handed to pronunciation_session without
+waiting for an upload.
+
+The client chooses the sample rate, so it is checked against
+STREAM_MIN_RATE..STREAM_MAX_RATE, and STREAM_MAX_BYTES bounds the bytes
+accepted per stream whatever the rate.
+"""
+
+from __future__ import annotations
+
+import os
+
+import numpy as np
+
+from ..asr.audio import AudioDecodeError, DecodedAudio, from_samples, pcm_samples
+from ..asr.vad import EnergyVAD
+
+STREAM_MAX_SECONDS = float(os.environ.get("STREAM_MAX_SECONDS", "30"))
+STREAM_END_SILENCE_MS = int(os.environ.get("STREAM_END_SILENCE_MS", "600"))
+STREAM_MIN_RATE, STREAM_MAX_RATE = 8000, 48000
+# 30 s of f32 at 48 kHz, rounded up
+STREAM_MAX_BYTES = int(os.environ.get("STREAM_MAX_BYTES", str(6 * 1024 * 1024)))
+
+
+class StreamCapture:
+    """Accumulates streamed PCM chunks and detects the end of the utterance."""
+
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        encoding: str = "pcm_s16le",
+        max_seconds: float = STREAM_MAX_SECONDS,
+        max_bytes: int = STREAM_MAX_BYTES,
+    ) -> None:
+        pcm_samples(b"", encoding)  # AudioDecodeError for an unknown encoding, before any audio
+        if not STREAM_MIN_RATE <= sample_rate <= STREAM_MAX_RATE:
+            raise AudioDecodeError(f"sample_rate must be {STREAM_MIN_RATE}–{STREAM_MAX_RATE} Hz, got {sample_rate}")
+        self.sample_rate = sample_rate
+        self.encoding = encoding
+        self.max_samples = int(max_seconds * sample_rate)
+        self.max_bytes = max_bytes
+        self.bytes_received = 0
+        self.vad = EnergyVAD(sample_rate, end_silence_ms=STREAM_END_SILENCE_MS)
+        self._chunks: list[np.ndarray] = []
+        self._remainder = b""  # Partial sample split across messages
+        self.received = 0
+
+    @property
+    def width(self) -> int:
+        return 2 if self.encoding == "pcm_s16le" else 4
+
+    @property
+    def duration(self) -> float:
+        return self.received / self.sample_rate
+
+    def add(self, data: bytes) -> bool:
+        """Append a chunk; True once the utterance has ended or a length or byte cap is reached."""
+        data = data[: max(0, self.max_bytes - self.bytes_received)]
+        self.bytes_received += len(data)
+        data = self._remainder + data
+        usable = len(data) - len(data) % self.width
+        self._remainder = data[usable:]
+        samples = pcm_samples(data[:usable], self.encoding)
+        room = self.max_samples - self.received
+        samples = samples[:room]
+        self._chunks.append(samples)
+        self.received += len(samples)
+        ended = self.vad.feed(samples)
+        return ended or self.received >= self.max_samples or self.bytes_received >= self.max_bytes
+
+    def audio(self) -> DecodedAudio:
+        """The utterance (padded speech span, or everything if no speech was detected) at 16 kHz."""
+        samples = np.concatenate(self._chunks) if self._chunks else np.zeros(0, dtype=np.float32)
+        start, end = self.vad.speech_bounds(len(samples))
+        return from_samples(samples[start:end], self.sample_rate)
@@ -0,0 +1,115 @@
+"""
+Shared SQLite access layer for sabdakrida.db.
+
+One connection per thread (reused across calls, so sqlite3's statement cache
+acts as a prepared-statement pool), WAL journaling, tuned pragmas, and schema
+migrations applied once per process before the first query.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+from .migrations import migrate
+
+_DEFAULT_DB_PATH = Path(__file__).resolve().parent.parent / "sabdakrida.db"
+
+# Statements cached per connection — every store uses constant SQL strings
+STATEMENT_CACHE_SIZE = 256
+
+PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",  # Durable across app crashes; WAL checkpoint fsyncs
+    "PRAGMA busy_timeout = 5000",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -16000",  # 16 MB page cache
+    "PRAGMA mmap_size = 134217728",  # 128 MB
+    "PRAGMA foreign_keys = ON",
+)
+
+_db_path: Path | None = None
+_local = threading.local()
+_migrated: set[str] = set()
+_migrate_lock = threading.Lock()
+
+
+def get_db_path() -> Path:
+    """Database file — SABDAKRIDA_DB env var overrides the bundled sabdakrida.db."""
+    if _db_path is not None:
+        return _db_path
+    env = os.environ.get("SABDAKRIDA_DB")
+    return Path(env) if env else _DEFAULT_DB_PATH
+
+
+def set_db_path(path: str | Path | None) -> None:
+    """Point the layer at another database (tests, tools). None restores the default."""
+    global _db_path
+    _db_path = Path(path) if path is not None else None
+
+
+def _open(path: Path) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, cached_statements=STATEMENT_CACHE_SIZE)
+    conn.row_factory = sqlite3.Row
+    for pragma in PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+def init_db(path: str | Path | None = None) -> None:
+    """Apply pending migrations once per process. Called at app startup."""
+    key = str(Path(path) if path is not None else get_db_path())
+    if key in _migrated:
+        return
+    with _migrate_lock:
+        if key in _migrated:
+            return
+        conn = _open(Path(key))
+        try:
+            migrate(conn)
+        finally:
+            conn.close()
+        _migrated.add(key)
+
+
+def get_connection() -> sqlite3.Connection:
+    """This thread's connection to the current database, opened on first use."""
+    path = get_db_path()
+    key = str(path)
+    conns: dict[str, sqlite3.Connection] | None = getattr(_local, "conns", None)
+    if conns is None:
+        conns = _local.conns = {}
+    conn = conns.get(key)
+    if conn is None:
+        init_db(path)
+        conn = conns[key] = _open(path)
+    return conn
+
+
+@contextmanager
+def transaction() -> Iterator[sqlite3.Connection]:
+    """Commit on success, roll back on error. Nested use joins the outer transaction."""
+    conn = get_connection()
+    if conn.in_transaction:
+        yield conn
+        return
+    conn.execute("BEGIN")
+    try:
+        yield conn
+    except BaseException:
+        conn.rollback()
+        raise
+    else:
+        conn.commit()
+
+
+def close_connection() -> None:
+    """Close this thread's connections (worker shutdown, tests)."""
+    conns = getattr(_local, "conns", None) or {}
+    for conn in conns.values():
+        conn.close()
+    conns.clear()
@@ -0,0 +1,223 @@
+"""
+Schema migrations for sabdakrida.db, tracked with PRAGMA user_version.
+
+Append new steps to MIGRATIONS — never edit one that has shipped. Each step runs
+in its own transaction. Version 1 uses IF NOT EXISTS so databases created by the
+old per-call CREATE TABLE code upgrade in place.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+
+MIGRATIONS: list[tuple[int, str, str]] = [
+    (
+        1,
+        "baseline schema",
+        """
+        CREATE TABLE IF NOT EXISTS phoneme_errors (
+            user_id TEXT NOT NULL,
+            error_type TEXT NOT NULL,
+            count INTEGER DEFAULT 0,
+            last_seen TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (user_id, error_type)
+        );
+        CREATE TABLE IF NOT EXISTS pronunciation_scores (
+            user_id TEXT NOT NULL,
+            target_text TEXT NOT NULL,
+            score REAL NOT NULL,
+            correct INTEGER NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+        CREATE INDEX IF NOT EXISTS idx_pronunciation_scores_user
+            ON pronunciation_scores (user_id, created_at);
+        CREATE TABLE IF NOT EXISTS tutor_progress (
+            user_id TEXT PRIMARY KEY,
+            zone_levels TEXT DEFAULT '{}',
+            level_retry_counts TEXT DEFAULT '{}',
+            weekly_arc TEXT,
+            last_arc_generated TIMESTAMP,
+            unverified_pronunciation TEXT DEFAULT '[]',
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+        CREATE TABLE IF NOT EXISTS user_profiles (
+            user_id TEXT PRIMARY KEY,
+            chunk_states TEXT DEFAULT '{}',
+            weakness_centroid TEXT,
+            strength_centroid TEXT,
+            topic_mastery TEXT,
+            chapter_progress TEXT,
+            recent_errors TEXT DEFAULT '[]',
+            seen_drill_ids TEXT DEFAULT '[]',
+            avg_recent_score REAL DEFAULT 0.5,
+            recent_scores TEXT DEFAULT '[]',
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+        CREATE TABLE IF NOT EXISTS chunk_states (
+            user_id TEXT NOT NULL,
+            chunk_id TEXT NOT NULL,
+            stability REAL DEFAULT 1.0,
+            difficulty REAL DEFAULT 0.5,
+            due TEXT,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (user_id, chunk_id)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS seen_drills (
+            user_id TEXT NOT NULL,
+            drill_id TEXT NOT NULL,
+            seen_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (user_id, drill_id)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS recent_errors (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id TEXT NOT NULL,
+            chunk_id TEXT NOT NULL,
+            learner_answer TEXT DEFAULT '',
+            correct INTEGER NOT NULL,
+            timestamp TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_recent_errors_user
+            ON recent_errors (user_id, id);
+        """,
+    ),
+    (
+        2,
+        "move legacy user_profiles JSON blobs into row tables",
+        """
+        INSERT OR IGNORE INTO chunk_states (user_id, chunk_id, stability, difficulty, due)
+        SELECT p.user_id, j.key,
+               COALESCE(json_extract(j.value, '$.stability'), 1.0),
+               COALESCE(json_extract(j.value, '$.difficulty'), 0.5),
+               json_extract(j.value, '$.due')
+        FROM user_profiles p, json_each(p.chunk_states) j
+        WHERE json_valid(p.chunk_states);
+
+        INSERT OR IGNORE INTO seen_drills (user_id, drill_id)
+        SELECT p.user_id, j.value
+        FROM user_profiles p, json_each(p.seen_drill_ids) j
+        WHERE json_valid(p.seen_drill_ids);
+
+        INSERT INTO recent_errors (user_id, chunk_id, learner_answer, correct, timestamp)
+        SELECT p.user_id,
+               COALESCE(json_extract(j.value, '$.chunk_id'), ''),
+               COALESCE(json_extract(j.value, '$.learner_answer'), ''),
+               COALESCE(json_extract(j.value, '$.correct'), 0),
+               json_extract(j.value, '$.timestamp')
+        FROM user_profiles p, json_each(p.recent_errors) j
+        WHERE json_valid(p.recent_errors)
+        ORDER BY p.user_id, j.key;
+
+        UPDATE user_profiles
+        SET chunk_states = '{}', seen_drill_ids = '[]', recent_errors = '[]';
+        """,
+    ),
+    (
+        3,
+        "FSRS review-card columns and (user_id, due) queue index",
+        """
+        ALTER TABLE chunk_states ADD COLUMN last_review TEXT;
+        ALTER TABLE chunk_states ADD COLUMN reps INTEGER DEFAULT 0;
+        ALTER TABLE chunk_states ADD COLUMN lapses INTEGER DEFAULT 0;
+        CREATE INDEX IF NOT EXISTS idx_chunk_states_due
+            ON chunk_states (user_id, due);
+        """,
+    ),
+    (
+        4,
+        "cohort clustering summaries",
+        """
+        CREATE TABLE IF NOT EXISTS cohort_runs (
+            run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            n_profiles INTEGER NOT NULL,
+            k INTEGER NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+        CREATE TABLE IF NOT EXISTS cohort_clusters (
+            run_id INTEGER NOT NULL REFERENCES cohort_runs (run_id) ON DELETE CASCADE,
+            cluster_id INTEGER NOT NULL,
+            size INTEGER NOT NULL,
+            centroid BLOB,
+            label_chunk_ids TEXT DEFAULT '[]',
+            label_text TEXT DEFAULT '',
+            PRIMARY KEY (run_id, cluster_id)
+        );
+        CREATE TABLE IF NOT EXISTS cohort_members (
+            run_id INTEGER NOT NULL REFERENCES cohort_runs (run_id) ON DELETE CASCADE,
+            user_id TEXT NOT NULL,
+            cluster_id INTEGER NOT NULL,
+            PRIMARY KEY (run_id, user_id)
+        );
+        """,
+    ),
+    (
+        5,
+        "append-only attempts log replaces recent_errors",
+        """
+        CREATE TABLE IF NOT EXISTS attempts (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id TEXT NOT NULL,
+            chunk_id TEXT NOT NULL,
+            topic TEXT DEFAULT '',
+            learner_answer TEXT DEFAULT '',
+            correct INTEGER NOT NULL,
+            created_at TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_attempts_user_time
+            ON attempts (user_id, created_at);
+        CREATE INDEX IF NOT EXISTS idx_attempts_time
+            ON attempts (created_at);
+        CREATE TABLE IF NOT EXISTS error_patterns (
+            user_id TEXT NOT NULL,
+            chunk_id TEXT NOT NULL,
+            attempts INTEGER DEFAULT 0,
+            errors INTEGER DEFAULT 0,
+            last_error_at TEXT,
+            last_wrong_answer TEXT,
+            PRIMARY KEY (user_id, chunk_id)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS attempt_daily (
+            user_id TEXT NOT NULL,
+            day TEXT NOT NULL,
+            topic TEXT NOT NULL DEFAULT '',
+            attempts INTEGER DEFAULT 0,
+            correct INTEGER DEFAULT 0,
+            PRIMARY KEY (user_id, day, topic)
+        ) WITHOUT ROWID;
+
+        INSERT INTO attempts (user_id, chunk_id, learner_answer, correct, created_at)
+        SELECT user_id, chunk_id, learner_answer, correct,
+               COALESCE(timestamp, strftime('%Y-%m-%dT%H:%M:%S', 'now'))
+        FROM recent_errors ORDER BY id;
+
+        INSERT OR REPLACE INTO error_patterns
+            (user_id, chunk_id, attempts, errors, last_error_at, last_wrong_answer)
+        SELECT user_id, chunk_id, COUNT(*), SUM(1 - correct),
+               MAX(CASE WHEN correct = 0 THEN created_at END),
+               NULL
+        FROM attempts GROUP BY user_id, chunk_id;
+
+        DROP TABLE recent_errors;
+        """,
+    ),
+]
+
+
+def schema_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn: sqlite3.Connection) -> int:
+    """Apply every migration newer than the database's user_version. Returns the new version."""
+    current = schema_version(conn)
+    for version, _name, sql in MIGRATIONS:
+        if version <= current:
+            continue
+        # executescript commits first; BEGIN/COMMIT make each step atomic
+        try:
+            conn.executescript(f"BEGIN;\n{sql}\nPRAGMA user_version = {version};\nCOMMIT;")
+        except sqlite3.Error:
+            if conn.in_transaction:
+                conn.rollback()
+            raise
+        current = version
+    return current
@@ -0,0 +1,122 @@
+"""
+Dedicated, bounded inference executors with admission control.
+
+Whisper and indic-parler-tts each get their own worker threads instead of the
+event loop's default pool, so a burst of uploads cannot starve everything
+else, and each model's torch intra-op pool is sized so the two together do not
+oversubscribe the cores (torch.set_num_threads in the worker initializer
+applies to that worker's parallel regions).
+
+Work beyond workers + max_queue is refused up front with Overloaded, which
+the app turns into 503 + Retry-After. Retry-After is estimated from the queue
+depth and the observed service time.
+
+Env: ASR_TORCH_THREADS, TTS_TORCH_THREADS (default: two thirds / one third of
+the cores), ASR_MAX_QUEUE, TTS_MAX_QUEUE, TTS_WORKERS.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable
+
+_CORES = os.cpu_count() or 1
+
+ASR_TORCH_THREADS = int(os.environ.get("ASR_TORCH_THREADS", str(max(1, _CORES * 2 // 3))))
+TTS_TORCH_THREADS = int(os.environ.get("TTS_TORCH_THREADS", str(max(1, _CORES - ASR_TORCH_THREADS))))
+ASR_MAX_QUEUE = int(os.environ.get("ASR_MAX_QUEUE", "32"))
+TTS_MAX_QUEUE = int(os.environ.get("TTS_MAX_QUEUE", "8"))
+TTS_WORKERS = int(os.environ.get("TTS_WORKERS", "1"))
+
+
+class Overloaded(Exception):
+    """A model's queue is full; retry after retry_after seconds."""
+
+    def __init__(self, name: str, retry_after: int) -> None:
+        super().__init__(f"{name} is at capacity; retry in {retry_after}s")
+        self.name = name
+        self.retry_after = retry_after
+
+
+def torch_thread_initializer(threads: int) -> Callable[[], None]:
+    """Worker initializer pinning torch intra-op parallelism for that thread."""
+
+    def init() -> None:
+        try:
+            import torch
+
+            torch.set_num_threads(threads)
+        except ImportError:
+            pass
+
+    return init
+
+
+class AdmissionGate:
+    """Counts in-flight work; refuses past a limit with a Retry-After estimate."""
+
+    def __init__(self, name: str, limit: int, workers: int = 1) -> None:
+        self.name = name
+        self.limit = limit
+        self.workers = max(1, workers)
+        self.in_flight = 0
+        self.rejected = 0
+        self._service_time = 1.0  # EWMA seconds per unit of work
+        self._lock = threading.Lock()
+
+    def enter(self) -> None:
+        with self._lock:
+            if self.in_flight >= self.limit:
+                self.rejected += 1
+                raise Overloaded(self.name, self.retry_after())
+            self.in_flight += 1
+
+    def leave(self, service_time: float | None = None) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            if service_time is not None:
+                self._service_time = 0.8 * self._service_time + 0.2 * service_time
+
+    def retry_after(self) -> int:
+        return max(1, math.ceil(self.in_flight * self._service_time / self.workers))
+
+
+class BoundedExecutor:
+    """Thread pool for one model: fixed workers, bounded queue, own torch thread count."""
+
+    def __init__(self, name: str, workers: int, max_queue: int, torch_threads: int | None = None) -> None:
+        self.name = name
+        self.gate = AdmissionGate(name, workers + max_queue, workers)
+        self._pool = ThreadPoolExecutor(
+            max_workers=workers,
+            thread_name_prefix=name,
+            initializer=torch_thread_initializer(torch_threads) if torch_threads else None,
+        )
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> Future:
+        """Run fn(*args) on this executor, or raise Overloaded if the queue is full."""
+        self.gate.enter()
+
+        def timed() -> Any:
+            start = time.monotonic()
+            try:
+                return fn(*args)
+            finally:
+                self.gate.leave(time.monotonic() - start)
+
+        try:
+            return self._pool.submit(timed)
+        except RuntimeError:
+            self.gate.leave()
+            raise
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        return await asyncio.wrap_future(self.submit(fn, *args))
+
+    def shutdown(self, wait: bool = False) -> None:
+        self._pool.shutdown(wait=wait, cancel_futures=True)
@@ -4,9 +4,8 @@ FastAPI entrypoint. Run: uvicorn sabdakrida.main:app --reload
 From project root: uvicorn sabdakrida.main:app --reload
 """
 
-import os
+import json
 import sys
-import tempfile
 from pathlib import Path
 
 # Ensure project root on path for games package
@@ -14,16 +13,46 @@ _project_root = Path(__file__).resolve().parent.parent
 if str(_project_root) not in sys.path:
     sys.path.insert(0, str(_project_root))
 
-from fastapi import FastAPI, File, Form, UploadFile
+from fastapi import FastAPI, File, Form, UploadFile, WebSocket, WebSocketDisconnect
 from pydantic import BaseModel
-from fastapi.responses import Response
+from fastapi.responses import JSONResponse, Response
 
+from sabdakrida.asr.audio import AudioDecodeError
+from sabdakrida.asr.whisper_sanskrit import shutdown_asr_batcher
+from sabdakrida.assessment.longform import recitation_session
 from sabdakrida.assessment.mode1 import pronunciation_session
+from sabdakrida.assessment.streaming import StreamCapture
 from sabdakrida.data.drill_words import DRILL_WORDS
+from sabdakrida.db.connection import close_connection, init_db
 from sabdakrida.db.profile import get_drill_priority
+from sabdakrida.inference import Overloaded
+from sabdakrida.routers.uploads import MAX_RECITATION_UPLOAD_BYTES, UploadLimit, decode_upload
 from sabdakrida.tts import tts_speak
+from sabdakrida.tts.indic_parler import shutdown_tts
 
 app = FastAPI(title="Śabdakrīḍā", version="1.0")
+# Oversized uploads get 413 while streaming, before the form is parsed
+app.add_middleware(UploadLimit, limits={"/session/recitation": MAX_RECITATION_UPLOAD_BYTES})
+
+
+@app.exception_handler(Overloaded)
+async def _overloaded(request, exc: Overloaded):
+    """ASR/TTS queue full — shed load instead of queueing without limit."""
+    return JSONResponse(
+        {"error": str(exc)}, status_code=503, headers={"Retry-After": str(exc.retry_after)}
+    )
+
+
+@app.on_event("startup")
+async def _startup() -> None:
+    init_db()  # Schema migrations — once per process, before any request
+
+
+@app.on_event("shutdown")
+async def _shutdown() -> None:
+    shutdown_asr_batcher()
+    shutdown_tts()
+    close_connection()
 
 # Mount games router (Dhātu Dash, user profile)
 try:
@@ -52,17 +81,70 @@ async def mode1_session(
     user_id: str = Form(default="default"),
 ):
     """Real-time pronunciation assessment — returns JSON with base64 audio."""
-    with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as f:
-        f.write(await audio.read())
-        audio_path = f.name
+    decoded = await decode_upload(audio)
+    return await pronunciation_session(decoded, target_text, user_id)
+
+
+@app.post("/session/recitation")
+async def recitation(
+    audio: UploadFile = File(...),
+    target_text: str = Form(...),
+    user_id: str = Form(default="default"),
+):
+    """Long-form recitation (whole verse or passage) — segmented at pauses, scored per line."""
+    decoded = await decode_upload(audio, MAX_RECITATION_UPLOAD_BYTES)
+    return await recitation_session(decoded, target_text, user_id)
+
+
+@app.websocket("/session/mode1/stream")
+async def mode1_stream(
+    websocket: WebSocket,
+    target_text: str,
+    user_id: str = "default",
+    sample_rate: int = 16000,
+    encoding: str = "pcm_s16le",
+):
+    """
+    Streamed Mode 1: binary messages are raw mono PCM (encoding pcm_s16le or pcm_f32le at
+    sample_rate, 8000–48000 Hz; anything else is closed with 4400) sent while recording. Server → {"type": "speech_start"} when voice is heard,
+    {"type": "endpoint", "duration"} when the learner stops (or the client sends {"type": "end"}),
+    then {"type": "result", ...same fields as POST /session/mode1}.
+    """
+    await websocket.accept()
+    try:
+        capture = StreamCapture(sample_rate, encoding)
+    except AudioDecodeError as e:
+        await websocket.close(code=4400, reason=str(e))
+        return
     try:
-        result = await pronunciation_session(audio_path, target_text, user_id)
-        return result
-    finally:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                return
+            if message.get("bytes"):
+                was_speaking = capture.vad.in_speech
+                ended = capture.add(message["bytes"])
+                if capture.vad.in_speech and not was_speaking:
+                    await websocket.send_json({"type": "speech_start"})
+                if ended:
+                    break
+            elif message.get("text"):
+                try:
+                    control = json.loads(message["text"])
+                except ValueError:
+                    control = {}
+                if isinstance(control, dict) and control.get("type") == "end":
+                    break
+        await websocket.send_json({"type": "endpoint", "duration": round(capture.duration, 2)})
         try:
-            os.unlink(audio_path)
-        except OSError:
-            pass
+            result = await pronunciation_session(capture.audio(), target_text, user_id)
+        except Overloaded as e:
+            await websocket.send_json({"type": "error", "error": str(e), "retry_after": e.retry_after})
+        else:
+            await websocket.send_json({"type": "result", **result})
+        await websocket.close()
+    except WebSocketDisconnect:
+        pass
 
 
 @app.get("/profile/{user_id}/drills")
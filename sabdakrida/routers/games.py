@@ -1,181 +1,432 @@
 """
-Games API router — Dhātu Dash, user profile for grammar/drill games.
+Games API router — Dhātu Dash, Sandhi Forge, Kāraka Web, user profile for grammar/drill games.
 Mount at /games
 """
 
-from fastapi import APIRouter, Form
+import asyncio
+import json
+import logging
+import os
+from datetime import datetime
+
+from fastapi import APIRouter, Form, HTTPException, WebSocket, WebSocketDisconnect
 from pydantic import BaseModel
 
 router = APIRouter(prefix="/games", tags=["games"])
+logger = logging.getLogger(__name__)
 
+# Upper bound on one offline sync — larger backlogs are sent in several calls
+MAX_BATCH_RESULTS = 1000
 
-class DhatuDashEvaluateRequest(BaseModel):
-    user_id: str
-    challenge_id: str
-    prompt: str
-    correct_answer: str | list[str]
-    source_chunk_ids: list[str]
-    topic: str
-    meta: dict
-    player_input: str
+# Hours between attempt-log compactions (0 disables the background job)
+ATTEMPT_COMPACT_INTERVAL_HOURS = float(os.environ.get("ATTEMPT_COMPACT_INTERVAL_HOURS", "24"))
 
+_compaction_task: asyncio.Task | None = None
 
-def _get_engine():
-    """Lazy-load Dhātu Dash engine with optional RAG."""
-    from games import create_dhatu_dash, RAGClient, get_embed_fn_from_chutes
 
-    embed_fn = get_embed_fn_from_chutes()
-    rag = RAGClient(embed_fn=embed_fn) if embed_fn else None
-    return create_dhatu_dash(corpus=rag)
+async def _compact_attempts_periodically() -> None:
+    from games.attempts import compact_attempts
 
+    loop = asyncio.get_running_loop()
+    while True:
+        try:
+            await loop.run_in_executor(None, compact_attempts)
+        except Exception:
+            # One failed pass (e.g. a locked database) must not end the job
+            logger.exception("Attempt-log compaction failed; retrying next interval")
+        await asyncio.sleep(ATTEMPT_COMPACT_INTERVAL_HOURS * 3600)
 
-def _challenge_from_body(body: dict) -> "Challenge":
-    from games.engine.core import Challenge
 
-    ans = body.get("correct_answer")
-    if isinstance(ans, list):
-        pass
-    else:
-        ans = [ans] if ans else []
-    return Challenge(
-        challenge_id=body.get("challenge_id", ""),
-        game_type=body.get("game_type", "dhatu_dash"),
-        prompt=body.get("prompt", ""),
-        correct_answer=ans,
-        source_chunk_ids=body.get("source_chunk_ids", []),
-        topic=body.get("topic", "dhatu"),
-        meta=body.get("meta", {}),
-    )
-
-
-def _serialize_meta(meta: dict) -> dict:
-    """Serialize challenge meta for JSON (session → dict)."""
-    if not meta:
-        return {}
-    safe = {}
-    for k, v in meta.items():
-        if k == "session" and hasattr(v, "tree"):
-            safe[k] = {
-                "root_id": getattr(v, "root_id", ""),
-                "root_iast": getattr(v, "root_iast", ""),
-                "root_meaning": getattr(v, "root_meaning", ""),
-                "root_devanagari": getattr(v, "root_devanagari", ""),
-                "tree": list(getattr(v, "tree", set())),
-                "valid_forms": list(getattr(v, "valid_forms", [])),
-                "challenge_count": getattr(v, "challenge_count", 0),
-            }
-        elif k == "valid_forms":
-            safe[k] = v
-        elif k != "exhausted":
-            safe[k] = v
-    if meta.get("exhausted"):
-        safe["exhausted"] = True
-    return safe
+@router.on_event("startup")
+async def _init_engines() -> None:
+    """Build every game engine and its indexes once, off the event loop."""
+    from games import init_registry
+
+    await asyncio.get_running_loop().run_in_executor(None, init_registry)
+
+
+@router.on_event("startup")
+async def _start_compaction() -> None:
+    global _compaction_task
+    if ATTEMPT_COMPACT_INTERVAL_HOURS > 0:
+        _compaction_task = asyncio.create_task(_compact_attempts_periodically())
+
+
+@router.on_event("shutdown")
+async def _flush_profiles() -> None:
+    """Stop background jobs and write any profiles still held by the write-behind cache."""
+    from games import shutdown_profile_cache
+
+    if _compaction_task is not None:
+        _compaction_task.cancel()
+    if _prefetcher is not None:
+        _prefetcher.shutdown()
+    shutdown_profile_cache()
+
+
+class DrillResultIn(BaseModel):
+    chunk_id: str
+    correct: bool
+    topic: str = "dhatu"
+    answer: str = ""
+    timestamp: datetime | None = None
+
+
+class ResultsBatchRequest(BaseModel):
+    user_id: str = "default"
+    results: list[DrillResultIn]
+
+
+def _get_engine(game_type: str = "dhatu_dash"):
+    """Startup-built engine for game_type (see games.registry)."""
+    from games import get_registry
+
+    return get_registry().get(game_type)
+
+
+_session_store = None
+_prefetcher = None
+
+
+def _get_prefetcher():
+    """Per-user challenge queues (PREFETCH_BATCH / PREFETCH_LOW_WATERMARK / PREFETCH_MAX_AGE / PREFETCH_MAX_QUEUES)."""
+    global _prefetcher
+    if _prefetcher is None:
+        from games.prefetch import ChallengePrefetcher
+
+        _prefetcher = ChallengePrefetcher(
+            _get_engine,
+            batch_size=int(os.environ.get("PREFETCH_BATCH", "8")),
+            low_watermark=int(os.environ.get("PREFETCH_LOW_WATERMARK", "3")),
+            max_age_seconds=float(os.environ.get("PREFETCH_MAX_AGE", "600")),
+            max_queues=int(os.environ.get("PREFETCH_MAX_QUEUES", "10000")),
+        )
+    return _prefetcher
+
+
+def _get_session_store():
+    """Process-wide Dhātu Dash session store (DHATU_SESSION_MAX / DHATU_SESSION_TTL)."""
+    global _session_store
+    if _session_store is None:
+        from games.session_store import SessionStore
+
+        _session_store = SessionStore(
+            max_sessions=int(os.environ.get("DHATU_SESSION_MAX", "10000")),
+            ttl_seconds=float(os.environ.get("DHATU_SESSION_TTL", "1800")),
+        )
+    return _session_store
+
+
+def _session_view(session_id: str, session, challenge=None) -> dict:
+    """What the client sees of a session — never the valid-form list."""
+    view = {
+        "session_id": session_id,
+        "root_id": session.root_id,
+        "root_iast": session.root_iast,
+        "root_meaning": session.root_meaning,
+        "root_devanagari": session.root_devanagari,
+        "tree": sorted(session.tree),
+        "remaining": len(session.unused),
+        "challenge_count": session.challenge_count,
+    }
+    if challenge is not None:
+        view["challenge_id"] = challenge.challenge_id
+        view["game_type"] = challenge.game_type
+        view["prompt"] = challenge.prompt
+        view["topic"] = challenge.topic
+        view["exhausted"] = bool((challenge.meta or {}).get("exhausted"))
+    return view
 
 
 @router.get("/dhatu-dash")
-async def dhatu_dash_generate(user_id: str = "default"):
-    """Generate a new Dhātu Dash challenge (or first turn of a new root)."""
-    from games import create_dhatu_dash, load_profile
+async def dhatu_dash_generate(user_id: str = "default", session_id: str | None = None):
+    """
+    Start a Dhātu Dash session (new root, from the user's prefetch queue), or
+    continue one when session_id is given. The session lives server-side; the
+    client keeps only session_id.
+    """
+    from games import get_profile_cache
 
     engine = _get_engine()
-    profile = load_profile(user_id)
-    challenge = engine.generate(profile)
+    store = _get_session_store()
+    profile = get_profile_cache().get(user_id)
+
+    session = store.get(session_id, user_id) if session_id else None
+    if session_id and session is None:
+        raise HTTPException(404, "Unknown or expired session")
+    if session is None:
+        challenge = _get_prefetcher().pop("dhatu_dash", profile)
+    else:
+        challenge = engine.generate(profile, session=session)
+    if session is None:
+        session = engine.get_session_from_challenge(challenge)
+        session_id = store.create(session, user_id)
+    return _session_view(session_id, session, challenge)
 
-    safe_meta = _serialize_meta(challenge.meta or {})
 
-    return {
-        "challenge_id": challenge.challenge_id,
-        "game_type": challenge.game_type,
-        "prompt": challenge.prompt,
-        "correct_answer": challenge.correct_answer,
-        "source_chunk_ids": challenge.source_chunk_ids,
-        "topic": challenge.topic,
-        "meta": safe_meta,
-    }
+_room_manager = None
+
+
+def _get_room_manager():
+    """Process-wide multiplayer rooms (DHATU_ROUND_SECONDS / DHATU_MAX_ROOMS)."""
+    global _room_manager
+    if _room_manager is None:
+        from games import UserProfile
+        from games.multiplayer import RoomManager
+
+        engine = _get_engine()
+
+        def new_session():
+            challenge = engine.generate(UserProfile(user_id="multiplayer"))
+            return engine.get_session_from_challenge(challenge)
+
+        _room_manager = RoomManager(
+            new_session,
+            round_seconds=float(os.environ.get("DHATU_ROUND_SECONDS", "90")),
+            max_rooms=int(os.environ.get("DHATU_MAX_ROOMS", "20000")),
+            accepts=engine.accepts,  # Same forms as solo play, paradigm forms included
+        )
+    return _room_manager
+
+
+@router.websocket("/dhatu-dash/ws/{room_id}")
+async def dhatu_dash_room(websocket: WebSocket, room_id: str, user_id: str = ""):
+    """
+    Multiplayer Dhātu Dash: everyone connected to room_id races on one root.
+    user_id is required; connecting again with the same user_id takes over
+    that player and closes the older socket. See games.multiplayer for the
+    message protocol.
+    """
+    from games.multiplayer import RoomError, handle_message
+
+    await websocket.accept()
+    if not user_id:
+        await websocket.close(code=4400, reason="user_id is required")
+        return
+    send = websocket.send_json  # One bound method: Room.leave compares it by identity
+    superseded = asyncio.Event()
+
+    async def supersede() -> None:
+        superseded.set()
+        await websocket.close(code=4409, reason="Connected again from another socket")
+
+    try:
+        room = await _get_room_manager().join(room_id, user_id, send, supersede)
+    except RoomError as e:
+        await websocket.close(code=4409, reason=str(e))
+        return
+    closed = asyncio.ensure_future(room.closed.wait())
+    replaced = asyncio.ensure_future(superseded.wait())
+    try:
+        while True:
+            # Race the next frame against the room ending (or this socket being replaced)
+            receive = asyncio.ensure_future(websocket.receive_text())
+            await asyncio.wait((receive, closed, replaced), return_when=asyncio.FIRST_COMPLETED)
+            if not receive.done():
+                receive.cancel()
+                if not superseded.is_set():
+                    await websocket.close()
+                break
+            try:
+                message = json.loads(receive.result())
+            except json.JSONDecodeError:
+                message = None
+            if isinstance(message, dict):
+                await handle_message(room, user_id, message)
+            else:
+                await websocket.send_json({"type": "rejected", "reason": "message must be a JSON object"})
+    except WebSocketDisconnect:
+        pass
+    finally:
+        closed.cancel()
+        replaced.cancel()
+        # No-op if a newer connection has taken this player over
+        await room.leave(user_id, send)
 
 
 @router.post("/dhatu-dash/evaluate")
 async def dhatu_dash_evaluate(
     user_id: str = Form(default="default"),
-    challenge_id: str = Form(...),
-    prompt: str = Form(...),
-    correct_answer: str = Form(...),  # JSON array as string
-    source_chunk_ids: str = Form(default="[]"),  # JSON array
-    topic: str = Form(default="dhatu"),
-    meta: str = Form(default="{}"),  # JSON
+    session_id: str = Form(...),
     player_input: str = Form(...),
 ):
-    """Evaluate player input for Dhātu Dash. Requires full challenge state in form."""
-    import json
-    from games import create_dhatu_dash, load_profile, save_profile
+    """Evaluate player input against the server-held session for session_id."""
+    from games import get_profile_cache
 
     engine = _get_engine()
+    session = _get_session_store().get(session_id, user_id)
+    if session is None:
+        raise HTTPException(404, "Unknown or expired session")
 
-    try:
-        correct_list = json.loads(correct_answer) if correct_answer.startswith("[") else [correct_answer]
-    except Exception:
-        correct_list = [correct_answer]
+    # Guess checked against the held session (set lookups); no challenge is generated per guess
+    result = engine.evaluate_session(player_input, session)
+    with get_profile_cache().checkout(user_id) as profile:
+        engine.update_profile(profile, engine.session_challenge(session), result, player_input, save=False)
 
-    try:
-        chunk_ids = json.loads(source_chunk_ids) if isinstance(source_chunk_ids, str) else []
-    except Exception:
-        chunk_ids = []
+    return {
+        "correct": result.correct,
+        "explanation": result.explanation,
+        "feedback": result.feedback,
+        "rule_id": result.rule_id,
+        **_session_view(session_id, session),
+        "exhausted": session.is_exhausted(),
+    }
 
-    try:
-        meta_dict = json.loads(meta) if isinstance(meta, str) else {}
-    except Exception:
-        meta_dict = {}
-
-    from games.engine.core import Challenge
-
-    challenge = Challenge(
-        challenge_id=challenge_id,
-        game_type="dhatu_dash",
-        prompt=prompt,
-        correct_answer=correct_list,
-        source_chunk_ids=chunk_ids,
-        topic=topic,
-        meta=meta_dict,
-    )
-
-    # Restore session in meta for stateful evaluation
-    if "session" in meta_dict and isinstance(meta_dict["session"], dict):
-        from games.dhatu_dash import DhatuSession
-
-        s = meta_dict["session"]
-        challenge.meta["session"] = DhatuSession(
-            root_id=s.get("root_id", ""),
-            root_iast=s.get("root_iast", ""),
-            root_meaning=s.get("root_meaning", ""),
-            root_devanagari=s.get("root_devanagari", ""),
-            valid_forms=s.get("valid_forms", []),
-            tree=set(s.get("tree", [])),
-            challenge_count=s.get("challenge_count", 0),
+
+_challenge_store = None
+
+
+def _get_challenge_store():
+    """
+    Open single-turn challenges (Sandhi Forge, Kāraka Web), held server-side so answers never
+    reach the client (CHALLENGE_STORE_MAX / CHALLENGE_STORE_TTL).
+    """
+    global _challenge_store
+    if _challenge_store is None:
+        from games.session_store import SessionStore
+
+        _challenge_store = SessionStore(
+            max_sessions=int(os.environ.get("CHALLENGE_STORE_MAX", "10000")),
+            ttl_seconds=float(os.environ.get("CHALLENGE_STORE_TTL", "1800")),
         )
+    return _challenge_store
 
-    result = engine.evaluate(player_input, challenge)
-    profile = load_profile(user_id)
-    engine.update_profile(profile, challenge, result, player_input)
 
-    # Return updated meta so client can continue (session.tree updated on correct)
-    updated_meta = _serialize_meta(challenge.meta or {})
+def _open_challenge(game_type: str, user_id: str, difficulty: float | None, public: tuple[str, ...]) -> dict:
+    """Pop a prefetched challenge (or generate at an explicit difficulty), keep it server-side, return what the client may see."""
+    from games import get_profile_cache
+
+    profile = get_profile_cache().get(user_id)
+    if difficulty is None:
+        challenge = _get_prefetcher().pop(game_type, profile)
+    else:
+        challenge = _get_engine(game_type).generate(profile, difficulty=difficulty)
+    challenge_id = _get_challenge_store().create(challenge, user_id)
+    return {
+        "challenge_id": challenge_id,
+        "game_type": challenge.game_type,
+        "prompt": challenge.prompt,
+        "topic": challenge.topic,
+        **{key: challenge.meta[key] for key in public},
+    }
+
+
+def _grade_challenge(game_type: str, user_id: str, challenge_id: str, player_input: str) -> dict:
+    """Evaluate an open challenge once, update the profile, and close the challenge."""
+    from games import get_profile_cache
+
+    engine = _get_engine(game_type)
+    store = _get_challenge_store()
+    challenge = store.get(challenge_id, user_id)
+    if challenge is None or challenge.game_type != game_type:
+        raise HTTPException(404, "Unknown or expired challenge")
+    store.drop(challenge_id)
+
+    result = engine.evaluate(player_input, challenge)
+    with get_profile_cache().checkout(user_id) as profile:
+        engine.update_profile(profile, challenge, result, player_input, save=False)
 
     return {
         "correct": result.correct,
+        "answer": challenge.correct_answer,
         "explanation": result.explanation,
         "feedback": result.feedback,
         "rule_id": result.rule_id,
-        "meta": updated_meta,
     }
 
 
+@router.get("/sandhi-forge")
+async def sandhi_forge_generate(user_id: str = "default", difficulty: float | None = None):
+    """Two words for the learner to join; difficulty defaults to the profile's target."""
+    return _open_challenge("sandhi_forge", user_id, difficulty, ("left", "right", "level"))
+
+
+@router.post("/sandhi-forge/evaluate")
+async def sandhi_forge_evaluate(
+    user_id: str = Form(default="default"),
+    challenge_id: str = Form(...),
+    player_input: str = Form(...),
+):
+    """Evaluate the learner's junction for challenge_id and update their profile."""
+    return _grade_challenge("sandhi_forge", user_id, challenge_id, player_input)
+
+
+@router.get("/karaka-web")
+async def karaka_web_generate(user_id: str = "default", difficulty: float | None = None):
+    """An inflected noun whose kāraka the learner names; choices are the roles in play at this level."""
+    return _open_challenge("karaka_web", user_id, difficulty, ("form", "stem", "meaning", "level", "choices"))
+
+
+@router.post("/karaka-web/evaluate")
+async def karaka_web_evaluate(
+    user_id: str = Form(default="default"),
+    challenge_id: str = Form(...),
+    player_input: str = Form(...),
+):
+    """Grade the named kāraka (any role the form can mark) and update the profile."""
+    return _grade_challenge("karaka_web", user_id, challenge_id, player_input)
+
+
+@router.post("/results:batch")
+async def results_batch(body: ResultsBatchRequest):
+    """
+    Ingest drill results recorded offline. Applied in timestamp order with one
+    embedding lookup and one transaction, then the final profile is returned.
+    """
+    from games import DrillResult, get_profile_cache, get_registry, update_profile_batch
+
+    if len(body.results) > MAX_BATCH_RESULTS:
+        raise HTTPException(413, f"At most {MAX_BATCH_RESULTS} results per batch")
+
+    results = [
+        DrillResult(
+            chunk_id=r.chunk_id,
+            correct=r.correct,
+            topic=r.topic,
+            learner_answer=r.answer,
+            timestamp=r.timestamp,
+        )
+        for r in body.results
+        if r.chunk_id
+    ]
+    corpus = get_registry().corpus
+    embeddings = corpus.get_embeddings([r.chunk_id for r in results]) if corpus else {}
+
+    cache = get_profile_cache()
+    with cache.checkout(body.user_id) as p:
+        update_profile_batch(p, results, embeddings)
+    cache.flush()  # Offline syncs are written through, not left in the cache
+
+    return {
+        "applied": len(results),
+        "user_id": p.user_id,
+        "topic_mastery": p.topic_mastery,
+        "chapter_progress": p.chapter_progress,
+        "weak_topics": p.weak_topics(),
+        "strong_topics": p.strong_topics(),
+        "current_chapter": p.current_chapter(),
+        "avg_recent_score": p.avg_recent_score,
+    }
+
+
+@router.get("/due/{user_id}")
+async def get_due(user_id: str, k: int = 20):
+    """Review cards due now (FSRS), most overdue first."""
+    from games import get_profile_cache, next_due
+
+    get_profile_cache().flush()  # Due queue is read from SQLite
+    return {"user_id": user_id, "due": next_due(user_id, k)}
+
+
 @router.get("/profile/{user_id}")
 async def get_profile(user_id: str):
     """Get user profile (topic mastery, chapter progress, weak topics)."""
-    from games import load_profile
+    from games import get_profile_cache
+    from games.attempts import error_patterns
 
-    p = load_profile(user_id)
+    cache = get_profile_cache()
+    cache.flush()  # error_patterns is read from SQLite
+    p = cache.get(user_id)
     return {
         "user_id": p.user_id,
         "topic_mastery": p.topic_mastery,
@@ -183,4 +434,6 @@ async def get_profile(user_id: str):
         "weak_topics": p.weak_topics(),
         "strong_topics": p.strong_topics(),
         "current_chapter": p.current_chapter(),
+        "avg_recent_score": p.avg_recent_score,
+        "error_patterns": error_patterns(user_id, 5),
     }
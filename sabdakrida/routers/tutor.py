@@ -2,10 +2,10 @@
 Proactive tutor API — Navigator, Session Conductor.
 """
 
-import os
-import tempfile
 from fastapi import APIRouter, File, Form, UploadFile
 
+from sabdakrida.routers.uploads import decode_upload
+
 router = APIRouter(prefix="/tutor", tags=["tutor"])
 
 
@@ -122,17 +122,5 @@ async def session_submit(
         return {"error": "Tutor module not available"}
     from tutor.conductor import submit_session
 
-    audio_path = None
-    if audio and audio.filename:
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as f:
-            f.write(await audio.read())
-            audio_path = f.name
-        try:
-            result = submit_session(user_id, zone_id, level, user_input, audio_path)
-            return result
-        finally:
-            try:
-                os.unlink(audio_path)
-            except OSError:
-                pass
-    return submit_session(user_id, zone_id, level, user_input, None)
+    decoded = await decode_upload(audio) if audio and audio.filename else None
+    return submit_session(user_id, zone_id, level, user_input, decoded)
@@ -0,0 +1,99 @@
+"""
+Audio uploads — size-capped while streaming, decoded in memory.
+
+UploadLimit (ASGI middleware) caps multipart request bodies before the form is
+parsed: 413 from Content-Length when the client sends it, else as soon as the
+streamed body crosses the cap. Starlette then parses the form as usual (file
+parts over 1 MB are spooled to a temporary file by its multipart parser), and
+read_capped() checks the audio part itself against MAX_AUDIO_UPLOAD_BYTES.
+Decoding runs off the event loop into a DecodedAudio, with no temp file of
+its own (ffmpeg reads and writes pipes).
+"""
+
+import asyncio
+import os
+
+from fastapi import HTTPException, UploadFile
+from fastapi.responses import JSONResponse
+
+from sabdakrida.asr.audio import AudioDecodeError, DecodedAudio, decode_audio_bytes
+
+MAX_AUDIO_UPLOAD_BYTES = int(os.environ.get("MAX_AUDIO_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+MAX_RECITATION_UPLOAD_BYTES = int(os.environ.get("MAX_RECITATION_UPLOAD_BYTES", str(50 * 1024 * 1024)))
+READ_CHUNK_BYTES = 64 * 1024
+# Multipart framing and the small form fields sent alongside the audio part
+FORM_OVERHEAD_BYTES = 64 * 1024
+
+
+class UploadLimit:
+    """
+    ASGI middleware: 413 for a multipart body over its path's cap (limits, else default)
+    plus FORM_OVERHEAD_BYTES, before the route parses the form.
+    """
+
+    def __init__(self, app, limits: dict[str, int] | None = None, default: int = MAX_AUDIO_UPLOAD_BYTES) -> None:
+        self.app = app
+        self.limits = limits or {}
+        self.default = default
+
+    async def __call__(self, scope, receive, send) -> None:
+        headers = dict(scope.get("headers") or ()) if scope["type"] == "http" else {}
+        if not headers.get(b"content-type", b"").startswith(b"multipart/form-data"):
+            await self.app(scope, receive, send)
+            return
+        cap = self.limits.get(scope["path"], self.default)
+        limit = cap + FORM_OVERHEAD_BYTES
+        too_large = JSONResponse({"detail": f"Audio upload larger than {cap} bytes"}, status_code=413)
+        length = headers.get(b"content-length", b"")
+        if length.isdigit() and int(length) > limit:
+            await too_large(scope, receive, send)
+            return
+
+        received = 0
+        rejected = False
+
+        async def capped_receive():
+            nonlocal received, rejected
+            if rejected:
+                return {"type": "http.disconnect"}
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    # Answer now; the route sees a disconnected client and its response is dropped
+                    rejected = True
+                    await too_large(scope, receive, send)
+                    return {"type": "http.disconnect"}
+            return message
+
+        async def guarded_send(message) -> None:
+            if not rejected:
+                await send(message)
+
+        try:
+            await self.app(scope, capped_receive, guarded_send)
+        except Exception:
+            if not rejected:
+                raise
+
+
+async def read_capped(upload: UploadFile, max_bytes: int = MAX_AUDIO_UPLOAD_BYTES) -> bytes:
+    """Upload body, or 413 once it exceeds max_bytes (the exact check on the audio part; see UploadLimit)."""
+    too_large = HTTPException(413, f"Audio upload larger than {max_bytes} bytes")
+    if upload.size is not None and upload.size > max_bytes:
+        raise too_large
+    buf = bytearray()
+    while chunk := await upload.read(READ_CHUNK_BYTES):
+        buf += chunk
+        if len(buf) > max_bytes:
+            raise too_large
+    return bytes(buf)
+
+
+async def decode_upload(upload: UploadFile, max_bytes: int = MAX_AUDIO_UPLOAD_BYTES) -> DecodedAudio:
+    """Read (capped) and decode an audio upload; 415 if no decoder understands it."""
+    data = await read_capped(upload, max_bytes)
+    try:
+        return await asyncio.get_event_loop().run_in_executor(None, decode_audio_bytes, data)
+    except AudioDecodeError as e:
+        raise HTTPException(415, f"Could not decode audio: {e}") from e
@@ -0,0 +1,69 @@
+"""
+MicroBatcher — concurrent submissions share one batch call, results fan back out.
+"""
+import asyncio
+import sys
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+import pytest
+
+from sabdakrida.asr.batcher import MicroBatcher
+
+
+def test_concurrent_submissions_are_batched_in_order():
+    calls = []
+    gate = threading.Event()
+
+    def run(items, key):
+        gate.wait()
+        calls.append((key, list(items)))
+        return [f"{key}:{i}" for i in items]
+
+    batcher = MicroBatcher(run, max_batch=4, max_wait_ms=50)
+    try:
+        first = batcher.submit(0, "sa")
+        futures = [batcher.submit(i, "sa") for i in range(1, 6)]  # Within the 50 ms window
+        gate.set()
+        assert first.result(timeout=5) == "sa:0"
+        assert [f.result(timeout=5) for f in futures] == [f"sa:{i}" for i in range(1, 6)]
+        # One call per max_batch items; the rest ran once the model was free
+        assert [items for _, items in calls] == [[0, 1, 2, 3], [4, 5]]
+        assert batcher.items == 6
+    finally:
+        batcher.shutdown()
+
+
+def test_keys_are_batched_separately_and_errors_reach_every_caller():
+    def run(items, key):
+        if key == "bad":
+            raise ValueError("decode failed")
+        return [key] * len(items)
+
+    batcher = MicroBatcher(run, max_batch=8, max_wait_ms=20)
+    try:
+        futures = [batcher.submit(i, key) for i, key in enumerate(["sa", "hi", "bad", "sa"])]
+        assert futures[0].result(timeout=5) == "sa" and futures[1].result(timeout=5) == "hi"
+        assert futures[3].result(timeout=5) == "sa"
+        with pytest.raises(ValueError):
+            futures[2].result(timeout=5)
+    finally:
+        batcher.shutdown()
+
+
+def test_awaitable_from_any_event_loop():
+    batcher = MicroBatcher(lambda items, key: [i * 2 for i in items], max_wait_ms=5)
+
+    async def many():
+        return await asyncio.gather(*(asyncio.wrap_future(batcher.submit(i)) for i in range(10)))
+
+    try:
+        assert asyncio.run(many()) == [i * 2 for i in range(10)]
+        assert asyncio.run(many()) == [i * 2 for i in range(10)]  # A second loop
+        assert batcher.batches < 20
+    finally:
+        batcher.shutdown()
+    with pytest.raises(RuntimeError):
+        batcher.submit(1)
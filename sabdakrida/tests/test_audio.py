@@ -0,0 +1,144 @@
+"""
+DecodedAudio — one decode per pronunciation request, shared by every stage.
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+from sabdakrida.asr import audio as audio_mod
+from sabdakrida.asr.audio import DecodedAudio, decode_audio
+from sabdakrida.assessment import acoustic, mode1
+from sabdakrida.db import connection
+
+
+@pytest.fixture(autouse=True)
+def db_path(tmp_path):
+    path = tmp_path / "audio.db"
+    connection.set_db_path(path)
+    yield path
+    connection.close_connection()
+    connection.set_db_path(None)
+
+
+@pytest.fixture
+def clip(tmp_path):
+    """0.5 s of 220 Hz tone at 44.1 kHz — decode must resample to 16 kHz."""
+    sr = 44100
+    t = np.arange(int(sr * 0.5)) / sr
+    path = tmp_path / "clip.wav"
+    sf.write(path, 0.2 * np.sin(2 * np.pi * 220 * t), sr)
+    return str(path)
+
+
+def test_decode_resamples_and_summarises(clip):
+    decoded = decode_audio(clip)
+    assert decoded.sr == 16000
+    assert decoded.samples.dtype == np.float32
+    assert decoded.duration == pytest.approx(0.5, abs=0.01)
+    assert decoded.rms == pytest.approx(0.2 / np.sqrt(2), rel=0.05)
+    mel = decoded.mel()
+    assert mel.shape[0] == 80 and decoded.mel() is mel
+
+
+def test_acoustic_analysis_accepts_decoded_audio(clip):
+    decoded = decode_audio(clip)
+    assert acoustic.analyze_audio(decoded, 2.0) == acoustic.analyze_audio(clip, 2.0)
+    silent = DecodedAudio(np.zeros(1600, dtype=np.float32))
+    assert acoustic.analyze_audio(silent)["rms_energy"] == 0
+
+
+def test_pronunciation_session_decodes_once(clip, monkeypatch):
+    loads = []
+    real_decode = audio_mod.decode_audio
+    monkeypatch.setattr(mode1, "decode_audio", lambda p: loads.append(p) or real_decode(p))
+    monkeypatch.setattr(audio_mod, "decode_audio", lambda p: loads.append(p) or real_decode(p))
+
+    async def fake_transcribe(audio, language="sa", target_text=None):
+        assert isinstance(audio, DecodedAudio) and target_text == "rāmaḥ"
+        return "xyz"
+
+    monkeypatch.setattr(mode1, "whisper_transcribe", fake_transcribe)
+    # Unmatched errors take the acoustic fallback path, the third former decode
+    result = asyncio.run(mode1.pronunciation_session(clip, "rāmaḥ", "audio-test"))
+    assert result["heard"] == "xyz"
+    assert loads == [clip]
+
+
+def test_decode_bytes_matches_file_decode(clip):
+    from_bytes = decode_audio(Path(clip).read_bytes())
+    from_file = decode_audio(clip)
+    assert from_bytes.sr == from_file.sr
+    assert len(from_bytes.samples) == len(from_file.samples)
+    assert np.allclose(from_bytes.samples, from_file.samples, atol=1e-4)
+
+
+def test_upload_cap_and_undecodable_upload(clip):
+    from fastapi import FastAPI, File, UploadFile
+    from fastapi.testclient import TestClient
+
+    from sabdakrida.routers.uploads import decode_upload
+
+    app = FastAPI()
+
+    @app.post("/clip")
+    async def upload(audio: UploadFile = File(...)):
+        decoded = await decode_upload(audio, max_bytes=100_000)
+        return {"duration": round(decoded.duration, 2)}
+
+    client = TestClient(app)
+    data = Path(clip).read_bytes()  # ~44 KB of 16-bit PCM
+    assert client.post("/clip", files={"audio": ("a.wav", data)}).json() == {"duration": 0.5}
+    assert client.post("/clip", files={"audio": ("a.wav", data * 3)}).status_code == 413
+    assert client.post("/clip", files={"audio": ("a.wav", b"")}).status_code == 415
+
+
+def test_ffmpeg_timeout_is_a_decode_error(monkeypatch):
+    import subprocess
+
+    def hang(cmd, **kwargs):
+        raise subprocess.TimeoutExpired(cmd, kwargs["timeout"])
+
+    monkeypatch.setattr(audio_mod.shutil, "which", lambda name: "/usr/bin/ffmpeg")
+    monkeypatch.setattr(audio_mod.subprocess, "run", hang)
+    with pytest.raises(audio_mod.AudioDecodeError, match="did not decode"):
+        audio_mod.decode_audio_bytes(b"\x1aE\xdf\xa3 not really webm")
+
+
+def test_upload_limit_rejects_before_the_form_is_parsed():
+    from fastapi import FastAPI, File, UploadFile
+    from fastapi.testclient import TestClient
+
+    from sabdakrida.routers.uploads import FORM_OVERHEAD_BYTES, UploadLimit
+
+    parsed = []
+    app = FastAPI()
+    app.add_middleware(UploadLimit, limits={"/clip": 100_000})
+
+    @app.post("/clip")
+    async def upload(audio: UploadFile = File(...)):
+        parsed.append(audio.filename)
+        return {"size": len(await audio.read())}
+
+    client = TestClient(app)
+    assert client.post("/clip", files={"audio": ("a.wav", b"x" * 1000)}).json() == {"size": 1000}
+    big = b"x" * (100_000 + FORM_OVERHEAD_BYTES + 1)
+    # Content-Length known: refused up front
+    assert client.post("/clip", files={"audio": ("a.wav", big)}).status_code == 413
+    # Chunked body without Content-Length: refused once the stream crosses the cap
+    boundary = "capboundary"
+    body = (
+        f'--{boundary}\r\nContent-Disposition: form-data; name="audio"; filename="a.wav"\r\n\r\n'.encode()
+        + big + f"\r\n--{boundary}--\r\n".encode()
+    )
+    chunks = (body[i:i + 65536] for i in range(0, len(body), 65536))
+    response = client.post(
+        "/clip", content=chunks, headers={"content-type": f"multipart/form-data; boundary={boundary}"}
+    )
+    assert response.status_code == 413
+    assert parsed == ["a.wav"]
@@ -0,0 +1,60 @@
+"""
+Cohort clustering of weakness centroids.
+"""
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+import numpy as np
+
+from games import cohorts
+from sabdakrida.db import connection
+
+
+def _blobs(rng, n_per=200, k=4, dims=64):
+    centers = rng.normal(size=(k, dims))
+    x = np.concatenate([c + 0.05 * rng.normal(size=(n_per, dims)) for c in centers])
+    return x, np.repeat(np.arange(k), n_per)
+
+
+def test_minibatch_kmeans_recovers_blobs():
+    rng = np.random.default_rng(1)
+    x, truth = _blobs(rng)
+    _, labels = cohorts.minibatch_kmeans(x, 4, batch_size=256, n_iter=50)
+    # Every true blob maps to exactly one cluster
+    for j in range(4):
+        assert len(set(labels[truth == j])) == 1
+    assert len(set(labels)) == 4
+
+
+class _Corpus:
+    def query_by_embedding(self, embedding, n=20, topic_filter=None):
+        return [{"id": "chunk-sandhi", "text": "sandhi rule", "meta": {}}]
+
+
+def test_job_writes_summary(tmp_path):
+    connection.set_db_path(tmp_path / "cohorts.db")
+    try:
+        rng = np.random.default_rng(2)
+        x, _ = _blobs(rng, n_per=30, k=3, dims=cohorts.EMBED_DIMS)
+        conn = connection.get_connection()
+        conn.executemany(
+            "INSERT INTO user_profiles (user_id, weakness_centroid) VALUES (?, ?)",
+            [(f"u{i}", json.dumps(v.tolist())) for i, v in enumerate(x)]
+            + [("fresh", json.dumps([0.0] * cohorts.EMBED_DIMS))],
+        )
+        conn.commit()
+
+        summary = cohorts.run_cohort_job(k=3, corpus=_Corpus())
+        assert summary["n_profiles"] == 90
+        rows = conn.execute(
+            "SELECT size, label_chunk_ids FROM cohort_clusters WHERE run_id = ?",
+            (summary["run_id"],),
+        ).fetchall()
+        assert sorted(r["size"] for r in rows) == [30, 30, 30]
+        assert json.loads(rows[0]["label_chunk_ids"]) == ["chunk-sandhi"]
+    finally:
+        connection.close_connection()
+        connection.set_db_path(None)
@@ -0,0 +1,69 @@
+"""
+Target-aware bounded decoding — token budget, repetition stop, generate() kwargs.
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+import numpy as np
+import torch
+
+from sabdakrida.asr import whisper_sanskrit
+from sabdakrida.asr.audio import DecodedAudio
+from sabdakrida.asr.decoding import MAX_NEW_TOKENS, RepetitionStop, to_devanagari, token_budget
+
+
+class _Tokenizer:
+    def __call__(self, text, add_special_tokens=True):
+        return type("Enc", (), {"input_ids": list(text)})()
+
+
+def test_budget_scales_with_target_and_is_capped():
+    tok = _Tokenizer()
+    assert to_devanagari("kāla") == "काल"
+    assert token_budget(tok, "kāla") < token_budget(tok, "saṃskṛtam bhāṣā")
+    assert token_budget(tok, None) == MAX_NEW_TOKENS
+    assert token_budget(tok, "a" * 1000) == MAX_NEW_TOKENS
+
+
+def test_repetition_stop_flags_only_looping_rows():
+    stop = RepetitionStop(repeats=4, max_ngram=2)
+    ids = torch.tensor([
+        [1, 2, 3, 9, 9, 9, 9, 9],  # one token x5
+        [1, 2, 5, 6, 5, 6, 5, 6],  # bigram x3 only
+        [5, 6, 5, 6, 5, 6, 5, 6],  # bigram x4
+    ])
+    assert stop(ids, None).tolist() == [True, False, True]
+
+
+def test_target_bounds_generate(monkeypatch):
+    seen = {}
+
+    class Processor:
+        tokenizer = _Tokenizer()
+
+        def __call__(self, audio, sampling_rate, return_tensors):
+            return type("Features", (dict,), {"to": lambda self, d: self})({"input_features": torch.zeros(len(audio), 80, 10)})
+
+        def get_prompt_ids(self, text):
+            return np.array([7, 8])
+
+        def batch_decode(self, ids, skip_special_tokens=True):
+            return ["x"] * len(ids)
+
+    class Model:
+        device = torch.device("cpu")
+
+        def generate(self, features, **kwargs):
+            seen.update(kwargs)
+            return torch.zeros(features.shape[0], 3, dtype=torch.long)
+
+    monkeypatch.setattr(whisper_sanskrit, "_load_whisper", lambda: (Processor(), Model()))
+    clip = DecodedAudio(np.zeros(1600, dtype=np.float32))
+
+    whisper_sanskrit._transcribe_sync(clip)
+    assert "max_new_tokens" not in seen
+    whisper_sanskrit._transcribe_sync(clip, target_text="kāla", prompt=True)
+    assert seen["max_new_tokens"] == token_budget(_Tokenizer(), "kāla")
+    assert seen["prompt_ids"].tolist() == [7, 8]
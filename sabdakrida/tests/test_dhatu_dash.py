@@ -0,0 +1,120 @@
+"""
+Dhātu Dash — form index and O(1) evaluation.
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+import pytest
+
+from games.dhatu_dash import DhatuDashEngine, DhatuSession, _build_index
+from games.user_profile import UserProfile
+
+DHATUS = [
+    {
+        "id": "dhatu-gam",
+        "iast": "gam",
+        "derivesTo": ["gacchati", "agata"],
+        "derivedForms": [
+            {"form": "gacchati", "suffix": "-ti", "meaning": "goes"},
+            {"form": "Āgata", "suffix": "-ta", "meaning": "come"},
+        ],
+    },
+    {"id": "dhatu-bhu", "iast": "bhū", "derivedForms": [{"form": "bhavati"}]},
+]
+
+
+def _engine() -> DhatuDashEngine:
+    engine = DhatuDashEngine.__new__(DhatuDashEngine)
+    engine._dhatus = DHATUS
+    engine._index = _build_index(DHATUS)
+    engine._paradigms = None
+    engine.corpus = engine.tts = None
+    return engine
+
+
+def test_index_normalizes_and_dedupes_forms():
+    index = _build_index(DHATUS)
+    assert index.valid_forms["dhatu-gam"] == ["gam", "gacchati", "āgata", "agata"]
+    assert index.form_info("dhatu-gam", "āgata")["meaning"] == "come"
+    assert index.roots_for("bhavati") == ["dhatu-bhu"]
+
+
+def test_evaluate_moves_form_from_unused_to_tree():
+    engine = _engine()
+    session = DhatuSession(
+        root_id="dhatu-gam", root_iast="gam", root_meaning="go", root_devanagari="",
+        valid_forms=engine._index.valid_forms["dhatu-gam"], tree={"gam"},
+    )
+    assert session.unused == {"gacchati", "āgata", "agata"}
+    challenge = engine.generate(UserProfile(user_id="u"), 0.5, session=session)
+
+    result = engine.evaluate("  Gacchati ", challenge)
+    assert result.correct and "goes" in result.explanation
+    assert "gacchati" in session.tree and "gacchati" not in session.unused
+    assert engine.evaluate("gacchati", challenge).rule_id == "dhatu_repeat"
+    assert engine.evaluate("bhavati", challenge).rule_id == "dhatu_other_root"
+    assert engine.evaluate("xyz", challenge).rule_id == "dhatu_invalid"
+
+    engine.evaluate("āgata", challenge)
+    engine.evaluate("agata", challenge)
+    assert session.is_exhausted()
+
+
+def test_evaluate_endpoint_checks_the_held_session(monkeypatch, tmp_path):
+    import games
+    from games.profile_cache import ProfileCache
+    from games.session_store import SessionStore
+    from sabdakrida.db import connection
+    from sabdakrida.routers import games as games_router
+
+    connection.set_db_path(tmp_path / "dash.db")
+    engine = _engine()
+    monkeypatch.setattr(engine, "generate", lambda *a, **k: pytest.fail("challenge generated per guess"))
+    monkeypatch.setattr(games_router, "_get_engine", lambda game_type="dhatu_dash": engine)
+    monkeypatch.setattr(games_router, "_session_store", SessionStore())
+    cache = ProfileCache()
+    monkeypatch.setattr(games, "get_profile_cache", lambda: cache)
+    session = engine._new_session(DHATUS[0])
+    session_id = games_router._session_store.create(session, "u")
+    try:
+        body = asyncio.run(games_router.dhatu_dash_evaluate("u", session_id, "gacchati"))
+        assert body["correct"] and body["rule_id"] == "dhatu_valid"
+        assert body["remaining"] == 2 and "gacchati" in body["tree"]
+        with cache.checkout("u") as profile:
+            assert "dhatu_dhatu-gam" in profile.chunk_states
+    finally:
+        cache.stop()
+        connection.close_connection()
+        connection.set_db_path(None)
+
+
+def test_root_ranker_targets_weakness_and_caches():
+    import numpy as np
+
+    from games.dhatu_dash import RootRanker
+
+    rng = np.random.default_rng(0)
+    n, dims = 2000, 64
+    dhatus = [{"id": f"r{i}", "iast": f"r{i}", "derivedForms": []} for i in range(n)]
+    vecs = rng.standard_normal((n, dims)).astype(np.float32)
+    ranker = RootRanker(
+        _build_index(dhatus), {f"dhatu_r{i}": vecs[i].tolist() for i in range(n)}, dims=dims
+    )
+    profile = UserProfile(user_id="u")
+    profile.weakness_centroid = vecs[42].tolist()
+    profile.strength_centroid = [0.0] * dims
+
+    order = ranker.ranking(profile, 0.5)
+    assert ranker.root_ids[order[0]] == "r42"
+    assert ranker.ranking(profile, 0.5) is order  # cached
+
+    before = ranker.scores(profile, 0.5)
+    profile.chunk_states["dhatu_r7"] = {"due": "2000-01-01T00:00:00"}
+    profile.chunk_states["dhatu_r42"] = {"due": "2999-01-01T00:00:00"}
+    profile.bump_version()
+    after = ranker.scores(profile, 0.5)
+    assert after[7] > before[7] and after[42] < before[42]  # Overdue up, just reviewed down
+    assert ranker.ranking(profile, 0.5) is not order
@@ -0,0 +1,58 @@
+"""
+FSRS scheduling and the indexed due queue.
+"""
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+import pytest
+
+from games import fsrs
+from games import user_profile as up
+from sabdakrida.db import connection
+
+T0 = datetime(2025, 1, 1, 12, 0, 0)
+
+
+def test_first_review_uses_initial_weights():
+    card = fsrs.review(fsrs.new_card(), fsrs.GOOD, T0)
+    assert card["stability"] == pytest.approx(fsrs.DEFAULT_WEIGHTS[2])
+    assert card["reps"] == 1
+    assert datetime.fromisoformat(card["due"]) > T0
+
+
+def test_success_grows_stability_and_lapse_shrinks_it():
+    card = fsrs.review(fsrs.new_card(), fsrs.GOOD, T0)
+    s1 = card["stability"]
+    fsrs.review(card, fsrs.GOOD, datetime.fromisoformat(card["due"]))
+    assert card["stability"] > s1
+    s2 = card["stability"]
+    fsrs.review(card, fsrs.AGAIN, datetime.fromisoformat(card["due"]))
+    assert card["stability"] < s2
+    assert card["lapses"] == 1
+
+
+def test_retention_at_interval_matches_request():
+    s = 7.0
+    assert fsrs.retrievability(fsrs.next_interval(s), s) == pytest.approx(0.9)
+    # FSRS v4 curve, as in ts-fsrs 2.x: R = 1 / (1 + t / 9S)
+    assert fsrs.retrievability(9 * s, s) == pytest.approx(0.5)
+
+
+def test_next_due_orders_by_due(tmp_path):
+    connection.set_db_path(tmp_path / "fsrs.db")
+    try:
+        p = up.load_profile("u1")
+        up.update_profile(p, "wrong", [], correct=False, now=T0)
+        up.update_profile(p, "right", [], correct=True, now=T0)
+        up.save_profile(p)
+
+        assert up.next_due("u1", 10, now=T0) == []
+        due = up.next_due("u1", 10, now=T0 + timedelta(days=30))
+        assert [c["chunk_id"] for c in due] == ["wrong", "right"]
+        assert len(up.next_due("u1", 1, now=T0 + timedelta(days=30))) == 1
+    finally:
+        connection.close_connection()
+        connection.set_db_path(None)
@@ -0,0 +1,74 @@
+"""
+Bounded inference executors — admission control and 503 + Retry-After.
+"""
+import io
+import sys
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+from sabdakrida.asr.batcher import MicroBatcher
+from sabdakrida.inference import AdmissionGate, BoundedExecutor, Overloaded
+
+
+def test_executor_refuses_past_workers_plus_queue():
+    release = threading.Event()
+    executor = BoundedExecutor("test", workers=1, max_queue=2)
+    try:
+        futures = [executor.submit(release.wait) for _ in range(3)]  # 1 running + 2 queued
+        with pytest.raises(Overloaded) as exc:
+            executor.submit(release.wait)
+        assert exc.value.retry_after >= 1 and executor.gate.rejected == 1
+        release.set()
+        assert all(f.result(timeout=5) for f in futures)
+        executor.submit(lambda: None).result(timeout=5)  # Capacity is back
+        assert executor.gate.in_flight == 0
+    finally:
+        executor.shutdown()
+
+
+def test_executor_pins_torch_threads_per_worker():
+    torch = pytest.importorskip("torch")
+    executor = BoundedExecutor("torch", workers=1, max_queue=1, torch_threads=1)
+    try:
+        assert executor.submit(torch.get_num_threads).result(timeout=5) == 1
+    finally:
+        executor.shutdown()
+
+
+def test_batcher_gate_limits_waiting_clips():
+    release = threading.Event()
+    gate = AdmissionGate("asr", limit=2)
+    batcher = MicroBatcher(lambda items, key: [release.wait() for _ in items], max_batch=1, gate=gate)
+    try:
+        futures = [batcher.submit(i) for i in range(2)]
+        with pytest.raises(Overloaded):
+            batcher.submit(2)
+        release.set()
+        assert all(f.result(timeout=5) for f in futures)
+        assert gate.in_flight == 0
+    finally:
+        batcher.shutdown()
+
+
+def test_mode1_answers_503_with_retry_after(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    from sabdakrida import main
+
+    async def saturated(audio, target_text, user_id):
+        raise Overloaded("asr", 7)
+
+    monkeypatch.setattr(main, "pronunciation_session", saturated)
+    buf = io.BytesIO()
+    sf.write(buf, np.zeros(1600, dtype=np.float32), 16000, format="WAV")
+    response = TestClient(main.app).post(
+        "/session/mode1", files={"audio": ("a.wav", buf.getvalue())}, data={"target_text": "rāma"}
+    )
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "7"
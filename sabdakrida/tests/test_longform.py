@@ -0,0 +1,127 @@
+"""
+Long-form recitation — silence segmentation, batched segment ASR, per-line scores.
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+import numpy as np
+import pytest
+
+from sabdakrida.asr.audio import DecodedAudio
+from sabdakrida.asr.vad import split_on_silence
+from sabdakrida.assessment import longform
+from sabdakrida.db import connection, get_recent_scores
+from sabdakrida.inference import Overloaded
+
+SR = 16000
+VERSE = "dharmakṣetre kurukṣetre\nsamavetā yuyutsavaḥ ।\nmāmakāḥ pāṇḍavāś caiva\nkim akurvata sañjaya ॥ 1 ॥"
+
+
+@pytest.fixture(autouse=True)
+def db_path(tmp_path):
+    path = tmp_path / "longform.db"
+    connection.set_db_path(path)
+    yield path
+    connection.close_connection()
+    connection.set_db_path(None)
+
+
+def _recitation(bursts, pause=0.6, sr=SR):
+    """Tone bursts of the given lengths (s) separated by pauses, over low noise."""
+    rng = np.random.default_rng(0)
+    parts, bounds, pos = [np.zeros(int(0.3 * sr))], [], int(0.3 * sr)
+    for seconds in bursts:
+        n = int(seconds * sr)
+        parts.append(0.3 * np.sin(2 * np.pi * 200 * np.arange(n) / sr))
+        bounds.append((pos, pos + n))
+        parts.append(np.zeros(int(pause * sr)))
+        pos += n + int(pause * sr)
+    audio = np.concatenate(parts)
+    return (audio + 0.002 * rng.standard_normal(len(audio))).astype(np.float32), bounds
+
+
+def test_split_on_silence_finds_each_burst():
+    audio, bounds = _recitation([1.2, 0.9, 1.5, 1.0])
+    spans = split_on_silence(audio, SR)
+    assert len(spans) == len(bounds)
+    for (s, e), (bs, be) in zip(spans, bounds):
+        assert s <= bs and e >= be and (bs - s) < 0.2 * SR and (e - be) < 0.2 * SR
+
+
+def test_split_on_silence_keeps_short_pauses_and_caps_length():
+    audio, _ = _recitation([1.0, 1.0], pause=0.15)
+    assert len(split_on_silence(audio, SR)) == 1  # Breath inside a pāda is not a cut
+    audio, _ = _recitation([12.0])
+    spans = split_on_silence(audio, SR, max_segment_s=5.0)
+    assert len(spans) >= 3 and all(e - s <= 5.5 * SR for s, e in spans)
+
+
+def test_split_lines_strips_dandas_and_verse_numbers():
+    assert longform.split_lines(VERSE) == [
+        "dharmakṣetre kurukṣetre", "samavetā yuyutsavaḥ", "māmakāḥ pāṇḍavāś caiva", "kim akurvata sañjaya",
+    ]
+    assert longform.split_lines("rāmo rājamaṇiḥ | sadā vijayate ||") == ["rāmo rājamaṇiḥ", "sadā vijayate"]
+
+
+def test_align_lines_across_segment_boundaries():
+    lines = ["dharmakṣetre kurukṣetre", "samavetā yuyutsavaḥ"]
+    # One pause missed (segment 0 covers line 0 and half of line 1), one extra pause inside line 1
+    heard = ["dharmakṣetre kurukṣetre samavetā", "yuyutsava"]
+    aligned = longform.align_lines(lines, heard)
+    assert aligned[0] == ("dharmakṣetre kurukṣetre", [0])
+    assert aligned[1] == ("samavetā yuyutsava", [0, 1])
+
+
+def test_recitation_session_scores_each_line(monkeypatch):
+    audio, bounds = _recitation([1.2, 1.0, 1.2, 1.0])
+    heard = ["dharmakṣetre kurukṣetre", "samavetā yuyutsavaḥ", "mamakāḥ pāṇḍavāś caiva", "kim akurvata sañjaya"]
+    calls = []
+
+    async def fake_transcribe(clip, language="sa", target_text=None, prompt=None):
+        index = len(calls)  # gather() starts the segments in order
+        calls.append(clip.duration)
+        await asyncio.sleep(0)
+        return heard[index]
+
+    monkeypatch.setattr(longform, "whisper_transcribe", fake_transcribe)
+    result = asyncio.run(longform.recitation_session(DecodedAudio(audio), VERSE, "reciter"))
+
+    assert len(calls) == 4 and max(calls) < 1.5
+    scores = [line["score"] for line in result["lines"]]
+    assert scores[:2] == [1.0, 1.0] and scores[3] == 1.0 and scores[2] < 1.0
+    assert ("ā", "a") in result["lines"][2]["errors"] and result["lines"][2]["segments"] == [2]
+    assert result["lines"][0]["start"] == pytest.approx(bounds[0][0] / SR, abs=0.15)
+    assert result["duration"] == pytest.approx(len(audio) / SR, abs=0.01)
+    assert 0.9 < result["score"] < 1.0 and not result["correct"]
+    # One score per line, keyed by the line's text
+    assert sorted(s["target"] for s in get_recent_scores("reciter")) == sorted(longform.split_lines(VERSE))
+
+
+def test_segments_are_submitted_one_batch_at_a_time(monkeypatch):
+    in_flight, peak, done = [0], [0], []
+
+    async def fake_transcribe(clip, language="sa", target_text=None, prompt=None):
+        in_flight[0] += 1
+        peak[0] = max(peak[0], in_flight[0])
+        await asyncio.sleep(0.01)
+        in_flight[0] -= 1
+        done.append(clip)
+        if clip.duration > 1.0:
+            raise Overloaded("asr", 1)
+        return "x"
+
+    monkeypatch.setattr(longform, "whisper_transcribe", fake_transcribe)
+    monkeypatch.setattr(longform, "WHISPER_BATCH_SIZE", 3)
+    clips = [DecodedAudio(np.zeros(SR // 2, dtype=np.float32)) for _ in range(7)]
+    assert asyncio.run(longform.transcribe_segments(clips)) == ["x"] * 7
+    assert peak[0] == 3
+
+    # A refusal surfaces only after the rest of its wave has finished, and later waves are not started
+    clips[4] = DecodedAudio(np.zeros(2 * SR, dtype=np.float32))
+    done.clear()
+    with pytest.raises(Overloaded):
+        asyncio.run(longform.transcribe_segments(clips))
+    assert len(done) == 6 and in_flight[0] == 0
@@ -0,0 +1,193 @@
+"""
+Multiplayer Dhātu Dash — shared room, broadcasts, server clock.
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+from games.dhatu_dash import DhatuSession
+from games.multiplayer import RoomManager, handle_message
+
+
+def _session() -> DhatuSession:
+    return DhatuSession(
+        root_id="dhatu-gam", root_iast="gam", root_meaning="go", root_devanagari="",
+        valid_forms=["gam", "gacchati", "gata"], tree={"gam"},
+    )
+
+
+def _inbox():
+    messages: list[dict] = []
+
+    async def send(msg: dict) -> None:
+        messages.append(msg)
+
+    return messages, send
+
+
+def test_race_to_exhaust_root():
+    async def play():
+        manager = RoomManager(_session, round_seconds=60)
+        a_msgs, a_send = _inbox()
+        b_msgs, b_send = _inbox()
+        room = await manager.join("r1", "a", a_send)
+        assert not room.started
+        await manager.join("r1", "b", b_send)
+        assert room.started and b_msgs[-1]["type"] == "start"
+
+        await handle_message(room, "a", {"type": "move", "form": "Gacchati"})
+        assert b_msgs[-1]["type"] == "move" and b_msgs[-1]["player_id"] == "a"
+        await handle_message(room, "b", {"type": "move", "form": "gacchati"})
+        assert b_msgs[-1] == {"type": "rejected", "form": "gacchati", "reason": "repeat"}
+        await handle_message(room, "b", {"type": "move", "form": "gata"})
+
+        assert a_msgs[-1]["type"] == "end" and a_msgs[-1]["reason"] == "exhausted"
+        assert a_msgs[-1]["scores"] == {"a": 1, "b": 1}
+        assert room.finished and len(manager) == 0
+
+    asyncio.run(play())
+
+
+def test_server_clock_ends_round():
+    async def play():
+        manager = RoomManager(_session, round_seconds=0.05, min_players=1)
+        msgs, send = _inbox()
+        room = await manager.join("r2", "solo", send)
+        await handle_message(room, "solo", {"type": "move", "form": "gata"})
+        await asyncio.sleep(0.1)
+        assert msgs[-1]["type"] == "end" and msgs[-1]["reason"] == "timeout"
+        assert msgs[-1]["winners"] == ["solo"]
+        assert len(manager) == 0
+
+    asyncio.run(play())
+
+
+def test_socket_rejects_malformed_frames_and_closes_with_the_room(monkeypatch):
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from sabdakrida.routers import games as games_router
+
+    monkeypatch.setattr(games_router, "_room_manager", RoomManager(_session, round_seconds=0.2, min_players=1))
+    app = FastAPI()
+    app.include_router(games_router.router)
+    with TestClient(app).websocket_connect("/games/dhatu-dash/ws/r3?user_id=solo") as ws:
+        assert ws.receive_json()["type"] == "state"
+        assert ws.receive_json()["type"] == "start"
+        ws.send_text("{not json")
+        assert ws.receive_json()["type"] == "rejected"
+        ws.send_json({"type": "move", "form": "gata"})
+        assert ws.receive_json()["type"] == "move"
+        # No further frames from the client: the round clock ends the room and closes the socket
+        assert ws.receive_json()["reason"] == "timeout"
+        assert ws.receive()["type"] == "websocket.close"
+
+
+def test_reconnect_takes_over_and_the_old_connection_cannot_remove_the_player():
+    async def play():
+        manager = RoomManager(_session, round_seconds=60)
+        old_msgs, old_send = _inbox()
+        new_msgs, new_send = _inbox()
+        b_msgs, b_send = _inbox()
+        closed = []
+
+        async def close_old():
+            closed.append("old")
+
+        room = await manager.join("r4", "a", old_send, close_old)
+        await manager.join("r4", "b", b_send)
+        await handle_message(room, "a", {"type": "move", "form": "gata"})
+        await manager.join("r4", "a", new_send)  # Second tab / reconnect
+        assert closed == ["old"] and new_msgs[-1]["scores"]["a"] == 1
+
+        await room.leave("a", old_send)  # The superseded socket's handler finishing
+        assert sorted(room.players) == ["a", "b"]
+        await handle_message(room, "a", {"type": "move", "form": "gacchati"})
+        assert new_msgs[-1]["type"] == "end" and new_msgs[-1]["scores"] == {"a": 2, "b": 0}
+
+    asyncio.run(play())
+
+
+def test_socket_without_user_id_is_refused(monkeypatch):
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from sabdakrida.routers import games as games_router
+
+    monkeypatch.setattr(games_router, "_room_manager", RoomManager(_session))
+    app = FastAPI()
+    app.include_router(games_router.router)
+    with TestClient(app).websocket_connect("/games/dhatu-dash/ws/r5") as ws:
+        assert ws.receive() == {"type": "websocket.close", "code": 4400, "reason": "user_id is required"}
+
+
+class _Socket:
+    """The parts of a WebSocket the room handler uses; frames are fed through inbox."""
+
+    def __init__(self):
+        self.inbox: asyncio.Queue = asyncio.Queue()
+        self.sent: list[dict] = []
+        self.close_code = None
+
+    async def accept(self):
+        pass
+
+    async def send_json(self, message):
+        self.sent.append(message)
+
+    async def receive_text(self):
+        return await self.inbox.get()
+
+    async def close(self, code=1000, reason=""):
+        self.close_code = code
+
+
+def test_second_socket_for_a_user_closes_the_first(monkeypatch):
+    from sabdakrida.routers import games as games_router
+
+    manager = RoomManager(_session, round_seconds=60, min_players=1)
+    monkeypatch.setattr(games_router, "_room_manager", manager)
+
+    async def play():
+        first, second = _Socket(), _Socket()
+        first_task = asyncio.create_task(games_router.dhatu_dash_room(first, "r6", "a"))
+        await asyncio.sleep(0.01)
+        second_task = asyncio.create_task(games_router.dhatu_dash_room(second, "r6", "a"))
+        await asyncio.sleep(0.01)
+        assert first_task.done() and first.close_code == 4409
+        assert list(manager.rooms["r6"].players) == ["a"]
+
+        second.inbox.put_nowait('{"type": "move", "form": "gata"}')
+        await asyncio.sleep(0.01)
+        assert second.sent[-1]["type"] == "move"
+        second_task.cancel()
+
+    asyncio.run(play())
+
+
+def test_room_accepts_the_same_forms_as_solo_play(tmp_path):
+    from games import paradigms
+    from games.dhatu_dash import DhatuDashEngine, _build_index
+
+    path = tmp_path / "paradigms.bin"
+    paradigms.build(path, [paradigms.Root("gam", 1, ("para",))])
+    engine = DhatuDashEngine.__new__(DhatuDashEngine)
+    engine._index = _build_index([{"id": "dhatu-gam", "iast": "gam", "derivesTo": ["gacchati", "gata"]}])
+    engine._paradigms = paradigms.ParadigmIndex(path)
+
+    assert engine.evaluate_session("gacchāmi", _session()).rule_id == "dhatu_paradigm"
+
+    async def play():
+        manager = RoomManager(_session, round_seconds=60, min_players=1, accepts=engine.accepts)
+        msgs, send = _inbox()
+        room = await manager.join("r7", "solo", send)
+        await handle_message(room, "solo", {"type": "move", "form": "gacchāmi"})
+        assert msgs[-1]["type"] == "move" and "gacchāmi" in msgs[-1]["tree"]
+        await handle_message(room, "solo", {"type": "move", "form": "gacchāmi"})
+        assert msgs[-1]["reason"] == "repeat"
+        await handle_message(room, "solo", {"type": "move", "form": "bhavati"})
+        assert msgs[-1]["reason"] == "invalid"
+
+    asyncio.run(play())
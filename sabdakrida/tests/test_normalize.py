@@ -0,0 +1,40 @@
+"""
+Multi-scheme answer canonicalizer.
+"""
+import sys
+import unicodedata
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+from games.normalize import ascii_fold, canonicalize, detect_scheme
+
+
+def test_every_scheme_maps_to_nfc_iast():
+    expected = "kṛṣṇa"
+    for text in ("kṛṣṇa", unicodedata.normalize("NFD", "kṛṣṇa"), "कृष्ण", "kRSNa", "kRRiShNa", "kfzRa", " KṚṢṆA "):
+        assert canonicalize(text) == expected, text
+    assert canonicalize("गच्छति") == canonicalize("gacchati") == "gacchati"
+
+
+def test_detection_edge_cases():
+    assert detect_scheme("Bhavati") == "iast"  # Leading capital is capitalisation
+    assert detect_scheme("bhUta") == "hk"  # Aspirate digraph rules out SLP1
+    assert detect_scheme("BUta") == "slp1"
+    assert detect_scheme("BHAVATI") == "iast"  # All caps is caps lock, not SLP1
+    assert canonicalize("BHAVATI") == "bhavati"
+    assert canonicalize("shabda") == "śabda"
+    assert canonicalize("") == ""
+
+
+def test_ascii_fold():
+    assert ascii_fold("kṛ") == ascii_fold("kR") == "kri"
+    assert ascii_fold("bhū") == "bhu"
+
+
+def test_tutor_grammar_accepts_other_schemes():
+    from tutor.assessment.grammar import assess_grammar_production
+
+    spec = {"pass_criteria": {"production": ["produces_3_valid_forms", "root_kri"]}}
+    passed, _, _ = assess_grammar_production("karoti, कृत, kartR", spec)
+    assert passed
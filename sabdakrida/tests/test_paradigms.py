@@ -0,0 +1,123 @@
+"""
+Verb paradigm generator and its memory-mapped automaton.
+"""
+import sys
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+from games import paradigms
+from games.dhatu_dash import DhatuDashEngine, DhatuSession, _build_index
+from games.user_profile import UserProfile
+
+ROOTS = [
+    paradigms.Root("BU", 1, ("para", "atma")),
+    paradigms.Root("kf", 8, ("para", "atma")),
+    paradigms.Root("gam", 1, ("para",)),
+    paradigms.Root("jYA", 9, ("para",)),
+]
+
+
+def test_generated_forms():
+    endings = paradigms.load_endings()
+    forms = {(r.root, t, f) for r in ROOTS for f, t in paradigms.generate_forms(r, endings)}
+    assert ("BU", "pres.3s.para", "Bavati") in forms
+    assert ("BU", "pres.1p.para", "BavAmas") in forms
+    assert ("BU", "pres.1p.para", "BavAmaH") in forms  # Pausal
+    assert ("BU", "ipft.3s.para", "aBavat") in forms
+    assert ("kf", "pres.3s.para", "karoti") in forms
+    assert ("kf", "pres.3p.para", "kurvanti") in forms
+    assert ("gam", "opt.3s.para", "gacCet") in forms
+    assert ("jYA", "pres.3p.para", "jAnanti") in forms
+    assert not any(r == "gam" and t.endswith("atma") for r, t, _ in forms)  # parasmaipada only
+
+
+def _paradigm(root):
+    forms = {}
+    for form, tag in paradigms.generate_forms(root, paradigms.load_endings()):
+        if not form.endswith("H"):
+            forms.setdefault(tag, set()).add(form)
+    return forms
+
+
+def test_kf_weak_stem_and_boundary_sandhi():
+    kf = _paradigm(paradigms.Root("kf", 8, ("para", "atma")))
+    assert kf["pres.1d.para"] == {"kurvas"} and kf["pres.1p.para"] == {"kurmas"}
+    assert kf["pres.1p.atma"] == {"kurmahe"} and kf["ipft.1p.para"] == {"akurma"}
+    assert kf["opt.3s.para"] == {"kuryAt"} and kf["opt.3s.atma"] == {"kurvIta"}
+    assert kf["pres.2s.para"] == {"karozi"} and kf["impv.2s.atma"] == {"kuruzva"}
+    assert kf["impv.1s.para"] == {"karavARi"} and kf["impv.1s.atma"] == {"karavE"}
+    assert kf["impv.2s.para"] == {"kuru"} and kf["ipft.1s.para"] == {"akaravam"}
+
+
+def test_vac_consonant_stem():
+    vac = _paradigm(paradigms.Root("vac", 2, ("para", "atma")))
+    assert vac["pres.3s.para"] == {"vakti"} and vac["pres.2s.para"] == {"vakzi"}
+    assert vac["impv.2s.para"] == {"vagDi"} and vac["pres.2p.atma"] == {"vagDve"}
+    assert vac["ipft.3s.para"] == vac["ipft.2s.para"] == {"avak"}
+    assert vac["pres.1p.para"] == {"vacmas"} and vac["ben.3s.para"] == {"ucyAt"}
+
+
+def test_su_optional_u_loss():
+    su = _paradigm(paradigms.Root("su", 5, ("para", "atma")))
+    assert su["pres.3s.para"] == {"sunoti"} and su["pres.3p.para"] == {"sunvanti"}
+    assert su["pres.1p.para"] == {"sunumas", "sunmas"} and su["pres.1d.atma"] == {"sunuvahe", "sunvahe"}
+    assert su["opt.3s.para"] == {"sunuyAt"} and su["impv.2s.para"] == {"sunu"}
+    assert su["impv.1s.atma"] == {"sunavE"} and su["pres.2s.para"] == {"sunozi"}
+    ap = _paradigm(paradigms.Root("Ap", 5, ("para",)))
+    assert ap["pres.3p.para"] == {"Apnuvanti"} and ap["pres.1p.para"] == {"Apnumas"}  # After a conjunct
+
+
+def test_unmodelled_athematic_roots_are_skipped():
+    # h-final gaṇa 2 roots need sandhi (dogDi, leQi) the generator does not model
+    forms = dict(paradigms.generate_forms(paradigms.Root("duh", 2, ("para",)), paradigms.load_endings()))
+    assert set(forms.values()) <= {f"ben.{p}{n}.para" for p in "123" for n in "sdp"}
+
+
+def test_concurrent_builds_do_not_collide(tmp_path):
+    path = tmp_path / "p.dafsa"
+    errors = []
+
+    def build():
+        try:
+            paradigms.build(path, ROOTS)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=build) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not errors and not list(tmp_path.glob("*.tmp"))
+    assert len(paradigms.ParadigmIndex(path)) == len(paradigms.paradigm_keys(ROOTS, paradigms.load_endings()))
+
+
+def test_automaton_round_trip(tmp_path):
+    path = tmp_path / "p.dafsa"
+    stats = paradigms.build(path, ROOTS)
+    index = paradigms.ParadigmIndex(path)
+    keys = paradigms.paradigm_keys(ROOTS, paradigms.load_endings())
+    assert len(index) == stats["forms"] == len(keys)
+    assert sorted(k.decode() for k in index._suffixes(0)) == keys  # Exactly the input set
+    assert index.has_form("BU", "Bavati") and not index.has_form("BU", "gacCati")
+    assert index.tags("BU", "Bavate") == ["pres.3s.atma"]
+    index.close()
+
+
+def test_dhatu_dash_accepts_paradigm_forms(tmp_path):
+    path = tmp_path / "p.dafsa"
+    paradigms.build(path, ROOTS)
+    engine = DhatuDashEngine.__new__(DhatuDashEngine)
+    engine._index = _build_index([{"id": "dhatu-bhu", "iast": "bhū"}])
+    engine._paradigms = paradigms.ParadigmIndex(path)
+    session = DhatuSession(
+        root_id="dhatu-bhu", root_iast="bhū", root_meaning="be", root_devanagari="",
+        valid_forms=["bhū", "bhava"], tree={"bhū"},
+    )
+    challenge = engine.generate(UserProfile(user_id="u"), 0.5, session=session)
+    result = engine.evaluate("bhavāmaḥ", challenge)
+    assert result.correct and result.rule_id == "dhatu_paradigm"
+    assert "bhavāmaḥ" in session.tree
+    assert engine.evaluate("bhavāmaḥ", challenge).rule_id == "dhatu_repeat"
@@ -7,7 +7,7 @@ from pathlib import Path
 # Add parent for imports
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
-from asr.phoneme_diff import phoneme_diff
+from asr.phoneme_diff import iast_phonemes, phoneme_diff, phoneme_error_rate
 
 
 def test_retroflex_dental():
@@ -22,3 +22,10 @@ def test_empty_errors_produce_praise():
     # When errors is empty, pronunciation_session returns praise — tested in integration
     errors = phoneme_diff("ṭīkā", "ṭīkā")
     assert errors == []
+
+
+def test_phoneme_error_rate_counts_aspirates_as_one():
+    assert iast_phonemes("bhāvaiḥ") == ["bh", "ā", "v", "ai", "ḥ"]
+    assert phoneme_error_rate("caitanyam ātmā", "caitanyam ātmā") == 0.0
+    assert phoneme_error_rate("dharma", "darma") == 1 / 5  # dh → d is one substitution
+    assert phoneme_error_rate("kāla", "") == 1.0
@@ -0,0 +1,92 @@
+"""
+Prefetched challenge queues — refill below the watermark, invalidation on retargeting.
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+from games.dhatu_dash import DhatuDashEngine
+from games.engine.core import Challenge, CoreEngine, EvalResult
+from games.prefetch import ChallengePrefetcher, targeting_key
+from games.user_profile import UserProfile
+
+
+class _CountingEngine(CoreEngine):
+    game_type = "counting"
+
+    def __init__(self):
+        super().__init__()
+        self.generated = 0
+        self.batches = 0
+
+    def generate(self, user_profile, difficulty=None):
+        self.generated += 1
+        diff = user_profile.target_difficulty()
+        return Challenge(f"c{self.generated}", self.game_type, "", "", difficulty=diff)
+
+    def generate_many(self, user_profile, n, difficulty=None):
+        self.batches += 1
+        return super().generate_many(user_profile, n, difficulty)
+
+    def evaluate(self, player_input, challenge):
+        return EvalResult(correct=True)
+
+
+def _prefetcher(engine, **kwargs) -> ChallengePrefetcher:
+    return ChallengePrefetcher(lambda game_type: engine, batch_size=4, low_watermark=2, **kwargs)
+
+
+def test_cold_pop_generates_inline_then_serves_from_queue():
+    engine = _CountingEngine()
+    prefetcher = _prefetcher(engine)
+    profile = UserProfile(user_id="p")
+    prefetcher.pop("counting", profile)
+    assert prefetcher.misses == 1
+    prefetcher.wait(5)
+    assert prefetcher.queued("p", "counting") == 4
+    for _ in range(3):
+        prefetcher.pop("counting", profile)
+    assert prefetcher.hits == 3
+    prefetcher.wait(5)
+    # Dropping below the watermark refilled in the background
+    assert engine.batches == 2 and prefetcher.queued("p", "counting") == 5
+    prefetcher.shutdown()
+
+
+def test_retargeted_profile_drops_queued_challenges():
+    engine = _CountingEngine()
+    prefetcher = _prefetcher(engine)
+    profile = UserProfile(user_id="p")
+    prefetcher.prefill("counting", profile)
+    prefetcher.wait(5)
+    assert prefetcher.queued("p", "counting") == 4
+
+    before = targeting_key(profile)
+    profile.avg_recent_score = 1.0  # Difficulty bucket moves
+    assert targeting_key(profile) != before
+    challenge = prefetcher.pop("counting", profile)
+    assert challenge.difficulty == profile.target_difficulty()  # Generated inline for the new targeting
+    assert prefetcher.misses == 1
+    prefetcher.shutdown()
+
+
+def test_expired_and_invalidated_entries_are_not_served():
+    engine = _CountingEngine()
+    prefetcher = _prefetcher(engine, max_age_seconds=0.0)
+    profile = UserProfile(user_id="p")
+    prefetcher.prefill("counting", profile)
+    prefetcher.wait(5)
+    prefetcher.pop("counting", profile)
+    assert prefetcher.hits == 0
+    prefetcher.invalidate("p")
+    assert prefetcher.queued("p", "counting") == 0
+    prefetcher.shutdown()
+
+
+def test_dhatu_dash_generate_many_uses_distinct_roots():
+    engine = DhatuDashEngine()
+    challenges = engine.generate_many(UserProfile(user_id="p"), 5)
+    roots = [c.meta["session"].root_id for c in challenges]
+    assert len(roots) == 5
+    assert len(set(roots)) == min(5, len(engine._index.by_id))
@@ -0,0 +1,94 @@
+"""
+Write-behind ProfileCache — batching, durability modes, flush on stop.
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+import pytest
+
+from games import user_profile as up
+from games.profile_cache import ProfileCache
+from sabdakrida.db import connection
+
+
+@pytest.fixture(autouse=True)
+def db_path(tmp_path):
+    path = tmp_path / "profile.db"
+    connection.set_db_path(path)
+    yield path
+    connection.close_connection()
+    connection.set_db_path(None)
+
+
+def _stored_chunks(user_id: str) -> set[str]:
+    rows = connection.get_connection().execute(
+        "SELECT chunk_id FROM chunk_states WHERE user_id = ?", (user_id,)
+    )
+    return {r["chunk_id"] for r in rows}
+
+
+def test_batched_writes_wait_for_batch_size():
+    cache = ProfileCache(batch_size=2)
+    with cache.checkout("u1") as p:
+        up.update_profile(p, "c1", [], correct=True)
+    assert _stored_chunks("u1") == set()
+
+    with cache.checkout("u2") as p:
+        up.update_profile(p, "c2", [], correct=True)
+    assert _stored_chunks("u1") == {"c1"}
+    assert _stored_chunks("u2") == {"c2"}
+
+
+def test_write_through_saves_every_turn():
+    cache = ProfileCache(durability="write_through")
+    with cache.checkout("u1") as p:
+        up.update_profile(p, "c1", [], correct=True)
+    assert _stored_chunks("u1") == {"c1"}
+
+
+def test_stop_flushes_dirty_profiles():
+    cache = ProfileCache(flush_interval=60)
+    cache.start()
+    with cache.checkout("u1") as p:
+        up.update_profile(p, "c1", [], correct=True)
+    assert cache.get("u1") is p
+    cache.stop()
+    assert _stored_chunks("u1") == {"c1"}
+
+
+def test_profile_endpoint_sees_unflushed_attempts(monkeypatch):
+    import games
+    from sabdakrida.routers import games as games_router
+
+    cache = ProfileCache(batch_size=100)
+    monkeypatch.setattr(games, "get_profile_cache", lambda: cache)
+    with cache.checkout("u1") as p:
+        up.update_profile(p, "c1", [], correct=False, learner_answer="gacchat")
+    view = asyncio.run(games_router.get_profile("u1"))
+    assert [e["chunk_id"] for e in view["error_patterns"]] == ["c1"]
+
+
+def test_compaction_job_survives_a_failed_pass(monkeypatch):
+    from games import attempts
+    from sabdakrida.routers import games as games_router
+
+    passes = []
+
+    def compact():
+        passes.append(1)
+        if len(passes) == 1:
+            raise RuntimeError("database is locked")
+
+    monkeypatch.setattr(attempts, "compact_attempts", compact)
+    monkeypatch.setattr(games_router, "ATTEMPT_COMPACT_INTERVAL_HOURS", 0.01 / 3600)
+
+    async def run():
+        task = asyncio.create_task(games_router._compact_attempts_periodically())
+        await asyncio.sleep(0.2)
+        task.cancel()
+
+    asyncio.run(run())
+    assert len(passes) >= 2
@@ -0,0 +1,61 @@
+"""
+Sandhi joiner/splitter — compiled rules, reverse lookup, DP split search.
+"""
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+from games.sandhi import Lexicon, Splitter, get_rules, join, to_slp1
+
+WORDS = (
+    "deva iti api rāmas gacchati atra gajas ca āgacchati citis svatantrā viśva siddhi hetus "
+    "ūrdhve prāṇas hi adhas jīvas visarga ātmā na vrajet viśet śaktis marut rūpā vikāsite"
+)
+
+
+def _splitter() -> Splitter:
+    return Splitter(get_rules(), Lexicon(to_slp1(w) for w in WORDS.split()))
+
+
+def test_join_applies_longest_rule():
+    assert join("deva", "iti") == "deveti"
+    assert join("devas", "atra") == "devo 'tra"
+    assert join("iti", "api") == "ity api"
+
+
+def test_lexicon_membership():
+    lexicon = Lexicon(["deva", "devas", "iti"])
+    assert "deva" in lexicon and "devas" in lexicon
+    assert "dev" not in lexicon and "itis" not in lexicon
+    assert len(lexicon) == 3
+
+
+def test_split_undoes_vowel_visarga_and_consonant_sandhi():
+    splitter = _splitter()
+    assert splitter.split("deveti").iast() == ["deva", "iti"]
+    assert splitter.split("ity api").iast() == ["iti", "api"]
+    assert splitter.split("rāmo gacchati").iast() == ["rāmas", "gacchati"]
+    assert splitter.split("gajaścāgacchati").iast() == ["gajas", "ca", "āgacchati"]
+    assert splitter.split("citiḥ svatantrā viśvasiddhihetuḥ").iast() == [
+        "citis", "svatantrā", "viśva", "siddhi", "hetus",
+    ]
+    assert splitter.split("na vrajen na viśec chaktir marudrūpā vikāsite").complete
+
+
+def test_split_keeps_unknown_words_whole():
+    result = _splitter().split("ūrdhve prāṇo gacchati paroccaret")
+    assert result.iast()[:3] == ["ūrdhve", "prāṇas", "gacchati"]
+    assert result.unknown == [3]
+    assert result.words[3] == to_slp1("paroccaret")
+
+
+def test_split_200_char_line_in_milliseconds():
+    splitter = _splitter()
+    line = ("ūrdhve prāṇo hy adho jīvo visargātmā na vrajen na viśec chaktir marudrūpā vikāsite " * 3)[:200]
+    splitter.split(line)
+    start = time.perf_counter()
+    for _ in range(10):
+        splitter.split_slp1(to_slp1(line))
+    assert (time.perf_counter() - start) / 10 < 0.05
@@ -0,0 +1,108 @@
+"""
+Sandhi Forge — compiled rule table, generate/evaluate, and the engine registry.
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+from games.engine.core import Challenge, CoreEngine, EvalResult
+from games.registry import EngineRegistry
+from games.sandhi_forge import SandhiForgeEngine
+from games.user_profile import UserProfile
+
+
+def test_join_uses_longest_matching_rule():
+    table = SandhiForgeEngine()._table
+    assert table.join("deva", "iti")[0] == "deveti"
+    assert table.join("devas", "atra")[0] == "devo 'tra"  # as + a, not s + a
+    assert table.join("iti", "api")[0] == "ityapi"  # Vowel junctions are written as one word
+    assert table.join("vane", "iha")[0] == "vana iha"  # ...except where a hiatus remains
+
+
+def test_vocabulary_is_inflected_words_only():
+    table = SandhiForgeEngine()._table
+    words = {w for bucket in table.by_end.values() for w in bucket}
+    assert {"Bavati", "devena", "pitA"} <= words
+    assert not {"BU", "gam", "fBukSAs"} & words
+
+
+def test_generate_then_evaluate_round_trip():
+    engine = SandhiForgeEngine()
+    profile = UserProfile(user_id="forge")
+    for difficulty in (0.0, 0.3, 0.6, 0.99):
+        challenge = engine.generate(profile, difficulty=difficulty)
+        assert challenge.topic == "sandhi"
+        assert challenge.meta["level"] <= 1 + int(difficulty * 4)
+        answer = challenge.correct_answer
+        assert engine.evaluate(answer, challenge).correct
+        # Spacing and avagraha are optional; other scripts are canonicalized
+        assert engine.evaluate(answer.replace(" ", "").replace("'", ""), challenge).correct
+        assert not engine.evaluate(challenge.meta["left"] + challenge.meta["right"] + "x", challenge).correct
+
+
+def test_evaluate_explains_with_rule_reference():
+    engine = SandhiForgeEngine()
+    challenge = engine.generate(UserProfile(user_id="forge"), difficulty=0.0)
+    result = engine.evaluate("wrong", challenge)
+    assert not result.correct
+    assert challenge.correct_answer in result.explanation
+    assert result.chunk_id.startswith("sandhi_")
+
+
+class _CountingEngine(CoreEngine):
+    game_type = "counting"
+    built = 0
+    warmed = 0
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        _CountingEngine.built += 1
+
+    def warm(self) -> None:
+        _CountingEngine.warmed += 1
+
+    def generate(self, user_profile, difficulty=None):
+        return Challenge("c", self.game_type, "", "")
+
+    def evaluate(self, player_input, challenge):
+        return EvalResult(correct=True)
+
+
+def test_registry_builds_each_engine_once_with_shared_corpus():
+    corpus = object()
+    registry = EngineRegistry(corpus=corpus, factories={"counting": _CountingEngine}).build()
+    registry.build()
+    engine = registry.get("counting")
+    assert engine is registry.get("counting")
+    assert engine.corpus is corpus
+    assert (_CountingEngine.built, _CountingEngine.warmed) == (1, 1)
+    assert registry.game_types() == ["counting"]
+    try:
+        registry.get("nope")
+    except KeyError:
+        pass
+    else:
+        raise AssertionError("unknown game type should raise KeyError")
+
+
+def test_candrabindu_junction_is_answerable(monkeypatch):
+    engine = SandhiForgeEngine()
+    rule = engine._table.rules.rules[("n", "l")]
+    assert rule in engine._table.playable[4]
+    monkeypatch.setattr(engine, "_pick_rule", lambda difficulty: rule)
+    challenge = engine.generate(UserProfile(user_id="forge"), difficulty=0.99)
+    assert "~" not in challenge.correct_answer and "m̐l" in challenge.correct_answer
+    for nasal in ("ṃl", "l̐", "m̐l", "ṁl"):
+        assert engine.evaluate(challenge.correct_answer.replace("m̐l", nasal), challenge).correct
+
+
+def test_word_ends_away_from_the_junction_are_pausal(monkeypatch):
+    engine = SandhiForgeEngine()
+    monkeypatch.setattr(engine, "_pick_rule", lambda difficulty: engine._table.rules.rules[("os", "y")])
+    monkeypatch.setattr(engine._table, "by_end", {"os": ["pitros"]})
+    monkeypatch.setattr(engine._table, "by_start", {"y": ["yAtus"]})
+    challenge = engine.generate(UserProfile(user_id="forge"), difficulty=0.6)
+    assert challenge.prompt.startswith("pitroḥ + yātuḥ")
+    assert challenge.correct_answer == "pitror yātuḥ"
+    assert engine.evaluate("pitror yātuḥ", challenge).correct
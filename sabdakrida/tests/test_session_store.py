@@ -0,0 +1,35 @@
+"""
+Server-side game session store — LRU bound, TTL, ownership.
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+from games.session_store import SessionStore
+
+
+def test_lru_eviction_and_ownership():
+    store = SessionStore(max_sessions=2)
+    a = store.create("A", "u1")
+    b = store.create("B", "u1")
+    assert store.get(a, "u1") == "A"  # a is now most recent
+    store.create("C", "u2")
+    assert store.get(b) is None
+    assert store.get(a, "u2") is None
+    assert len(store) == 2
+
+
+def test_ttl_expiry(monkeypatch):
+    import games.session_store as mod
+
+    clock = [100.0]
+    monkeypatch.setattr(mod.time, "monotonic", lambda: clock[0])
+    store = SessionStore(ttl_seconds=10)
+    sid = store.create("A", "u1")
+    clock[0] += 9
+    assert store.get(sid) == "A"  # refreshes TTL
+    clock[0] += 9
+    assert store.get(sid) == "A"
+    clock[0] += 11
+    assert store.get(sid) is None
@@ -0,0 +1,120 @@
+"""
+Energy VAD and streamed Mode 1 — assessment starts at end of speech.
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+import numpy as np
+import pytest
+
+from sabdakrida.asr.vad import EnergyVAD
+from sabdakrida.asr.audio import AudioDecodeError
+from sabdakrida.assessment.streaming import StreamCapture
+
+SR = 16000
+
+
+def _utterance(lead=0.5, speech=0.8, tail=1.0, sr=SR):
+    """Low noise, a tone burst, then low noise again."""
+    rng = np.random.default_rng(0)
+    n = int((lead + speech + tail) * sr)
+    audio = 0.002 * rng.standard_normal(n)
+    start, end = int(lead * sr), int((lead + speech) * sr)
+    audio[start:end] += 0.3 * np.sin(2 * np.pi * 200 * np.arange(end - start) / sr)
+    return audio.astype(np.float32), start, end
+
+
+def test_vad_finds_speech_and_ends_after_silence():
+    audio, start, end = _utterance()
+    vad = EnergyVAD(SR, end_silence_ms=600)
+    fed = 0
+    for chunk in np.array_split(audio, 37):  # Chunk sizes unrelated to the frame size
+        fed += len(chunk)
+        if vad.feed(chunk):
+            break
+    assert vad.ended
+    assert abs(vad.speech_start - start) <= vad.frame
+    assert abs(vad.speech_end - end) <= vad.frame
+    # Ended ~600 ms after speech, well before the stream finished
+    assert fed < len(audio) and (fed - end) / SR == pytest.approx(0.6, abs=0.1)
+
+
+def test_vad_ignores_silence():
+    vad = EnergyVAD(SR)
+    assert not vad.feed(np.zeros(SR * 2, dtype=np.float32))
+    assert not vad.in_speech and vad.speech_bounds(100) == (0, 100)
+
+
+def test_capture_handles_split_samples_and_resamples():
+    audio, start, end = _utterance(sr=48000)
+    pcm = (audio * 32767).astype("<i2").tobytes()
+    capture = StreamCapture(sample_rate=48000)
+    ended = False
+    for i in range(0, len(pcm), 4801):  # Odd sizes split samples across messages
+        if capture.add(pcm[i:i + 4801]):
+            ended = True
+            break
+    assert ended
+    clip = capture.audio()
+    assert clip.sr == SR
+    assert clip.duration == pytest.approx((end - start) / 48000 + 0.3, abs=0.1)  # Speech + 150 ms pads
+
+
+def test_capture_checks_rate_and_caps_bytes():
+    for rate in (0, -16000, 10**9):
+        with pytest.raises(AudioDecodeError):
+            StreamCapture(sample_rate=rate)
+    capture = StreamCapture(sample_rate=16000, max_seconds=3600, max_bytes=1000)
+    assert not capture.add(bytes(600))
+    assert capture.add(bytes(600))  # Cap reached: the stream ends
+    assert capture.bytes_received == 1000 and capture.received == 500
+
+
+def test_websocket_streams_to_result(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    from sabdakrida import main
+
+    seen = {}
+
+    async def fake_session(audio, target_text, user_id):
+        seen["duration"] = audio.duration
+        return {"target": target_text, "score": 0.9, "correct": True}
+
+    monkeypatch.setattr(main, "pronunciation_session", fake_session)
+    audio, _, _ = _utterance()
+    pcm = (audio * 32767).astype("<i2").tobytes()
+    client = TestClient(main.app)
+    with client.websocket_connect("/session/mode1/stream?target_text=rāma&user_id=ws") as ws:
+        for i in range(0, len(pcm), 3200):
+            ws.send_bytes(pcm[i:i + 3200])
+        messages = [ws.receive_json() for _ in range(3)]
+    assert [m["type"] for m in messages] == ["speech_start", "endpoint", "result"]
+    assert messages[2]["target"] == "rāma" and seen["duration"] < 1.5
+
+
+def test_websocket_rejects_unknown_encoding():
+    from fastapi.testclient import TestClient
+    from starlette.websockets import WebSocketDisconnect
+
+    from sabdakrida import main
+
+    with pytest.raises(WebSocketDisconnect) as exc:
+        with TestClient(main.app).websocket_connect("/session/mode1/stream?target_text=a&encoding=mp3") as ws:
+            ws.receive_json()
+    assert exc.value.code == 4400
+
+
+def test_websocket_rejects_out_of_range_sample_rate():
+    from fastapi.testclient import TestClient
+    from starlette.websockets import WebSocketDisconnect
+
+    from sabdakrida import main
+
+    for rate in (0, 1000000000):
+        with pytest.raises(WebSocketDisconnect) as exc:
+            with TestClient(main.app).websocket_connect(f"/session/mode1/stream?target_text=a&sample_rate={rate}") as ws:
+                ws.receive_json()
+        assert exc.value.code == 4400
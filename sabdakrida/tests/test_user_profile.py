@@ -0,0 +1,128 @@
+"""
+Games user profile persistence — normalized chunk/seen/error tables.
+"""
+import sqlite3
+import sys
+from pathlib import Path
+
+# Add project root for the games package
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+import pytest
+
+from games import user_profile as up
+from sabdakrida.db import connection
+from sabdakrida.db.migrations import MIGRATIONS, migrate
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = tmp_path / "profile.db"
+    connection.set_db_path(path)
+    yield path
+    connection.close_connection()
+    connection.set_db_path(None)
+
+
+def test_round_trip(db_path):
+    p = up.load_profile("u1")
+    up.update_profile(p, "c1", [], correct=False, learner_answer="bhav")
+    up.update_profile(p, "c2", [], correct=True)
+    p.mark_seen("d1")
+    up.save_profile(p)
+
+    q = up.load_profile("u1")
+    assert set(q.chunk_states) == {"c1", "c2"}
+    assert q.seen_drill_ids == {"d1"}
+    assert [e["chunk_id"] for e in q.recent_errors] == ["c1", "c2"]
+    assert q.recent_errors[0]["learner_answer"] == "bhav"
+
+
+def test_save_writes_only_changed_rows(db_path):
+    p = up.load_profile("u1")
+    for i in range(100):
+        up.update_profile(p, f"c{i}", [], correct=True)
+    up.save_profile(p)
+
+    q = up.load_profile("u1")
+    assert not q._dirty_chunks and not q._pending_attempts
+    up.update_profile(q, "c5", [], correct=False)
+    assert q._dirty_chunks == {"c5"}
+    assert len(q._pending_attempts) == 1
+    up.save_profile(q)
+
+    conn = sqlite3.connect(db_path)
+    assert conn.execute("SELECT COUNT(*) FROM chunk_states").fetchone()[0] == 100
+    assert conn.execute("SELECT COUNT(*) FROM attempts").fetchone()[0] == 101
+    conn.close()
+    assert len(up.load_profile("u1").recent_errors) == up.RECENT_ERRORS_LIMIT
+
+
+def test_legacy_blob_migrated(db_path):
+    conn = sqlite3.connect(db_path)
+    conn.executescript(MIGRATIONS[0][2])  # Pre-normalisation database at user_version 0
+    conn.execute(
+        "INSERT INTO user_profiles (user_id, chunk_states, seen_drill_ids) VALUES (?, ?, ?)",
+        ("u1", '{"c1": {"stability": 2.0, "difficulty": 0.4, "due": "2025-01-01"}}', '["d1"]'),
+    )
+    conn.commit()
+    assert migrate(conn) == MIGRATIONS[-1][0]
+    conn.close()
+
+    p = up.load_profile("u1")
+    assert p.chunk_states["c1"]["stability"] == 2.0
+    assert p.seen_drill_ids == {"d1"}
+    conn = sqlite3.connect(db_path)
+    assert conn.execute("SELECT chunk_states FROM user_profiles").fetchone()[0] == "{}"
+    conn.close()
+
+
+def test_batch_matches_sequential_updates(db_path):
+    import random
+    from datetime import datetime, timedelta
+
+    rng = random.Random(0)
+    embs = {f"c{i}": [rng.random() for _ in range(up.EMBED_DIMS)] for i in range(5)}
+    t0 = datetime(2025, 1, 1)
+    results = [
+        up.DrillResult(f"c{i % 5}", correct=i % 3 != 0, topic="sandhi", timestamp=t0 + timedelta(hours=i))
+        for i in range(12)
+    ]
+
+    seq = up.UserProfile(user_id="a")
+    for r in results:
+        up.update_profile(seq, r.chunk_id, embs[r.chunk_id], r.correct, r.topic, now=r.timestamp)
+    batch = up.update_profile_batch(up.UserProfile(user_id="b"), results[::-1], embs)
+
+    assert batch.weakness_centroid == pytest.approx(seq.weakness_centroid)
+    assert batch.strength_centroid == pytest.approx(seq.strength_centroid)
+    assert batch.topic_mastery == pytest.approx(seq.topic_mastery)
+    assert batch.chunk_states == seq.chunk_states
+    assert batch.avg_recent_score == seq.avg_recent_score
+
+
+def test_attempt_log_aggregates_and_compaction(db_path):
+    from datetime import datetime, timedelta
+
+    from games import attempts
+
+    t0 = datetime(2025, 1, 1, 9)
+    p = up.load_profile("u1")
+    for i in range(25):
+        up.update_profile(p, "c1", [], correct=i % 5 == 0, topic="sandhi", now=t0 + timedelta(hours=i))
+    up.save_profile(p)
+
+    q = up.load_profile("u1")
+    assert len(q._recent_scores) == up.RECENT_SCORES_WINDOW
+    assert q.avg_recent_score == pytest.approx(sum(q._recent_scores) / up.RECENT_SCORES_WINDOW)
+    [pattern] = attempts.error_patterns("u1")
+    assert (pattern["attempts"], pattern["errors"]) == (25, 20)
+
+    # First 15 hours fall on Jan 1, the rest on Jan 2; compact everything before Jan 2
+    assert attempts.compact_attempts(older_than_days=0, now=datetime(2025, 1, 2)) == 15
+    conn = sqlite3.connect(db_path)
+    assert conn.execute("SELECT COUNT(*) FROM attempts").fetchone()[0] == 10
+    assert conn.execute(
+        "SELECT day, topic, attempts, correct FROM attempt_daily"
+    ).fetchall() == [("2025-01-01", "sandhi", 15, 3)]
+    conn.close()
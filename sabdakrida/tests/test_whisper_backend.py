@@ -0,0 +1,40 @@
+"""
+WHISPER_BACKEND — fp32 as published, int8 dynamic quantization on CPU.
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+import pytest
+import torch
+from transformers import WhisperConfig, WhisperForConditionalGeneration
+
+from sabdakrida.asr.whisper_sanskrit import apply_backend
+
+
+def _tiny_whisper():
+    config = WhisperConfig(
+        d_model=64, encoder_layers=1, decoder_layers=1, encoder_attention_heads=2,
+        decoder_attention_heads=2, encoder_ffn_dim=128, decoder_ffn_dim=128, vocab_size=512,
+        max_source_positions=1500, max_target_positions=64,
+        pad_token_id=0, bos_token_id=1, eos_token_id=1, decoder_start_token_id=2,
+    )
+    return WhisperForConditionalGeneration(config).eval()
+
+
+def test_int8_backend_quantizes_linear_layers():
+    model = _tiny_whisper()
+    assert apply_backend(model, "fp32") is model
+    quantized = apply_backend(model, "int8")
+    assert not any(type(m) is torch.nn.Linear for m in quantized.modules())
+    assert any(type(m) is torch.nn.Linear for m in model.modules())  # Original left as is
+    features = torch.zeros(1, 80, 3000)
+    with torch.no_grad():
+        out = quantized(input_features=features, decoder_input_ids=torch.tensor([[1, 2]]))
+    assert out.logits.shape == (1, 2, 512)
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        apply_backend(_tiny_whisper(), "fp8")
@@ -4,12 +4,10 @@ Sanskrit TTS — indic-parler-tts wrapper with style prompts.
 Model expects Devanagari input for best results. IAST is converted automatically.
 """
 
-import asyncio
 import io
 import os
 import re
 import tempfile
-from functools import partial
 
 import numpy as np
 import soundfile as sf
@@ -18,6 +16,8 @@ from indic_transliteration import sanscript
 import torch
 from transformers import AutoTokenizer
 
+from ..inference import TTS_MAX_QUEUE, TTS_TORCH_THREADS, TTS_WORKERS, BoundedExecutor
+
 _DEVANAGARI_RE = re.compile(r"[\u0900-\u097F]+")
 # Punctuation that signals end of utterance (reduce TTS continuation/hallucination)
 _END_PUNCT = set(".!?।॥,;:")
@@ -60,6 +60,9 @@ _description_tokenizer = None
 # Cache (text, style) -> WAV bytes — feedback phrases repeat, cache avoids slow TTS
 _tts_cache: dict[tuple[str, str], bytes] = {}
 
+# Own worker threads, apart from ASR and the default pool; full queue → Overloaded
+_tts_executor = BoundedExecutor("tts", TTS_WORKERS, TTS_MAX_QUEUE, TTS_TORCH_THREADS)
+
 
 def _load_tts():
     global _model, _tokenizer, _description_tokenizer
@@ -130,10 +133,12 @@ async def tts_speak(text: str, style: str = "command", save: bool = False) -> by
     key = (text.strip(), style)
     if not save and key in _tts_cache:
         return _tts_cache[key]
-    loop = asyncio.get_event_loop()
-    out = await loop.run_in_executor(
-        None, partial(_synthesize_sync, text, style, save)
-    )
+    out = await _tts_executor.run(_synthesize_sync, text, style, save)
     if not save and isinstance(out, bytes):
         _tts_cache[key] = out
     return out
+
+
+def shutdown_tts() -> None:
+    """Stop the TTS workers (app shutdown); queued syntheses are cancelled."""
+    _tts_executor.shutdown()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark: whisper_transcribe under concurrent learners, per-request vs micro-batched.
+
+"before" replays the old path — every request runs its own batch-size-1
+generate() on the default thread pool. "after" goes through
+whisper_transcribe and its MicroBatcher. Each simulated learner sends
+--requests clips back to back; throughput and per-request latency are
+reported for both.
+
+Without --model a random whisper-tiny-sized network is used (see
+whisper_fixture.py), so relative numbers are meaningful and absolute ones are not.
+
+Run from project root: python scripts/benchmarks/bench_asr_batching.py [--learners 20] [--model Bidwill/whisper-medium-sanskrit-try-2]
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+_PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(_PROJECT_ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from sabdakrida.asr import whisper_sanskrit  # noqa: E402
+from sabdakrida.asr.audio import DecodedAudio  # noqa: E402
+from sabdakrida.asr.batcher import MicroBatcher  # noqa: E402
+from whisper_fixture import install, load_whisper, voiced_clip  # noqa: E402
+
+
+async def _before(clip: DecodedAudio) -> str:
+    loop = asyncio.get_event_loop()
+    return await loop.run_in_executor(None, whisper_sanskrit._transcribe_sync, clip, "sa")
+
+
+async def _after(clip: DecodedAudio) -> str:
+    return await whisper_sanskrit.whisper_transcribe(clip, "sa")
+
+
+async def _run(transcribe, clips: list[DecodedAudio], learners: int, requests: int) -> tuple[float, list[float]]:
+    latencies: list[float] = []
+
+    async def learner(i: int) -> None:
+        for r in range(requests):
+            start = time.perf_counter()
+            await transcribe(clips[(i + r) % len(clips)])
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(learner(i) for i in range(learners)))
+    return time.perf_counter() - start, latencies
+
+
+def _report(name: str, elapsed: float, latencies: list[float]) -> float:
+    latencies.sort()
+    p95 = latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))]
+    rate = len(latencies) / elapsed
+    print(
+        f"{name:8} {rate:7.2f} clips/s  p50={statistics.median(latencies) * 1000:7.0f}ms"
+        f"  p95={p95 * 1000:7.0f}ms  wall={elapsed:6.1f}s"
+    )
+    return rate
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--learners", type=int, default=20, help="Concurrent learners")
+    parser.add_argument("--requests", type=int, default=2, help="Clips per learner")
+    parser.add_argument("--batch", type=int, default=8, help="Max clips per generate() call")
+    parser.add_argument("--wait-ms", type=float, default=10.0, help="Batch collection window")
+    parser.add_argument("--model", default=None, help="Whisper checkpoint (default: synthetic tiny model)")
+    args = parser.parse_args()
+
+    install(*load_whisper(args.model))
+    clips = [DecodedAudio(voiced_clip(1.0 + 0.25 * i, seed=i)) for i in range(8)]
+    whisper_sanskrit._transcribe_sync(clips[0])  # Warm-up
+
+    before = _report("before", *asyncio.run(_run(_before, clips, args.learners, args.requests)))
+    whisper_sanskrit._batcher = MicroBatcher(
+        whisper_sanskrit._transcribe_batch_sync, max_batch=args.batch, max_wait_ms=args.wait_ms
+    )
+    after = _report("after", *asyncio.run(_run(_after, clips, args.learners, args.requests)))
+    batcher = whisper_sanskrit._batcher
+    print(f"speedup {after / before:.2f}x  mean batch {batcher.items / max(1, batcher.batches):.1f}")
+    whisper_sanskrit.shutdown_asr_batcher()
+
+
+if __name__ == "__main__":
+    main()
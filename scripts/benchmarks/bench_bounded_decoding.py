@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Benchmark: decode time of short drill words, unbounded vs target-aware bounded decoding.
+
+Each drill word (sabdakrida.data.drill_words) gets a short clip and is
+transcribed three ways at batch size 1:
+
+  unbounded  no target — generate() runs to EOS or the model's token limit
+  bounded    target token budget + repetition stop (what pronunciation_session does)
+  prompted   bounded, plus the target as a decoder prompt (WHISPER_PROMPT=1)
+
+Clips are synthetic voiced signal of about a word's length. The synthetic
+model (default, see whisper_fixture.py) never emits EOS, so "unbounded" is
+the worst case a noisy clip can hit; with --model the savings are those of
+the real checkpoint on such clips.
+
+Run from project root: python scripts/benchmarks/bench_bounded_decoding.py [--words 4] [--model Bidwill/whisper-medium-sanskrit-try-2]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+_PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(_PROJECT_ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from sabdakrida.asr import whisper_sanskrit  # noqa: E402
+from sabdakrida.asr.audio import DecodedAudio  # noqa: E402
+from sabdakrida.asr.decoding import MAX_NEW_TOKENS, token_budget  # noqa: E402
+from sabdakrida.data.drill_words import DRILL_WORDS  # noqa: E402
+from whisper_fixture import install, load_whisper, voiced_clip  # noqa: E402
+
+MODES = {
+    "unbounded": {},
+    "bounded": {"with_target": True},
+    "prompted": {"with_target": True, "prompt": True},
+}
+
+
+def _drill_words(n: int) -> list[str]:
+    words = list(dict.fromkeys(w for group in DRILL_WORDS.values() for w in group))
+    return words[::max(1, len(words) // n)][:n]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--words", type=int, default=4, help="Drill words to time")
+    parser.add_argument("--model", default=None, help="Whisper checkpoint (default: synthetic tiny model)")
+    args = parser.parse_args()
+
+    processor, model = load_whisper(args.model, max_new_tokens=MAX_NEW_TOKENS)
+    install(processor, model)
+    words = _drill_words(args.words)
+    clips = [DecodedAudio(voiced_clip(0.4 + 0.08 * len(w), seed=i)) for i, w in enumerate(words)]
+    whisper_sanskrit._transcribe_sync(clips[0], target_text=words[0])  # Warm-up
+
+    totals: dict[str, float] = {}
+    for mode, opts in MODES.items():
+        start = time.perf_counter()
+        for word, clip in zip(words, clips):
+            target = word if opts.get("with_target") else None
+            whisper_sanskrit._transcribe_sync(clip, target_text=target, prompt=opts.get("prompt", False))
+        totals[mode] = (time.perf_counter() - start) / len(words)
+
+    budgets = [token_budget(processor.tokenizer, w) for w in words]
+    print(f"{len(words)} drill words {words}, token budgets {budgets} (unbounded cap {MAX_NEW_TOKENS})")
+    for mode, seconds in totals.items():
+        saved = 1 - seconds / totals["unbounded"]
+        print(f"{mode:10} {seconds * 1000:8.0f} ms/clip  saved {saved:6.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: profile-store SQLite access, before vs after the shared layer.
+
+"before" replays the old pattern — new connection per call, CREATE TABLE IF NOT
+EXISTS on every call, default rollback journal. "after" goes through
+sabdakrida.db.connection (WAL, pragmas, per-thread connection, migrations once).
+
+Run from project root: python scripts/benchmarks/bench_db.py [--ops 2000]
+Uses a throwaway database in a temp dir; sabdakrida.db is not touched.
+"""
+import argparse
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+_PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(_PROJECT_ROOT))
+
+from sabdakrida.db import connection  # noqa: E402
+from sabdakrida.db.profile import get_drill_priority, update_user_profile  # noqa: E402
+from tutor.profile import TutorProfile, load_tutor_profile, save_tutor_profile  # noqa: E402
+
+_LEGACY_DDL = """
+CREATE TABLE IF NOT EXISTS phoneme_errors (
+    user_id TEXT NOT NULL,
+    error_type TEXT NOT NULL,
+    count INTEGER DEFAULT 0,
+    last_seen TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (user_id, error_type)
+);
+CREATE TABLE IF NOT EXISTS tutor_progress (
+    user_id TEXT PRIMARY KEY,
+    zone_levels TEXT DEFAULT '{}',
+    level_retry_counts TEXT DEFAULT '{}',
+    weekly_arc TEXT,
+    last_arc_generated TIMESTAMP,
+    unverified_pronunciation TEXT DEFAULT '[]',
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+"""
+
+
+def _legacy_connect(path: Path) -> sqlite3.Connection:
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(_LEGACY_DDL)
+    return conn
+
+
+def legacy_write(path: Path, i: int) -> None:
+    conn = _legacy_connect(path)
+    conn.execute(
+        """
+        INSERT INTO phoneme_errors (user_id, error_type, count) VALUES (?, ?, 1)
+        ON CONFLICT(user_id, error_type) DO UPDATE SET count = count + 1
+        """,
+        (f"u{i % 50}", "aspiration"),
+    )
+    conn.commit()
+    conn.close()
+
+
+def legacy_read(path: Path, i: int) -> None:
+    conn = _legacy_connect(path)
+    conn.execute(
+        "SELECT error_type, count FROM phoneme_errors WHERE user_id = ? ORDER BY count DESC",
+        (f"u{i % 50}",),
+    ).fetchall()
+    conn.close()
+
+
+def legacy_tutor_cycle(path: Path, i: int) -> None:
+    conn = _legacy_connect(path)
+    conn.execute("SELECT * FROM tutor_progress WHERE user_id = ?", (f"u{i % 50}",)).fetchone()
+    conn.close()
+    conn = _legacy_connect(path)
+    conn.execute(
+        """
+        INSERT INTO tutor_progress (user_id, zone_levels) VALUES (?, ?)
+        ON CONFLICT(user_id) DO UPDATE SET zone_levels = excluded.zone_levels
+        """,
+        (f"u{i % 50}", '{"roots": 2}'),
+    )
+    conn.commit()
+    conn.close()
+
+
+def shared_write(_path: Path, i: int) -> None:
+    update_user_profile(f"u{i % 50}", ["aspiration"])
+
+
+def shared_read(_path: Path, i: int) -> None:
+    get_drill_priority(f"u{i % 50}")
+
+
+def shared_tutor_cycle(_path: Path, i: int) -> None:
+    p = load_tutor_profile(f"u{i % 50}")
+    p.zone_levels["roots"] = 2
+    save_tutor_profile(p)
+
+
+def _ops_per_sec(fn, path: Path, n: int) -> float:
+    start = time.perf_counter()
+    for i in range(n):
+        fn(path, i)
+    return n / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--ops", type=int, default=2000)
+    args = parser.parse_args()
+
+    cases = [
+        ("write (phoneme_errors upsert)", legacy_write, shared_write),
+        ("read (drill priority)", legacy_read, shared_read),
+        ("tutor load+save", legacy_tutor_cycle, shared_tutor_cycle),
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_path = Path(tmp) / "legacy.db"
+        shared_path = Path(tmp) / "shared.db"
+        connection.set_db_path(shared_path)
+        print(f"{'operation':32} {'before':>12} {'after':>12} {'speedup':>8}")
+        for name, legacy, shared in cases:
+            before = _ops_per_sec(legacy, legacy_path, args.ops)
+            after = _ops_per_sec(shared, shared_path, args.ops)
+            print(f"{name:32} {before:>10.0f}/s {after:>10.0f}/s {after / before:>7.1f}x")
+        connection.close_connection()
+        connection.set_db_path(None)
+
+
+if __name__ == "__main__":
+    main()
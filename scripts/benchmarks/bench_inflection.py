@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Benchmark: games.inflection analyzer throughput (forms/sec).
+
+The corpus is every generated form of the data/words.json nouns, every
+irregular noun form and every word in the sandhi lexicon — real inflected
+forms plus verbs and indeclinables the analyzer must reject or over-read.
+Two analyzers are timed: open vocabulary (any stem) and restricted to the
+known stems, which is how Kāraka Web uses it.
+
+Run from project root: python scripts/benchmarks/bench_inflection.py [--rounds 20]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+_PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(_PROJECT_ROOT))
+
+from games.inflection import InflectionAnalyzer  # noqa: E402
+from games.karaka_web import _load_nouns  # noqa: E402
+from games.sandhi import lexicon_words  # noqa: E402
+
+
+def _corpus(analyzer: InflectionAnalyzer) -> tuple[list[str], list[str]]:
+    nouns = _load_nouns()
+    forms = [f for n in nouns for f, _, _ in analyzer.inflect(n["stem"], n["gender"])]
+    forms += list(analyzer.irregular)
+    forms += sorted(lexicon_words())
+    return forms, [n["stem"] for n in nouns]
+
+
+def _rate(analyzer: InflectionAnalyzer, forms: list[str], rounds: int) -> tuple[float, float]:
+    analyze = analyzer.analyze
+    best = 0.0
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for form in forms:
+                analyze(form)
+        best = max(best, rounds * len(forms) / (time.perf_counter() - start))
+    per_form = sum(len(analyze(f)) for f in forms) / len(forms)
+    return best, per_form
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rounds", type=int, default=20, help="Passes over the corpus per timing")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    open_vocab = InflectionAnalyzer()
+    built = time.perf_counter() - start
+    forms, stems = _corpus(open_vocab)
+    known = InflectionAnalyzer(stems=stems)
+    print(f"forms={len(forms):,} build={built * 1000:.1f}ms")
+    for name, analyzer in (("open vocabulary", open_vocab), ("known stems", known)):
+        rate, per_form = _rate(analyzer, forms, args.rounds)
+        print(f"{name:16} {rate:>12,.0f} forms/s  {per_form:5.1f} analyses/form")
+
+
+if __name__ == "__main__":
+    main()
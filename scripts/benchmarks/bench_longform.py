@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark: a long recitation transcribed segment by segment vs as one batch.
+
+A synthetic recitation of --segments voiced stretches (pāda-sized, 2–4 s)
+separated by pauses is cut with split_on_silence, then transcribed two ways:
+
+  sequential  one generate() per segment, back to back
+  batched     segments submitted through whisper_transcribe in waves of
+              WHISPER_BATCH_SIZE (longform.transcribe_segments, what
+              recitation_session does); the MicroBatcher pads each wave
+
+The wall time of the longest single segment is printed as the lower bound.
+Without --model a random whisper-tiny-sized network is used (see
+whisper_fixture.py); on a single CPU core batching gains little over the
+sequential loop, the gap grows with cores or a GPU.
+
+Run from project root: python scripts/benchmarks/bench_longform.py [--segments 24] [--model Bidwill/whisper-medium-sanskrit-try-2]
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+_PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(_PROJECT_ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from sabdakrida.asr import whisper_sanskrit  # noqa: E402
+from sabdakrida.assessment.longform import transcribe_segments  # noqa: E402
+from sabdakrida.asr.audio import SAMPLE_RATE, DecodedAudio  # noqa: E402
+from sabdakrida.asr.vad import split_on_silence  # noqa: E402
+from whisper_fixture import install, load_whisper, voiced_clip  # noqa: E402
+
+PAUSE_S = 0.6
+
+
+def _recitation(segments: int) -> np.ndarray:
+    parts = []
+    for i in range(segments):
+        parts.append(voiced_clip(2.0 + (i % 5) * 0.5, seed=i))
+        parts.append(np.zeros(int(PAUSE_S * SAMPLE_RATE), dtype=np.float32))
+    return np.concatenate(parts)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--segments", type=int, default=24, help="Pauses-separated segments (~2 min at 24)")
+    parser.add_argument("--model", default=None, help="Whisper checkpoint (default: synthetic tiny model)")
+    args = parser.parse_args()
+
+    install(*load_whisper(args.model))
+    samples = _recitation(args.segments)
+    spans = split_on_silence(samples)
+    clips = [DecodedAudio(samples[s:e]) for s, e in spans]
+    longest = max(clips, key=lambda c: c.duration)
+    whisper_sanskrit._transcribe_sync(clips[0])  # Warm-up
+
+    start = time.perf_counter()
+    whisper_sanskrit._transcribe_sync(longest)
+    one = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for clip in clips:
+        whisper_sanskrit._transcribe_sync(clip)
+    sequential = time.perf_counter() - start
+
+    start = time.perf_counter()
+    asyncio.run(transcribe_segments(clips))
+    batched = time.perf_counter() - start
+    batcher = whisper_sanskrit.get_asr_batcher()
+
+    print(f"{len(samples) / SAMPLE_RATE:.0f} s recitation -> {len(clips)} segments (longest {longest.duration:.1f} s)")
+    print(f"longest    {one:6.2f} s")
+    print(f"sequential {sequential:6.2f} s")
+    print(f"batched    {batched:6.2f} s  speedup {sequential / batched:.2f}x  "
+          f"mean batch {batcher.items / max(1, batcher.batches):.1f}")
+    whisper_sanskrit.shutdown_asr_batcher()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: games.normalize.canonicalize, cache hits vs misses per input scheme.
+
+A miss runs scheme detection and transliteration; a hit is one LRU lookup.
+The old strip+lower normalizer is timed alongside for reference.
+
+Run from project root: python scripts/benchmarks/bench_normalize.py [--calls 200000]
+"""
+import argparse
+import sys
+import time
+import unicodedata
+from pathlib import Path
+
+_PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(_PROJECT_ROOT))
+
+from games.normalize import canonicalize  # noqa: E402
+
+INPUTS = {
+    "iast": "gacchati",
+    "iast (nfd)": unicodedata.normalize("NFD", "bhūta"),
+    "devanagari": "गच्छति",
+    "harvard-kyoto": "kRSNa",
+    "itrans": "kRRiShNa",
+    "slp1": "kfzRa",
+}
+
+
+def _ns_per_call(fn, arg: str, n: int) -> float:
+    start = time.perf_counter()
+    for _ in range(n):
+        fn(arg)
+    return (time.perf_counter() - start) / n * 1e9
+
+
+def _miss_ns(text: str, n: int) -> float:
+    total = 0.0
+    for _ in range(n):
+        canonicalize.cache_clear()
+        start = time.perf_counter()
+        canonicalize(text)
+        total += time.perf_counter() - start
+    return total / n * 1e9
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=200_000)
+    args = parser.parse_args()
+
+    print(f"{'scheme':16} {'result':10} {'miss':>10} {'hit':>10}")
+    for name, text in INPUTS.items():
+        miss = _miss_ns(text, max(args.calls // 100, 100))
+        canonicalize(text)
+        hit = _ns_per_call(canonicalize, text, args.calls)
+        print(f"{name:16} {canonicalize(text):10} {miss / 1000:>8.1f}µs {hit:>8.0f}ns")
+    old = _ns_per_call(lambda s: s.strip().lower(), "gacchati", args.calls)
+    print(f"{'strip+lower':16} {'(old)':10} {'':>10} {old:>8.0f}ns")
+
+
+if __name__ == "__main__":
+    main()
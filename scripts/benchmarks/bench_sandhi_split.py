@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Benchmark: games.sandhi splitter over every reading text (public/content/readings/*/units.json).
+
+Each unit's IAST line is split with the default lexicon (plus SANDHI_LEXICON /
+data/mw-headwords.txt when present). Reports per-line latency, the longest
+line, and how many lines split with every word found in the lexicon.
+
+Run from project root: python scripts/benchmarks/bench_sandhi_split.py [--repeat 20]
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+_PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(_PROJECT_ROOT))
+
+from games.sandhi import get_splitter, to_slp1  # noqa: E402
+
+READINGS = _PROJECT_ROOT / "public" / "content" / "readings"
+
+
+def _lines() -> list[tuple[str, str]]:
+    out = []
+    for path in sorted(READINGS.glob("*/units.json")):
+        for unit in json.loads(path.read_text(encoding="utf-8")):
+            if unit.get("iast"):
+                out.append((unit.get("id", path.parent.name), unit["iast"]))
+    return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=20, help="Splits per line")
+    parser.add_argument("--show", type=int, default=5, help="Print this many example splits")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    splitter = get_splitter()
+    print(f"rules={len(splitter.rules)} lexicon={len(splitter.lexicon):,} build={time.perf_counter() - start:.3f}s")
+
+    lines = _lines()
+    timings, complete = [], 0
+    for unit_id, text in lines:
+        slp1 = to_slp1(text)
+        t0 = time.perf_counter()
+        for _ in range(args.repeat):
+            result = splitter.split_slp1(slp1)
+        timings.append((time.perf_counter() - t0) / args.repeat * 1000)
+        complete += result.complete
+        if args.show > 0:
+            args.show -= 1
+            print(f"  {unit_id}: {text}\n    → {' + '.join(result.iast())}")
+
+    if not timings:
+        print("No reading texts found.")
+        return
+    longest = max(range(len(lines)), key=lambda k: len(lines[k][1]))
+    q = statistics.quantiles(timings, n=100) if len(timings) > 1 else timings * 99
+    print(f"lines={len(lines)} complete={complete} ({complete / len(lines):.0%})")
+    print(f"ms/line  p50 {q[49]:.3f}  p95 {q[94]:.3f}  max {max(timings):.3f}")
+    print(f"longest line {len(lines[longest][1])} chars: {timings[longest]:.3f} ms")
+    sloka = " ".join(text for _, text in lines)[:200]
+    t0 = time.perf_counter()
+    for _ in range(args.repeat):
+        splitter.split(sloka)
+    print(f"200-char line: {(time.perf_counter() - t0) / args.repeat * 1000:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Whisper backends (fp32 vs int8) — real-time factor and phoneme error rate.
+
+Fixture set: the Sanskrit recitation clips of a readings collection
+(public/content/readings/<reading>/audio/<id>_sa.mp3) with their IAST text
+from units.json. For each backend every clip is transcribed at batch size 1:
+
+  RTF    feature extraction + generate time / clip duration (lower is faster)
+  PER    phoneme error rate of the transcript against the IAST text
+  drift  phoneme error rate against the fp32 transcript — what quantization changed
+
+Without --model a random whisper-tiny-sized network is used (see
+whisper_fixture.py): RTF ratios and drift are meaningful, PER is not.
+
+Run from project root: python scripts/benchmarks/bench_whisper_backends.py [--clips 12] [--model Bidwill/whisper-medium-sanskrit-try-2]
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+_PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(_PROJECT_ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from sabdakrida.asr import whisper_sanskrit  # noqa: E402
+from sabdakrida.asr.audio import DecodedAudio, decode_audio  # noqa: E402
+from sabdakrida.asr.phoneme_diff import phoneme_error_rate  # noqa: E402
+from sabdakrida.assessment.mode1 import _to_iast  # noqa: E402
+from whisper_fixture import install, load_whisper  # noqa: E402
+
+_READINGS = _PROJECT_ROOT / "public" / "content" / "readings"
+
+
+def fixture_clips(reading: str, limit: int) -> list[tuple[str, DecodedAudio, str]]:
+    """(id, audio, IAST target) for the first limit units that have a Sanskrit recording."""
+    units = json.loads((_READINGS / reading / "units.json").read_text(encoding="utf-8"))
+    clips = []
+    for unit in units:
+        path = _READINGS / reading / "audio" / f"{unit['id']}_sa.mp3"
+        if path.exists() and unit.get("iast"):
+            clips.append((unit["id"], decode_audio(str(path)), unit["iast"]))
+        if len(clips) >= limit:
+            break
+    return clips
+
+
+def run_backend(clips, rounds: int) -> tuple[list[str], float]:
+    """Transcripts (IAST) and total seconds of the best of rounds passes."""
+    best, heard = float("inf"), []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        heard = [_to_iast(whisper_sanskrit._transcribe_sync(audio)) for _, audio, _ in clips]
+        best = min(best, time.perf_counter() - start)
+    return heard, best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--reading", default="siva_sutras", help="Readings collection used as fixtures")
+    parser.add_argument("--clips", type=int, default=12, help="Number of fixture clips")
+    parser.add_argument("--rounds", type=int, default=2, help="Timed passes per backend (best is kept)")
+    parser.add_argument("--model", default=None, help="Whisper checkpoint (default: synthetic tiny model)")
+    args = parser.parse_args()
+
+    clips = fixture_clips(args.reading, args.clips)
+    audio_seconds = sum(audio.duration for _, audio, _ in clips)
+    print(f"{len(clips)} clips, {audio_seconds:.1f}s of audio from {args.reading}")
+
+    processor, model = load_whisper(args.model)
+    reference: list[str] | None = None
+    fp32_rtf = None
+    for backend in whisper_sanskrit.BACKENDS:
+        install(processor, whisper_sanskrit.apply_backend(model, backend))
+        whisper_sanskrit._transcribe_sync(clips[0][1])  # Warm-up
+        heard, seconds = run_backend(clips, args.rounds)
+        rtf = seconds / audio_seconds
+        per = statistics.mean(phoneme_error_rate(target, h) for (_, _, target), h in zip(clips, heard))
+        reference = reference or heard
+        drift = statistics.mean(phoneme_error_rate(r, h) for r, h in zip(reference, heard))
+        fp32_rtf = fp32_rtf or rtf
+        print(
+            f"{backend:5}  RTF={rtf:6.3f} ({fp32_rtf / rtf:4.2f}x)  PER={per:6.3f}  drift vs fp32={drift:6.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
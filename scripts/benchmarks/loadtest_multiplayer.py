@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Load test: multiplayer Dhātu Dash move latency with many concurrent rooms.
+
+Simulated players join rooms in pairs and fire moves (a mix of valid, repeated
+and invalid forms) at a fixed think time. Move latency is the time from sending
+a move to the mover receiving the server's answer (its "move" broadcast or a
+"rejected"), reported as p50 / p95 / p99.
+
+In-process (default) drives games.multiplayer directly on one event loop — the
+server-side cost per move with no network:
+  python scripts/benchmarks/loadtest_multiplayer.py --rooms 1000
+Against a running server (needs the websockets package):
+  python scripts/benchmarks/loadtest_multiplayer.py --rooms 1000 --url ws://localhost:8010
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+_PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(_PROJECT_ROOT))
+
+from games.dhatu_dash import DhatuDashEngine, DhatuSession  # noqa: E402
+from games.multiplayer import RoomManager, handle_message  # noqa: E402
+
+
+def _candidate_forms() -> list[str]:
+    """Every valid form of every root, plus junk — players guess from this pool."""
+    DhatuDashEngine()  # Loads dhatus.json and builds the form index
+    forms = [f for fs in DhatuDashEngine._index.valid_forms.values() for f in fs]
+    return forms + ["xyz", "gamati", "bhavanti"]
+
+
+def _session_factory():
+    engine = DhatuDashEngine()
+    roots = list(engine._index.valid_forms)
+
+    def new_session() -> DhatuSession:
+        root_id = random.choice(roots)
+        d = engine._index.by_id[root_id]
+        return DhatuSession(
+            root_id=root_id,
+            root_iast=d["iast"],
+            root_meaning=d.get("meaning", ""),
+            root_devanagari=d.get("devanagari", ""),
+            valid_forms=engine._index.valid_forms[root_id],
+            tree={engine._index.valid_forms[root_id][0]},
+        )
+
+    return new_session
+
+
+async def _answer_for(inbox: asyncio.Queue, player_id: str, form: str) -> dict:
+    """Wait for the server's answer to this player's move, skipping unrelated broadcasts."""
+    while True:
+        msg = await inbox.get()
+        if msg.get("type") == "rejected" and msg.get("form") == form:
+            return msg
+        if msg.get("type") == "move" and msg.get("player_id") == player_id:
+            return msg
+        if msg.get("type") == "end":
+            return msg
+
+
+async def _play_in_process(manager, room_id, player_id, pool, moves, think, latencies) -> None:
+    inbox: asyncio.Queue = asyncio.Queue()
+
+    async def send(msg: dict) -> None:
+        inbox.put_nowait(msg)
+
+    room = await manager.join(room_id, player_id, send)
+    await handle_message(room, player_id, {"type": "start"})
+    for _ in range(moves):
+        if room.finished:
+            return
+        await asyncio.sleep(random.uniform(0, 2 * think))
+        form = random.choice(pool)
+        t0 = time.perf_counter()
+        await handle_message(room, player_id, {"type": "move", "form": form})
+        answer = await _answer_for(inbox, player_id, form)
+        latencies.append(time.perf_counter() - t0)
+        if answer.get("type") == "end":
+            return
+
+
+async def _play_ws(url, room_id, player_id, pool, moves, think, latencies) -> None:
+    import websockets
+
+    async with websockets.connect(f"{url}/games/dhatu-dash/ws/{room_id}?user_id={player_id}") as ws:
+        inbox: asyncio.Queue = asyncio.Queue()
+
+        async def reader() -> None:
+            async for raw in ws:
+                inbox.put_nowait(json.loads(raw))
+
+        reader_task = asyncio.create_task(reader())
+        await ws.send(json.dumps({"type": "start"}))
+        try:
+            for _ in range(moves):
+                await asyncio.sleep(random.uniform(0, 2 * think))
+                form = random.choice(pool)
+                t0 = time.perf_counter()
+                await ws.send(json.dumps({"type": "move", "form": form}))
+                answer = await _answer_for(inbox, player_id, form)
+                latencies.append(time.perf_counter() - t0)
+                if answer.get("type") == "end":
+                    return
+        finally:
+            reader_task.cancel()
+
+
+async def run(args) -> list[float]:
+    pool = _candidate_forms()
+    latencies: list[float] = []
+    manager = RoomManager(_session_factory(), round_seconds=600, max_rooms=args.rooms)
+    players = []
+    for r in range(args.rooms):
+        for p in range(args.players):
+            room_id, player_id = f"room{r}", f"r{r}p{p}"
+            if args.url:
+                coro = _play_ws(args.url, room_id, player_id, pool, args.moves, args.think, latencies)
+            else:
+                coro = _play_in_process(
+                    manager, room_id, player_id, pool, args.moves, args.think, latencies
+                )
+            players.append(coro)
+    await asyncio.gather(*players)
+    return latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rooms", type=int, default=1000)
+    parser.add_argument("--players", type=int, default=2, help="Players per room")
+    parser.add_argument("--moves", type=int, default=20, help="Moves per player")
+    parser.add_argument("--think", type=float, default=0.05, help="Mean seconds between moves")
+    parser.add_argument("--url", default="", help="ws://host:port of a running server")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    latencies = asyncio.run(run(args))
+    wall = time.perf_counter() - start
+    if not latencies:
+        print("No moves completed.")
+        return
+    q = statistics.quantiles([x * 1000 for x in latencies], n=100)
+    print(f"rooms={args.rooms} players/room={args.players} moves={len(latencies)} wall={wall:.1f}s")
+    print(f"throughput {len(latencies) / wall:,.0f} moves/s")
+    print(f"latency ms  p50 {q[49]:.3f}  p95 {q[94]:.3f}  p99 {q[98]:.3f}  max {max(latencies) * 1000:.3f}")
+
+
+if __name__ == "__main__":
+    main()
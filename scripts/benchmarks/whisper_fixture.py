@@ -0,0 +1,92 @@
+"""
+Whisper model + clips for the ASR benchmarks.
+
+load_whisper(model) loads a real checkpoint (HF id or local path). With no
+model it builds a randomly initialised whisper-tiny-sized network from a
+config — no download — so scheduling and quantization effects can be timed
+offline. Its transcripts are token-id strings; only timings are meaningful.
+
+install(processor, model) makes sabdakrida.asr.whisper_sanskrit use them.
+"""
+from __future__ import annotations
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+
+
+class _CharTokenizer:
+    """One token per character — roughly Whisper's BPE density on Devanagari."""
+
+    def __call__(self, text, add_special_tokens=True):
+        from transformers import BatchEncoding
+
+        return BatchEncoding({"input_ids": [1000 + ord(c) % 40000 for c in text]})
+
+
+class _IdProcessor:
+    """Feature extractor + id-string decoding, standing in for WhisperProcessor."""
+
+    def __init__(self):
+        from transformers import WhisperFeatureExtractor
+
+        self.feature_extractor = WhisperFeatureExtractor()
+        self.tokenizer = _CharTokenizer()
+
+    def __call__(self, audio, sampling_rate=SAMPLE_RATE, return_tensors="pt"):
+        return self.feature_extractor(audio, sampling_rate=sampling_rate, return_tensors=return_tensors)
+
+    def batch_decode(self, ids, skip_special_tokens=True):
+        return [" ".join(str(int(t)) for t in row if not skip_special_tokens or t < 50257) for row in ids]
+
+    def get_prompt_ids(self, text, return_tensors="np"):
+        return np.array([50361] + self.tokenizer(text).input_ids)
+
+
+def synthetic_whisper(max_new_tokens: int = 24, seed: int = 0):
+    """
+    Random whisper-tiny-sized model with a multilingual generation config.
+    It never emits end-of-text, so it decodes max_new_tokens unless bounded — a noisy clip's worst case.
+    """
+    import torch
+    from transformers import GenerationConfig, WhisperConfig, WhisperForConditionalGeneration
+
+    torch.manual_seed(seed)
+    config = WhisperConfig(
+        d_model=384, encoder_layers=4, decoder_layers=4,
+        encoder_attention_heads=6, decoder_attention_heads=6,
+        encoder_ffn_dim=1536, decoder_ffn_dim=1536,
+    )
+    model = WhisperForConditionalGeneration(config).eval()
+    model.generation_config = GenerationConfig(
+        decoder_start_token_id=50258, bos_token_id=50257, eos_token_id=50257, pad_token_id=50257,
+        lang_to_id={"<|sa|>": 50300, "<|hi|>": 50276}, task_to_id={"transcribe": 50359, "translate": 50358},
+        no_timestamps_token_id=50363, prev_sot_token_id=50361, is_multilingual=True,
+        max_new_tokens=max_new_tokens,
+    )
+    return _IdProcessor(), model
+
+
+def load_whisper(model_id: str | None = None, max_new_tokens: int = 24):
+    """(processor, model): a real checkpoint, or the synthetic one when model_id is None."""
+    if model_id is None:
+        return synthetic_whisper(max_new_tokens)
+    from transformers import WhisperForConditionalGeneration, WhisperProcessor
+
+    return WhisperProcessor.from_pretrained(model_id), WhisperForConditionalGeneration.from_pretrained(model_id).eval()
+
+
+def install(processor, model) -> None:
+    from sabdakrida.asr import whisper_sanskrit
+
+    whisper_sanskrit._processor, whisper_sanskrit._model = processor, model
+
+
+def voiced_clip(seconds: float, seed: int = 0) -> np.ndarray:
+    """Speech-like test signal: harmonic tone with syllable-rate amplitude modulation plus noise."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    f0 = 120 + 20 * rng.random()
+    voice = sum(np.sin(2 * np.pi * f0 * k * t) / k for k in range(1, 6))
+    envelope = 0.5 * (1 + np.sin(2 * np.pi * 4 * t)) ** 2
+    return (0.05 * voice * envelope + 0.005 * rng.standard_normal(len(t))).astype(np.float32)
@@ -10,6 +10,8 @@ import json
 from pathlib import Path
 from typing import Any
 
+from games.normalize import ascii_fold, canonicalize
+
 
 def _load_dhatus() -> list[dict]:
     """Load dhātus from data/dhatus.json."""
@@ -21,7 +23,7 @@ def _load_dhatus() -> list[dict]:
     return data if isinstance(data, list) else data.get("data", [])
 
 
-# Root IAST → valid forms (IAST, normalised lowercase)
+# Root → valid forms (canonical IAST). Keyed by canonical root and its ASCII fold (kṛ, kri).
 _ROOT_FORMS: dict[str, set[str]] = {}
 
 
@@ -31,35 +33,27 @@ def _build_root_forms() -> dict[str, set[str]]:
         return _ROOT_FORMS
     dhatus = _load_dhatus()
     for d in dhatus:
-        iast = (d.get("iast") or "").strip().lower()
+        iast = canonicalize(d.get("iast") or "")
         if not iast:
             continue
         forms = {iast}
         for df in d.get("derivedForms", []):
-            f = (df.get("form") or "").strip().lower()
+            f = canonicalize(df.get("form") or "")
             if f:
                 forms.add(f)
         for name in d.get("derivesTo", []):
-            n = (name or "").strip().lower()
+            n = canonicalize(name or "")
             if n:
                 forms.add(n)
         _ROOT_FORMS[iast] = forms
-        # Also key by simplified form for lookup (bhu, kri, etc.)
-        simple = iast.replace("ū", "u").replace("ṛ", "r").replace("ṃ", "m").replace("ā", "a").replace("ī", "i").replace("ṭ", "t")
-        if simple != iast:
-            _ROOT_FORMS[simple] = forms
-        if iast == "kṛ":
-            _ROOT_FORMS["kri"] = forms
-        if iast == "bhū":
-            _ROOT_FORMS["bhu"] = forms
-        if iast == "gam":
-            _ROOT_FORMS["ga"] = forms
+        _ROOT_FORMS.setdefault(ascii_fold(iast), forms)
     return _ROOT_FORMS
 
 
-def _normalize_iast(s: str) -> str:
-    """Normalize for comparison: strip, lowercase."""
-    return (s or "").strip().lower()
+def _root_forms_for(root: str) -> set[str]:
+    """Valid forms for a root typed in any scheme, with or without diacritics."""
+    root_forms = _build_root_forms()
+    return root_forms.get(canonicalize(root)) or root_forms.get(ascii_fold(root)) or set()
 
 
 def assess_grammar_production(
@@ -76,12 +70,10 @@ def assess_grammar_production(
     if not criteria:
         return True, "", meta
 
-    answer = _normalize_iast(user_answer)
+    answer = canonicalize(user_answer)
     if not answer:
         return False, "No answer provided.", meta
 
-    root_forms = _build_root_forms()
-
     # Specific checks from criteria
     if "correct_root_for_gacchati" in criteria:
         # gacchati comes from √gam
@@ -101,10 +93,10 @@ def assess_grammar_production(
             root_hint = "kri"
         elif "root_bhu" in criteria:
             root_hint = "bhu"
-        valid = root_forms.get(root_hint) or root_forms.get("kṛ" if root_hint == "kri" else "bhū") or set()
+        valid = _root_forms_for(root_hint)
         # User might separate with comma, newline, space
-        parts = [p.strip() for p in answer.replace(",", " ").replace("\n", " ").split() if p.strip()]
-        found = sum(1 for p in parts if _normalize_iast(p) in valid)
+        parts = user_answer.replace(",", " ").split()
+        found = sum(1 for p in parts if canonicalize(p) in valid)
         if found >= min_forms:
             return True, f"Correct. You produced {found} valid form(s).", meta
         return False, f"You produced {found} valid form(s). Need at least {min_forms}. Valid forms for √{root_hint} include: {', '.join(sorted(valid)[:8])}...", meta
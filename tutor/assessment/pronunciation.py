@@ -10,7 +10,7 @@ from typing import Any
 
 
 def assess_pronunciation(
-    audio_path: str | None,
+    audio: Any,
     user_text: str | None,
     target_text: str,
     spec: dict[str, Any],
@@ -18,13 +18,17 @@ def assess_pronunciation(
 ) -> tuple[bool, str, dict[str, Any]]:
     """
     Assess pronunciation. Probabilistic.
-    If audio_path: transcribe, phoneme_diff, score. Thresholds apply.
+    If audio (file path or sabdakrida DecodedAudio): transcribe, phoneme_diff, score. Thresholds apply.
     If user_text only: flag unverified_pronunciation, return (False, "Use voice to verify", meta).
     Returns (passed, feedback_message, meta).
     """
     meta: dict[str, Any] = {"unverified_pronunciation": False}
 
-    if audio_path:
+    if audio is not None:
+        try:
+            from sabdakrida.inference import Overloaded
+        except ImportError:
+            Overloaded = ()  # except () matches nothing
         # Defer to sabdakrida.assessment.mode1 for actual transcription/diff
         try:
             import asyncio
@@ -33,7 +37,7 @@ def assess_pronunciation(
             loop = asyncio.new_event_loop()
             try:
                 result = loop.run_until_complete(
-                    pronunciation_session(audio_path, target_text, "tutor")
+                    pronunciation_session(audio, target_text, "tutor")
                 )
             finally:
                 loop.close()
@@ -50,6 +54,8 @@ def assess_pronunciation(
             meta["errors"] = errors
             return passed, feedback, meta
 
+        except Overloaded:
+            raise  # ASR at capacity: the API answers 503 + Retry-After
         except Exception as e:
             return False, f"Pronunciation check failed: {e}", meta
 
@@ -91,11 +91,12 @@ def submit_session(
     zone_id: str,
     level: int,
     user_input: str,
-    audio_path: str | None = None,
+    audio: Any = None,
 ) -> dict[str, Any]:
     """
     Submit user response. Assess, return pass/fail and feedback.
     Update profile on pass. Increment retry on fail.
+    audio is a file path or a sabdakrida DecodedAudio (uploads are decoded in memory).
     """
     profile = load_tutor_profile(user_id)
     spec = _load_session_spec(zone_id, level)
@@ -107,10 +108,10 @@ def submit_session(
     if assessment_type == "conceptual":
         passed, feedback, meta = assess_conceptual(user_input, spec)
     elif assessment_type == "production":
-        # Grammar production; pronunciation would use audio_path
+        # Grammar production; pronunciation would use audio
         if spec.get("pass_criteria", {}).get("pronunciation"):
             passed, feedback, meta = assess_pronunciation(
-                audio_path, user_input if not audio_path else None,
+                audio, user_input if audio is None else None,
                 spec.get("target_text", ""), spec
             )
         else:
@@ -6,35 +6,11 @@ Stored in sabdakrida.db. Complements games/user_profile.
 from __future__ import annotations
 
 import json
-import sqlite3
 from dataclasses import dataclass, field
-from pathlib import Path
 from datetime import datetime
 from typing import Any
 
-
-def _get_db_path() -> Path:
-    return Path(__file__).resolve().parent.parent / "sabdakrida" / "sabdakrida.db"
-
-
-def _connect():
-    conn = sqlite3.connect(_get_db_path())
-    conn.row_factory = sqlite3.Row
-    return conn
-
-
-def _ensure_tables(conn: sqlite3.Connection) -> None:
-    conn.executescript("""
-        CREATE TABLE IF NOT EXISTS tutor_progress (
-            user_id TEXT PRIMARY KEY,
-            zone_levels TEXT DEFAULT '{}',
-            level_retry_counts TEXT DEFAULT '{}',
-            weekly_arc TEXT,
-            last_arc_generated TIMESTAMP,
-            unverified_pronunciation TEXT DEFAULT '[]',
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        );
-    """)
+from sabdakrida.db.connection import get_connection, transaction
 
 
 @dataclass
@@ -69,12 +45,9 @@ class TutorProfile:
 
 
 def load_tutor_profile(user_id: str) -> TutorProfile:
-    conn = _connect()
-    _ensure_tables(conn)
-    row = conn.execute(
+    row = get_connection().execute(
         "SELECT * FROM tutor_progress WHERE user_id = ?", (user_id,)
     ).fetchone()
-    conn.close()
 
     if row is None:
         return TutorProfile(user_id=user_id)
@@ -109,30 +82,27 @@ def load_tutor_profile(user_id: str) -> TutorProfile:
 
 
 def save_tutor_profile(profile: TutorProfile) -> None:
-    conn = _connect()
-    _ensure_tables(conn)
-    conn.execute(
-        """
-        INSERT INTO tutor_progress (
-            user_id, zone_levels, level_retry_counts, weekly_arc,
-            last_arc_generated, unverified_pronunciation, updated_at
-        ) VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-        ON CONFLICT(user_id) DO UPDATE SET
-            zone_levels = excluded.zone_levels,
-            level_retry_counts = excluded.level_retry_counts,
-            weekly_arc = excluded.weekly_arc,
-            last_arc_generated = excluded.last_arc_generated,
-            unverified_pronunciation = excluded.unverified_pronunciation,
-            updated_at = CURRENT_TIMESTAMP
-        """,
-        (
-            profile.user_id,
-            json.dumps(profile.zone_levels),
-            json.dumps(profile.level_retry_counts),
-            json.dumps(profile.weekly_arc) if profile.weekly_arc else None,
-            profile.last_arc_generated.isoformat() if profile.last_arc_generated else None,
-            json.dumps(list(profile.unverified_pronunciation)),
-        ),
-    )
-    conn.commit()
-    conn.close()
+    with transaction() as conn:
+        conn.execute(
+            """
+            INSERT INTO tutor_progress (
+                user_id, zone_levels, level_retry_counts, weekly_arc,
+                last_arc_generated, unverified_pronunciation, updated_at
+            ) VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+            ON CONFLICT(user_id) DO UPDATE SET
+                zone_levels = excluded.zone_levels,
+                level_retry_counts = excluded.level_retry_counts,
+                weekly_arc = excluded.weekly_arc,
+                last_arc_generated = excluded.last_arc_generated,
+                unverified_pronunciation = excluded.unverified_pronunciation,
+                updated_at = CURRENT_TIMESTAMP
+            """,
+            (
+                profile.user_id,
+                json.dumps(profile.zone_levels),
+                json.dumps(profile.level_retry_counts),
+                json.dumps(profile.weekly_arc) if profile.weekly_arc else None,
+                profile.last_arc_generated.isoformat() if profile.last_arc_generated else None,
+                json.dumps(list(profile.unverified_pronunciation)),
+            ),
+        )